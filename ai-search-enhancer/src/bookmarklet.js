@@ -8,6 +8,15 @@
 
   const API_URL = 'http://localhost:5000';
 
+  // Result containers posted to the server, which owns the per-engine
+  // selectors (src/profiles) so they can change without reinstalling this
+  const RESULT_CONTAINERS = {
+    google: '#rso, #search',
+    bing: '#b_results',
+    duckduckgo: '.react-results--main, #links'
+  };
+  const MAX_HTML_LENGTH = 2000000;
+
   // Detect which search engine we're on
   function detectEngine() {
     const hostname = window.location.hostname;
@@ -87,7 +96,14 @@
     return results.slice(0, 10);
   }
 
-  // Scrape results based on engine
+  // Raw HTML of the results container for server-side extraction
+  function resultsHTML(engine) {
+    const container = document.querySelector(RESULT_CONTAINERS[engine]) || document.body;
+    const html = container.outerHTML;
+    return html.length <= MAX_HTML_LENGTH ? html : null;
+  }
+
+  // Scrape results in the page (fallback when server-side extraction finds nothing)
   function scrapeResults(engine) {
     switch (engine) {
       case 'google':
@@ -102,17 +118,49 @@
   }
 
   // Send to server
-  async function getSummary(query, results) {
+  // Previous summary for this page, revalidated with a GET of its Content-Location
+  function cachedSummary(query) {
+    try {
+      return JSON.parse(sessionStorage.getItem(`ai-search-enhancer:${query}`));
+    } catch (error) {
+      return null;
+    }
+  }
+
+  function storeSummary(query, etag, location, data) {
     try {
+      sessionStorage.setItem(`ai-search-enhancer:${query}`, JSON.stringify({ etag, location, data }));
+    } catch (error) {
+      // Storage full or disabled: just skip caching
+    }
+  }
+
+  async function getSummary(query, payload) {
+    try {
+      const cached = cachedSummary(query);
+      if (cached && cached.location) {
+        // Revalidating with a GET avoids uploading the results again
+        const check = await fetch(`${API_URL}${cached.location}`, {
+          headers: { 'If-None-Match': cached.etag }
+        });
+        if (check.status === 304) {
+          return cached.data;
+        }
+      }
+
       const response = await fetch(`${API_URL}/summarize`, {
         method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({ query, results })
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ query, compact: true, ...payload })
       });
 
-      return await response.json();
+      const data = await response.json();
+      data.query = query;
+      const etag = response.headers.get('ETag');
+      if (etag && data.success) {
+        storeSummary(query, etag, response.headers.get('Content-Location'), data);
+      }
+      return data;
     } catch (error) {
       return {
         success: false,
@@ -322,17 +370,24 @@
       return;
     }
 
-    const results = scrapeResults(engine);
-    if (results.length === 0) {
-      showUI('error', {
-        error: 'Could not extract search results. The page structure may have changed.'
-      });
-      return;
-    }
-
     showUI('loading');
 
-    const response = await getSummary(query, results);
+    let response = null;
+    const html = resultsHTML(engine);
+    if (html) {
+      response = await getSummary(query, { engine, html, url: window.location.href });
+    }
+
+    if (!response || response.extracted === 0) {
+      const results = scrapeResults(engine);
+      if (results.length === 0) {
+        showUI('error', {
+          error: 'Could not extract search results. The page structure may have changed.'
+        });
+        return;
+      }
+      response = await getSummary(query, { results });
+    }
 
     if (response.success) {
       showUI('success', response);
@@ -16,10 +16,28 @@ DEBUG = os.getenv("DEBUG", "True").lower() in ("1", "true", "yes")
 # Search Configuration
 MAX_RESULTS = 10
 MAX_RESULT_LENGTH = 300
+MAX_TITLE_LENGTH = 200
+
+# Server-side extraction: per-engine selector profiles (JSON) and the largest
+# result-page HTML the bookmarklet may post
+PROFILES_DIR = os.getenv("PROFILES_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles"))
+MAX_HTML_BYTES = 2 * 1024 * 1024
+
+# Response Compression (brotli is used when installed and accepted, else gzip)
+COMPRESSION_MIN_BYTES = 512
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Recent summaries kept for GET /summaries/<etag> revalidation
+SUMMARY_CACHE_SIZE = 256
 
 # AI Configuration
 SUMMARY_MAX_TOKENS = 500
 TEMPERATURE = 0.3
+# How long Ollama keeps the model (and its prompt cache) loaded between requests
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+# Seconds to wait before retrying a prefix context that failed to prime
+PREFIX_RETRY_SECONDS = 300
 
 # CORS Configuration
 ALLOWED_ORIGINS = ["*"]
@@ -37,14 +55,23 @@ Guidelines:
 - Keep the summary under 300 words
 """
 
-SUMMARY_PROMPT_TEMPLATE = """Based on these search results for the query "{query}", provide a comprehensive summary:
-
-Search Results:
-{results}
-
-Please provide:
+# The summary prompt is split into a fixed prefix and a per-request part so the
+# prefix can be evaluated once per model and reused as an Ollama context
+SUMMARY_PREFIX = """You will be given a search query and its search results. Provide a comprehensive summary of the results:
 1. A brief overview (2-3 sentences)
 2. Key findings or main points (3-5 bullet points)
 3. Any important nuances or caveats
+"""
+
+# Appended to the prefix only while priming the context
+PREFIX_PRIMING_PROMPT = 'Reply with "Ready." and wait for the query.'
+
+SUMMARY_REQUEST_TEMPLATE = """Query: "{query}"
+
+Search Results:
+{results}
 
 Summary:"""
+
+# Full prompt, used when no prefix context is available
+SUMMARY_PROMPT_TEMPLATE = SUMMARY_PREFIX + "\n" + SUMMARY_REQUEST_TEMPLATE
@@ -0,0 +1,183 @@
+"""
+Search Result Extractor
+Parses raw result-page HTML on the server using per-engine selector profiles
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urljoin, urlsplit, urlunsplit
+
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+
+from config import MAX_RESULTS, MAX_RESULT_LENGTH, MAX_TITLE_LENGTH, PROFILES_DIR
+
+# Query parameters that only track clicks; dropped when comparing URLs
+TRACKING_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid", "msclkid", "ref_src"}
+
+
+class ExtractionError(ValueError):
+    """Raised for an unknown engine or HTML that cannot be parsed"""
+
+
+def _text(element) -> str:
+    return " ".join(element.text_content().split())
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut ``text`` to ``limit`` characters at a word boundary"""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit - 1]
+    if " " in cut[limit // 2:]:
+        cut = cut[:cut.rfind(" ")]
+    return cut.rstrip(" ,.;:-") + "…"
+
+
+def canonical_url(url: str) -> str:
+    """URL key used for dedup: lower-case host, no fragment, no tracking params"""
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value)
+        for key, values in parse_qs(parts.query, keep_blank_values=True).items()
+        for value in values
+        if key not in TRACKING_PARAMS and not key.startswith(TRACKING_PREFIXES)
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def normalize_results(
+    results: List[Any],
+    limit: int = MAX_RESULTS,
+    max_length: int = MAX_RESULT_LENGTH
+) -> List[Dict[str, str]]:
+    """Clean, dedupe and truncate results so prompts stay small.
+
+    Whitespace is collapsed, entries without a title or an http(s) URL are
+    dropped, repeated URLs (ignoring tracking params) are kept once, and
+    snippets are cut to ``max_length`` characters.
+    """
+    normalized = []
+    seen = set()
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        title = " ".join(str(result.get("title") or "").split())
+        url = str(result.get("url") or "").strip()
+        snippet = " ".join(str(result.get("snippet") or "").split())
+        if not title or urlsplit(url).scheme not in ("http", "https"):
+            continue
+        key = canonical_url(url)
+        if key in seen:
+            continue
+        seen.add(key)
+        normalized.append({
+            "title": _truncate(title, MAX_TITLE_LENGTH),
+            "url": url,
+            "snippet": _truncate(snippet, max_length)
+        })
+        if len(normalized) >= limit:
+            break
+    return normalized
+
+
+class SelectorProfile:
+    """CSS selectors for one engine's result page, compiled once"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.engine = data["engine"]
+        self.hosts = data.get("hosts", [])
+        self.item = CSSSelector(data["item"])
+        self.title = CSSSelector(data["title"])
+        self.link = CSSSelector(data.get("link") or data["title"])
+        self.snippet = CSSSelector(data["snippet"])
+        redirect = data.get("redirect") or {}
+        self.redirect_path = redirect.get("path")
+        self.redirect_params = redirect.get("params", [])
+
+    def _resolve(self, href: str, base_url: str) -> str:
+        url = urljoin(base_url, href)
+        parts = urlsplit(url)
+        if self.redirect_path and parts.path.startswith(self.redirect_path):
+            params = parse_qs(parts.query)
+            for name in self.redirect_params:
+                if params.get(name):
+                    return params[name][0]
+        return url
+
+    def extract(self, root, base_url: str = "") -> List[Dict[str, str]]:
+        results = []
+        for item in self.item(root):
+            title_els = self.title(item)
+            link_els = [el for el in self.link(item) if el.get("href")]
+            snippet_els = self.snippet(item)
+            if not (title_els and link_els and snippet_els):
+                continue
+            results.append({
+                "title": _text(title_els[0]),
+                "url": self._resolve(link_els[0].get("href"), base_url),
+                "snippet": _text(snippet_els[0])
+            })
+        return results
+
+
+class ProfileRegistry:
+    """Loads ``<engine>.json`` profiles and reloads a file when it changes on disk"""
+
+    def __init__(self, directory: str = PROFILES_DIR):
+        self.directory = directory
+        self._profiles: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def engines(self) -> List[str]:
+        return sorted(name[:-5] for name in os.listdir(self.directory) if name.endswith(".json"))
+
+    def get(self, engine: str) -> SelectorProfile:
+        if not engine.isidentifier():
+            raise ExtractionError(f"Unknown search engine '{engine}'")
+        path = os.path.join(self.directory, f"{engine}.json")
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            raise ExtractionError(f"Unknown search engine '{engine}'")
+        with self._lock:
+            cached = self._profiles.get(engine)
+            if cached is None or cached[0] != mtime:
+                with open(path, encoding="utf-8") as handle:
+                    cached = self._profiles[engine] = (mtime, SelectorProfile(json.load(handle)))
+            return cached[1]
+
+    def detect(self, url: str) -> Optional[str]:
+        """Engine whose profile lists a host matching ``url``"""
+        host = urlsplit(url).netloc.lower()
+        for engine in self.engines():
+            if any(pattern in host for pattern in self.get(engine).hosts):
+                return engine
+        return None
+
+
+profiles = ProfileRegistry()
+
+
+def extract_results(
+    page_html: str,
+    engine: Optional[str] = None,
+    base_url: str = "",
+    limit: int = MAX_RESULTS
+) -> List[Dict[str, str]]:
+    """Extract normalized results from a result page (or just its results container)"""
+    engine = engine or profiles.detect(base_url)
+    if not engine:
+        raise ExtractionError("Search engine is required")
+    profile = profiles.get(engine)
+    if not page_html.strip():
+        return []
+    try:
+        root = lxml_html.fromstring(page_html)
+    except (etree.ParserError, ValueError) as e:
+        raise ExtractionError(f"Could not parse HTML: {e}")
+    return normalize_results(profile.extract(root, base_url), limit=limit)
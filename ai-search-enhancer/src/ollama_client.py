@@ -4,14 +4,22 @@ Handles communication with local Ollama instance
 """
 
 import requests
+import hashlib
 import json
-from typing import Optional, Dict, Any
+import threading
+import time
+from typing import Optional, Dict, Any, List, Set
 from config import (
     OLLAMA_HOST,
     OLLAMA_MODEL,
+    OLLAMA_KEEP_ALIVE,
     SUMMARY_MAX_TOKENS,
     TEMPERATURE,
+    PREFIX_RETRY_SECONDS,
     SYSTEM_PROMPT,
+    SUMMARY_PREFIX,
+    PREFIX_PRIMING_PROMPT,
+    SUMMARY_REQUEST_TEMPLATE,
     SUMMARY_PROMPT_TEMPLATE
 )
 
@@ -23,6 +31,26 @@ class OllamaClient:
         self.host = host.rstrip('/')
         self.model = model
         self.api_url = f"{self.host}/api/generate"
+        # Primed prefix context per settings fingerprint (at most one entry)
+        self._prefix_contexts: Dict[str, List[int]] = {}
+        self._prefix_failed_at: Dict[str, float] = {}
+        # Fingerprints being primed right now; the lock is never held over HTTP
+        self._prefix_priming: Set[str] = set()
+        self._prefix_lock = threading.Lock()
+
+    def settings_fingerprint(self) -> str:
+        """Hash of everything besides the input that shapes a summary"""
+        settings = [
+            self.host,
+            self.model,
+            SYSTEM_PROMPT,
+            SUMMARY_PREFIX,
+            PREFIX_PRIMING_PROMPT,
+            SUMMARY_REQUEST_TEMPLATE,
+            TEMPERATURE,
+            SUMMARY_MAX_TOKENS
+        ]
+        return hashlib.sha256(json.dumps(settings).encode("utf-8")).hexdigest()
 
     def check_health(self) -> bool:
         """Check if Ollama is running and accessible"""
@@ -43,28 +71,10 @@ class OllamaClient:
         except requests.RequestException:
             return []
 
-    def generate(
-        self,
-        prompt: str,
-        system: Optional[str] = None,
-        temperature: float = TEMPERATURE,
-        max_tokens: int = SUMMARY_MAX_TOKENS
-    ) -> Optional[str]:
-        """Generate text using Ollama"""
+    def _post_generate(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """POST to /api/generate; returns the response JSON or None on failure"""
+        payload.setdefault("keep_alive", OLLAMA_KEEP_ALIVE)
         try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens
-                }
-            }
-
-            if system:
-                payload["system"] = system
-
             response = requests.post(
                 self.api_url,
                 json=payload,
@@ -72,8 +82,7 @@ class OllamaClient:
             )
 
             if response.status_code == 200:
-                data = response.json()
-                return data.get('response', '').strip()
+                return response.json()
             else:
                 print(f"Ollama error: {response.status_code} - {response.text}")
                 return None
@@ -82,6 +91,83 @@ class OllamaClient:
             print(f"Request error: {e}")
             return None
 
+    def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = TEMPERATURE,
+        max_tokens: int = SUMMARY_MAX_TOKENS,
+        context: Optional[List[int]] = None
+    ) -> Optional[str]:
+        """Generate text using Ollama, optionally continuing a previous context"""
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens
+            }
+        }
+
+        if system:
+            payload["system"] = system
+        if context:
+            payload["context"] = context
+
+        data = self._post_generate(payload)
+        if data is None:
+            return None
+        return data.get('response', '').strip()
+
+    def prefix_context(self) -> Optional[List[int]]:
+        """Context holding the evaluated system prompt and summary prefix.
+
+        Primed once per host, model and prompt settings; any change to them
+        gives a new fingerprint, which drops the old context. Returns None when
+        Ollama does not return a context, retrying after PREFIX_RETRY_SECONDS,
+        and while another request is priming it, so callers use the full
+        prompt instead of waiting.
+        """
+        key = self.settings_fingerprint()
+        with self._prefix_lock:
+            context = self._prefix_contexts.get(key)
+            if context is not None:
+                return context
+            if key in self._prefix_priming:
+                return None
+            if time.time() - self._prefix_failed_at.get(key, 0.0) < PREFIX_RETRY_SECONDS:
+                return None
+            self._prefix_priming.add(key)
+
+        context = None
+        try:
+            data = self._post_generate({
+                "model": self.model,
+                "system": SYSTEM_PROMPT,
+                "prompt": f"{SUMMARY_PREFIX}\n{PREFIX_PRIMING_PROMPT}",
+                "stream": False,
+                "options": {
+                    "temperature": 0,
+                    "num_predict": 8
+                }
+            })
+            context = data.get('context') if data else None
+        finally:
+            with self._prefix_lock:
+                self._prefix_priming.discard(key)
+                if context:
+                    self._prefix_contexts = {key: context}
+                    self._prefix_failed_at = {}
+                else:
+                    self._prefix_failed_at = {key: time.time()}
+        return context or None
+
+    def invalidate_prefix(self) -> None:
+        """Forget the primed context (it is rebuilt on the next summary)"""
+        with self._prefix_lock:
+            self._prefix_contexts = {}
+
     def summarize_search_results(
         self,
         query: str,
@@ -104,17 +190,23 @@ class OllamaClient:
 
         results_text = "\n".join(formatted_results)
 
-        # Build prompt
-        prompt = SUMMARY_PROMPT_TEMPLATE.format(
-            query=query,
-            results=results_text
-        )
-
-        # Generate summary
-        summary = self.generate(
-            prompt=prompt,
-            system=SYSTEM_PROMPT
-        )
+        # Continue the primed prefix so Ollama only evaluates the new tokens
+        summary = None
+        context = self.prefix_context()
+        if context:
+            summary = self.generate(
+                prompt=SUMMARY_REQUEST_TEMPLATE.format(query=query, results=results_text),
+                context=context
+            )
+            if not summary:
+                self.invalidate_prefix()
+
+        # Fall back to the full prompt (prefix first, so Ollama's prompt cache still helps)
+        if not summary:
+            summary = self.generate(
+                prompt=SUMMARY_PROMPT_TEMPLATE.format(query=query, results=results_text),
+                system=SYSTEM_PROMPT
+            )
 
         if summary:
             return {
@@ -5,16 +5,46 @@ Now serves both the JSON API and a simple web UI that talks to Ollama.
 
 from flask import Flask, request, jsonify, render_template
 from flask_cors import CORS
+import gzip
+import hashlib
+import json
 import sys
-from typing import List, Dict
+import threading
+from collections import OrderedDict
+from typing import Any, List, Dict
 from ollama_client import OllamaClient
-from config import SERVER_HOST, SERVER_PORT, DEBUG, ALLOWED_ORIGINS
+from extractor import ExtractionError, extract_results, normalize_results, profiles
+from config import (
+    SERVER_HOST,
+    SERVER_PORT,
+    DEBUG,
+    ALLOWED_ORIGINS,
+    MAX_HTML_BYTES,
+    COMPRESSION_MIN_BYTES,
+    GZIP_LEVEL,
+    BROTLI_QUALITY,
+    SUMMARY_CACHE_SIZE
+)
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
 
 app = Flask(__name__)
-CORS(app, origins=ALLOWED_ORIGINS)
+# Always send compact JSON, even in debug mode
+app.json.compact = True
+CORS(app, origins=ALLOWED_ORIGINS, expose_headers=['ETag', 'Content-Location'])
 
 ollama = OllamaClient()
 
+COMPRESSIBLE_TYPES = {"application/json", "text/html", "text/plain", "text/css", "application/javascript"}
+# Fields a compact response leaves out because the client sent them
+COMPACT_OMIT = {
+    "summarize": {"query"},
+    "search": {"query"}
+}
+
 
 DEMO_RESULTS: List[Dict[str, str]] = [
     {
@@ -53,6 +83,99 @@ DEMO_RESULTS: List[Dict[str, str]] = [
 ]
 
 
+def summary_etag(route: str, query: str, results: List[Dict[str, str]], compact: bool) -> str:
+    """ETag derived from the request inputs, so repeats are answered without calling Ollama.
+
+    Summaries are sampled, so equal inputs give equivalent rather than
+    byte-identical text; the tag is sent as a weak validator.
+    """
+    payload = json.dumps([route, ollama.settings_fingerprint(), query, results, compact], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class SummaryStore:
+    """Recent successful summaries by ETag, so clients can revalidate with a GET"""
+
+    def __init__(self, maxsize: int = SUMMARY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag: str):
+        """Stored summary for ``etag``, unless the model or prompt settings changed since"""
+        with self._lock:
+            entry = self._data.get(etag)
+            if entry is None:
+                return None
+            if entry[0] != ollama.settings_fingerprint():
+                del self._data[etag]
+                return None
+            self._data.move_to_end(etag)
+            return entry[1]
+
+    def put(self, etag: str, summary: Dict[str, Any]) -> None:
+        with self._lock:
+            self._data[etag] = (ollama.settings_fingerprint(), summary)
+            self._data.move_to_end(etag)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+summaries = SummaryStore()
+
+
+def precondition_failed(etag: str):
+    """412 for a POST whose If-None-Match matches (RFC 9110 §13.1.2); 304 is for GET/HEAD only"""
+    response = jsonify({
+        "success": False,
+        "error": "Summary unchanged; revalidate it with GET /summaries/<etag>",
+        "location": f"/summaries/{etag}"
+    })
+    response.status_code = 412
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def summary_response(route: str, summary: Dict[str, Any], etag: str, compact: bool):
+    """JSON summary response; compact mode drops fields the client already has"""
+    if compact:
+        summary = {key: value for key, value in summary.items() if key not in COMPACT_OMIT[route]}
+    response = jsonify(summary)
+    if summary.get("success"):
+        summaries.put(etag, summary)
+        response.set_etag(etag, weak=True)
+        response.headers["Content-Location"] = f"/summaries/{etag}"
+    return response
+
+
+@app.after_request
+def compress_response(response):
+    """Brotli/gzip-encode text and JSON bodies when the client accepts it"""
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code in (204, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_TYPES
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = request.accept_encodings.best_match(["br", "gzip"] if brotli else ["gzip"])
+    body = response.get_data()
+    if encoding is None or len(body) < COMPRESSION_MIN_BYTES:
+        return response
+    if encoding == "br":
+        response.set_data(brotli.compress(body, quality=BROTLI_QUALITY))
+    else:
+        response.set_data(gzip.compress(body, compresslevel=GZIP_LEVEL))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
 def get_demo_results(query: str) -> List[Dict[str, str]]:
     """Return a static set of results for demo purposes."""
     return [
@@ -89,8 +212,19 @@ def ollama_status():
 
 @app.route('/summarize', methods=['POST'])
 def summarize():
-    """Summarize search results"""
+    """Summarize search results.
+
+    Accepts either scraped ``results`` or the raw result-page ``html`` plus
+    ``engine`` (or the page ``url``), which is parsed with the server-side
+    selector profiles.
+    """
     try:
+        if (request.content_length or 0) > MAX_HTML_BYTES + 64 * 1024:
+            return jsonify({
+                "success": False,
+                "error": "Request too large"
+            }), 413
+
         data = request.get_json()
 
         if not data:
@@ -100,7 +234,7 @@ def summarize():
             }), 400
 
         query = data.get('query', '')
-        results = data.get('results', [])
+        page_html = data.get('html')
 
         if not query:
             return jsonify({
@@ -108,12 +242,34 @@ def summarize():
                 "error": "Query is required"
             }), 400
 
+        if page_html:
+            try:
+                results = extract_results(page_html, data.get('engine'), data.get('url', ''))
+            except ExtractionError as e:
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 400
+            if not results:
+                return jsonify({
+                    "success": False,
+                    "error": "Could not extract search results. The page structure may have changed.",
+                    "extracted": 0
+                }), 422
+        else:
+            results = normalize_results(data.get('results') or [])
+
         if not results:
             return jsonify({
                 "success": False,
                 "error": "No results provided"
             }), 400
 
+        compact = bool(data.get('compact'))
+        etag = summary_etag('summarize', query, results, compact)
+        if request.if_none_match.contains_weak(etag):
+            return precondition_failed(etag)
+
         if not ollama.check_health():
             return jsonify({
                 "success": False,
@@ -121,8 +277,7 @@ def summarize():
             }), 503
 
         result = ollama.summarize_search_results(query, results)
-
-        return jsonify(result)
+        return summary_response('summarize', result, etag, compact)
 
     except Exception as e:
         print(f"Error in summarize endpoint: {e}", file=sys.stderr)
@@ -146,6 +301,10 @@ def search():
             }), 400
 
         results = get_demo_results(query)
+        compact = bool(data.get('compact'))
+        etag = summary_etag('search', query, results, compact)
+        if request.if_none_match.contains_weak(etag):
+            return precondition_failed(etag)
 
         if not ollama.check_health():
             return jsonify({
@@ -155,7 +314,7 @@ def search():
 
         summary = ollama.summarize_search_results(query, results)
         summary["results"] = results
-        return jsonify(summary)
+        return summary_response('search', summary, etag, compact)
 
     except Exception as e:
         print(f"Error in search endpoint: {e}", file=sys.stderr)
@@ -165,6 +324,52 @@ def search():
         }), 500
 
 
+@app.route('/summaries/<etag>', methods=['GET'])
+def stored_summary(etag):
+    """A summary returned earlier by /summarize or /search, addressed by its ETag.
+
+    Clients revalidate a kept summary here with ``If-None-Match`` and get a
+    304 without uploading the results or HTML again.
+    """
+    summary = summaries.get(etag)
+    if summary is None:
+        return jsonify({
+            "success": False,
+            "error": "Unknown or expired summary"
+        }), 404
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(summary)
+    response.set_etag(etag, weak=True)
+    response.cache_control.no_cache = True
+    return response
+
+
+@app.route('/extract', methods=['POST'])
+def extract():
+    """Extract normalized results from result-page HTML without summarizing"""
+    data = request.get_json(silent=True) or {}
+    if not data.get('html'):
+        return jsonify({
+            "success": False,
+            "error": "HTML is required",
+            "engines": profiles.engines()
+        }), 400
+    try:
+        results = extract_results(data['html'], data.get('engine'), data.get('url', ''))
+    except ExtractionError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "engines": profiles.engines()
+        }), 400
+    return jsonify({
+        "success": True,
+        "results": results
+    })
+
+
 @app.route('/models', methods=['GET'])
 def list_models():
     """List available Ollama models"""
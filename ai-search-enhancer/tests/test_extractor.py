@@ -0,0 +1,68 @@
+"""
+Unit tests for server-side result extraction
+"""
+
+import sys
+sys.path.insert(0, '../src')
+
+import pytest
+from extractor import ExtractionError, extract_results, normalize_results
+
+
+GOOGLE_HTML = """
+<div id="rso">
+  <div class="g"><div data-hveid="1">
+    <a href="/url?q=https://example.com/ml%3Futm_source%3Dx&sa=U"><h3>What is  Machine Learning?</h3></a>
+    <div class="VwiC3b">Machine learning is a field of study in artificial intelligence.</div>
+  </div></div>
+  <div class="g">
+    <a href="https://example.com/ml"><h3>Duplicate of the first</h3></a>
+    <div class="VwiC3b">Same page, different tracking.</div>
+  </div>
+  <div class="g">
+    <a href="https://other.example.org/guide#intro"><h3>ML Guide</h3></a>
+    <div class="VwiC3b">""" + "word " * 200 + """</div>
+  </div>
+  <div class="g"><h3>No link or snippet</h3></div>
+</div>
+"""
+
+
+def test_extract_google_profile():
+    """Test Google results are unwrapped, deduplicated and truncated"""
+    results = extract_results(GOOGLE_HTML, 'google', 'https://www.google.com/search?q=ml')
+    assert [r['title'] for r in results] == ['What is Machine Learning?', 'ML Guide']
+    assert results[0]['url'] == 'https://example.com/ml?utm_source=x'
+    assert len(results[1]['snippet']) <= 300
+    assert results[1]['snippet'].endswith('…')
+
+
+def test_extract_detects_engine_and_limits():
+    """Test the engine is detected from the page URL and results are capped"""
+    items = "".join(
+        f'<li class="b_algo"><h2><a href="https://site{i}.example/">Result {i}</a></h2>'
+        f'<div class="b_caption"><p>Snippet {i}</p></div></li>'
+        for i in range(15)
+    )
+    results = extract_results(f'<ol id="b_results">{items}</ol>', None,
+                              'https://www.bing.com/search?q=x', limit=5)
+    assert [r['url'] for r in results] == [f'https://site{i}.example/' for i in range(5)]
+
+
+def test_unknown_engine_rejected():
+    """Test unknown engines raise an extraction error"""
+    with pytest.raises(ExtractionError):
+        extract_results('<div></div>', '../secrets')
+    with pytest.raises(ExtractionError):
+        extract_results('<div></div>', None, 'https://search.example/')
+
+
+def test_normalize_client_results():
+    """Test client-scraped results are cleaned the same way"""
+    results = normalize_results([
+        {'title': ' A \n title ', 'url': 'https://a.example/x/', 'snippet': 'one'},
+        {'title': 'Again', 'url': 'https://A.example/x', 'snippet': 'two'},
+        {'title': 'Script', 'url': 'javascript:alert(1)', 'snippet': 'bad'},
+        'not a result'
+    ])
+    assert results == [{'title': 'A title', 'url': 'https://a.example/x/', 'snippet': 'one'}]
@@ -0,0 +1,115 @@
+"""
+Unit tests for Ollama prefix-context reuse
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, '../src')
+
+import pytest
+from config import PREFIX_PRIMING_PROMPT
+from ollama_client import OllamaClient
+
+
+class FakeOllama(BaseHTTPRequestHandler):
+    """Answers /api/generate, recording payloads; contexts are just token lists"""
+
+    requests = []
+    fail_with_context = False
+    # Cleared to hold priming requests until it is set again
+    priming_gate = threading.Event()
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if PREFIX_PRIMING_PROMPT in payload['prompt']:
+            self.priming_gate.wait(10)
+        self.requests.append(payload)
+        if payload.get('context') and self.fail_with_context:
+            self.send_response(500)
+            self.end_headers()
+            return
+        body = json.dumps({
+            'response': 'A summary.',
+            'context': payload.get('context', []) + [len(self.requests)]
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def client():
+    """OllamaClient pointed at a fake Ollama server"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    FakeOllama.requests = []
+    FakeOllama.fail_with_context = False
+    FakeOllama.priming_gate.set()
+    yield OllamaClient(host=f'http://127.0.0.1:{server.server_port}', model='test-model')
+    server.shutdown()
+    server.server_close()
+
+
+RESULTS = [{'title': 'A', 'url': 'https://a.example/', 'snippet': 'First'}]
+
+
+def test_prefix_primed_once_and_reused(client):
+    """Test the prefix is evaluated once and later requests continue its context"""
+    assert client.summarize_search_results('one', RESULTS)['success']
+    assert client.summarize_search_results('two', RESULTS)['success']
+    priming, first, second = FakeOllama.requests
+    assert 'system' in priming and 'context' not in priming
+    assert first['context'] == second['context'] == [1]
+    assert 'system' not in second and second['prompt'].startswith('Query: "two"')
+    assert all(request['keep_alive'] for request in FakeOllama.requests)
+
+
+def test_model_change_reprimes(client):
+    """Test switching models primes a new context"""
+    client.summarize_search_results('one', RESULTS)
+    client.model = 'other-model'
+    client.summarize_search_results('one', RESULTS)
+    primes = [request for request in FakeOllama.requests if 'context' not in request]
+    assert [request['model'] for request in primes] == ['test-model', 'other-model']
+
+
+def test_falls_back_to_full_prompt(client):
+    """Test a failing continuation drops the context and uses the full prompt"""
+    FakeOllama.fail_with_context = True
+    result = client.summarize_search_results('one', RESULTS)
+    assert result['success']
+    fallback = FakeOllama.requests[-1]
+    assert 'context' not in fallback and fallback['system']
+    assert 'Query: "one"' in fallback['prompt']
+    assert client._prefix_contexts == {}
+
+
+def test_priming_does_not_block_other_requests(client):
+    """Test a request arriving during a slow priming call uses the full prompt without waiting"""
+    FakeOllama.priming_gate.clear()
+    priming = threading.Thread(target=client.prefix_context)
+    priming.start()
+    while not client._prefix_priming:
+        time.sleep(0.01)
+    result = client.summarize_search_results('two', RESULTS)
+    assert result['success']
+    assert 'context' not in FakeOllama.requests[0]
+    assert 'Query: "two"' in FakeOllama.requests[0]['prompt']
+    FakeOllama.priming_gate.set()
+    priming.join()
+    assert client.prefix_context() == [2]
+    assert client._prefix_priming == set()
+
+
+def test_host_is_part_of_fingerprint(client):
+    """Test a context primed on one Ollama server is not reused for another"""
+    other = OllamaClient(host='http://127.0.0.1:1', model='test-model')
+    assert other.settings_fingerprint() != client.settings_fingerprint()
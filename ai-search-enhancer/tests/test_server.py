@@ -2,6 +2,7 @@
 Unit tests for Flask server
 """
 
+import json
 import sys
 sys.path.insert(0, '../src')
 
@@ -61,3 +62,62 @@ def test_models_endpoint(client):
     data = response.get_json()
     assert 'models' in data
     assert 'current' in data
+
+
+def test_summarize_extracts_html(client, monkeypatch):
+    """Test summarize parses posted result HTML with the engine profile"""
+    import server
+    captured = {}
+
+    def fake_summarize(query, results):
+        captured['results'] = results
+        return {'success': True, 'query': query, 'num_results': len(results)}
+
+    monkeypatch.setattr(server.ollama, 'check_health', lambda: True)
+    monkeypatch.setattr(server.ollama, 'summarize_search_results', fake_summarize)
+    html = ('<li class="b_algo"><h2><a href="https://a.example/">A</a></h2>'
+            '<div class="b_caption"><p>First</p></div></li>')
+    response = client.post('/summarize', json={'query': 'a', 'engine': 'bing', 'html': html})
+    assert response.status_code == 200
+    assert captured['results'] == [{'title': 'A', 'url': 'https://a.example/', 'snippet': 'First'}]
+    assert 'results' not in response.get_json()
+
+
+def test_summarize_html_errors(client):
+    """Test unknown engines and pages without results are rejected"""
+    response = client.post('/summarize', json={'query': 'a', 'engine': 'nope', 'html': '<p></p>'})
+    assert response.status_code == 400
+    response = client.post('/summarize', json={'query': 'a', 'engine': 'google', 'html': '<p></p>'})
+    assert response.status_code == 422
+    assert response.get_json()['extracted'] == 0
+
+
+def test_summary_etag_and_compression(client, monkeypatch):
+    """Test repeat summaries revalidate via GET without Ollama and large bodies are compressed"""
+    import gzip
+    import server
+    calls = []
+
+    def fake_summarize(query, results):
+        calls.append(query)
+        return {'success': True, 'query': query, 'summary': 'text ' * 200, 'num_results': len(results)}
+
+    monkeypatch.setattr(server.ollama, 'check_health', lambda: True)
+    monkeypatch.setattr(server.ollama, 'summarize_search_results', fake_summarize)
+    body = {'query': 'q', 'compact': True,
+            'results': [{'title': 'A', 'url': 'https://a.example/', 'snippet': 'First'}]}
+    first = client.post('/summarize', json=body, headers={'Accept-Encoding': 'gzip'})
+    assert first.headers['Content-Encoding'] == 'gzip'
+    data = json.loads(gzip.decompress(first.data))
+    assert 'results' not in data and 'query' not in data
+    repeat = client.post('/summarize', json=body, headers={'If-None-Match': first.headers['ETag']})
+    assert repeat.status_code == 412
+    location = first.headers['Content-Location']
+    revalidated = client.get(location, headers={'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 304
+    stored = client.get(location, headers={'Accept-Encoding': 'gzip'})
+    assert json.loads(gzip.decompress(stored.data)) == data
+    assert calls == ['q']
+    assert client.get('/summaries/unknown').status_code == 404
+    monkeypatch.setattr(server.ollama, 'settings_fingerprint', lambda: 'other-model')
+    assert client.get(location).status_code == 404
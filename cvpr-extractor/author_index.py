@@ -0,0 +1,99 @@
+"""Author -> papers index with interned author names, in flat arrays."""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+from cvpr_extractor import PaperEntry
+
+
+class StringPool:
+    """Maps each distinct string to a small integer id (and back)."""
+
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def intern(self, value: str) -> int:
+        idx = self.ids.get(value)
+        if idx is None:
+            idx = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return idx
+
+
+class AuthorIndex:
+    """Which rows of a paper list each author wrote, and who wrote each row.
+
+    Rows are positions in the list the index was built from; the papers
+    themselves are not copied, so the index only adds its id arrays on top of
+    that list. Author names are interned into a string pool and each row's
+    authors are a slice of one flat id array (CSR layout). The inverse
+    author -> rows index uses the same layout, so author and co-author
+    lookups are direct slices instead of scans over every paper.
+    """
+
+    def __init__(self, papers: Sequence[PaperEntry]) -> None:
+        self.authors = StringPool()
+        self.author_offsets = array("I", [0])
+        self.author_ids = array("I")
+        for paper in papers:
+            self.author_ids.extend(self.authors.intern(name) for name in paper.authors)
+            self.author_offsets.append(len(self.author_ids))
+        self._paper_offsets: array | None = None
+        self._paper_ids: array | None = None
+        self._folded_authors: Dict[str, List[int]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.author_offsets) - 1
+
+    def author_ids_of(self, row: int) -> array:
+        return self.author_ids[self.author_offsets[row]:self.author_offsets[row + 1]]
+
+    def _build_inverse(self) -> None:
+        counts = array("I", [0]) * (len(self.authors) + 1)
+        for author in self.author_ids:
+            counts[author + 1] += 1
+        for idx in range(1, len(counts)):
+            counts[idx] += counts[idx - 1]
+        offsets = array("I", counts)
+        cursor = array("I", counts)
+        paper_ids = array("I", [0]) * len(self.author_ids)
+        for row in range(len(self)):
+            for author in self.author_ids_of(row):
+                paper_ids[cursor[author]] = row
+                cursor[author] += 1
+        self._paper_offsets, self._paper_ids = offsets, paper_ids
+
+    def _resolve_author(self, name: str) -> List[int]:
+        author = self.authors.ids.get(name)
+        if author is not None:
+            return [author]
+        if self._folded_authors is None:
+            folded: Dict[str, List[int]] = {}
+            for idx, value in enumerate(self.authors.strings):
+                folded.setdefault(value.casefold(), []).append(idx)
+            self._folded_authors = folded
+        return self._folded_authors.get(name.casefold(), [])
+
+    def papers_by_author(self, name: str) -> List[int]:
+        """Rows of the papers ``name`` co-wrote (exact match, then case-insensitive)."""
+        if self._paper_ids is None:
+            self._build_inverse()
+        rows: List[int] = []
+        for author in self._resolve_author(name):
+            rows.extend(self._paper_ids[self._paper_offsets[author]:self._paper_offsets[author + 1]])
+        return sorted(set(rows))
+
+    def coauthors(self, name: str) -> List[Tuple[str, int]]:
+        """Co-authors of ``name`` with the number of shared papers, most frequent first."""
+        own = set(self._resolve_author(name))
+        counts: Counter = Counter()
+        for row in self.papers_by_author(name):
+            counts.update(author for author in self.author_ids_of(row) if author not in own)
+        return [(self.authors.strings[author], count) for author, count in counts.most_common()]
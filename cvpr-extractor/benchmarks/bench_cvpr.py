@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""Offline parser and search benchmarks for cvpr_extractor, compared against a stored baseline."""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+try:
+    import resource
+except ImportError:  # not available on Windows; memory metrics are skipped there
+    resource = None
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from cvpr_extractor import (  # noqa: E402
+    PARSER_ENGINES,
+    _extract_authors,
+    _extract_session,
+    filter_papers,
+    parse_papers,
+)
+from search_index import SearchIndex  # noqa: E402
+
+FIXTURE = ROOT / "tests" / "fixtures" / "cvpr_2024_sample.html"
+BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_ROWS = "10000"
+DEFAULT_TOLERANCE = 0.3
+KEYWORDS = ("diffusion", "park", "segmentation")
+QUERIES = ("diffusion", "author:park highlight:true", '"gaussian splatting"', "seg* -video", "(nerf OR pose) session:orals")
+# Extra title words so scaled pages have a realistic vocabulary instead of N copies of the same titles.
+VOCABULARY = (
+    "diffusion transformer video segmentation nerf gaussian splatting pose depth tracking retrieval "
+    "few-shot contrastive multimodal detection occupancy point cloud panoptic adversarial distillation "
+    "self-supervised scene graph reconstruction flow stereo event camera lidar radar text-to-image"
+).split()
+_TBODY = re.compile(r"(<tbody>)(.*?)(</tbody>)", re.S)
+_TITLE = re.compile(r'(<a href="[^"]*">|<strong>)([^<]+)(</a>|</strong>)')
+_POSTER_ID = re.compile(r"/poster/(\d+)")
+
+
+def synthesize(html: str, rows: int, seed: int = 0) -> str:
+    """Scale a saved accepted-papers page to roughly ``rows`` table rows.
+
+    The body of the papers table is repeated with unique poster links and a
+    few random topic words appended to every title, so index and query costs
+    grow like they would on a real page instead of hitting duplicates.
+    """
+    match = _TBODY.search(html)
+    if match is None:
+        raise ValueError("The page has no <tbody> to scale.")
+    block = match.group(2)
+    per_copy = max(1, block.count("<tr"))
+    rng = random.Random(seed)
+    copies: List[str] = []
+    for copy in range(-(-rows // per_copy)):
+        text = _POSTER_ID.sub(lambda m: f"/poster/{int(m.group(1)) + copy * 1000}", block)
+        text = _TITLE.sub(
+            lambda m: f"{m.group(1)}{m.group(2)} {' '.join(rng.sample(VOCABULARY, 2))}{m.group(3)}",
+            text,
+        )
+        copies.append(text)
+    return html[: match.start(2)] + "".join(copies) + html[match.end(2):]
+
+
+def best_time(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def per_call(fn: Callable[[], object], repeat: int, min_seconds: float = 0.05) -> float:
+    """Seconds per call of a fast function, timed in loops of at least ``min_seconds``."""
+    loops = 1
+    while best_time(lambda: [fn() for _ in range(loops)], 1) < min_seconds:
+        loops *= 4
+    return best_time(lambda: [fn() for _ in range(loops)], repeat) / loops
+
+
+def _max_rss_mb() -> float:
+    # On Linux ru_maxrss survives exec, so a child would start at its parent's peak;
+    # VmHWM is the high-water mark of this process image only.
+    try:
+        with open("/proc/self/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 2**10
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def peak_rss_mb(page_path: str, engine: str) -> float | None:
+    """Growth of the peak resident set size while ``engine`` parses the page, in MB.
+
+    tracemalloc only sees the Python heap and misses libxml2's C allocations,
+    so each parse runs in a fresh interpreter that compares its ``ru_maxrss``
+    before and after.
+    """
+    if resource is None:
+        return None
+    completed = subprocess.run(
+        [sys.executable, __file__, "--html", page_path, "--measure-rss", engine],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(completed.stdout)
+
+
+def _measure_rss(html: str, engine: str) -> float:
+    gc.collect()
+    before = _max_rss_mb()
+    parse_papers(html, engine=engine)
+    return max(0.0, _max_rss_mb() - before)
+
+
+def available_engines() -> List[str]:
+    engines = []
+    for engine in PARSER_ENGINES:
+        try:
+            parse_papers("<table><tr><td><a>x</a></td></tr></table>", engine=engine)
+        except (ImportError, RuntimeError):
+            continue
+        engines.append(engine)
+    return engines
+
+
+def run(html: str, sizes: List[int], engines: List[str], repeat: int) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+
+    cells = [row.find("td") for row in BeautifulSoup(html, "html.parser").select("table tr") if row.find("td")]
+    results["extract_authors.us_per_row"] = per_call(lambda: [_extract_authors(c) for c in cells], repeat) / len(cells) * 1e6
+    results["extract_session.us_per_row"] = per_call(lambda: [_extract_session(c) for c in cells], repeat) / len(cells) * 1e6
+
+    for rows in sizes:
+        page = synthesize(html, rows)
+        with tempfile.NamedTemporaryFile("w", suffix=".html", encoding="utf-8", delete=False) as handle:
+            handle.write(page)
+        papers = []
+        try:
+            for engine in engines:
+                seconds = best_time(lambda: parse_papers(page, engine=engine), repeat)
+                papers = parse_papers(page, engine=engine)
+                results[f"parse.{engine}.{rows}.seconds"] = seconds
+                results[f"parse.{engine}.{rows}.records_per_s"] = len(papers) / seconds
+                peak = peak_rss_mb(handle.name, engine)
+                if peak is not None:
+                    results[f"parse.{engine}.{rows}.peak_rss_mb"] = peak
+        finally:
+            os.unlink(handle.name)
+
+        for keyword in KEYWORDS:
+            results[f"filter_papers.{rows}.{keyword}.ms"] = per_call(lambda: filter_papers(papers, keyword), repeat) * 1e3
+        results[f"index_build.{rows}.seconds"] = best_time(lambda: SearchIndex(papers), repeat)
+        index = SearchIndex(papers)
+        for query in QUERIES:
+            results[f"query.{rows}.{query}.ms"] = per_call(lambda: index.filter(papers, query), repeat) * 1e3
+    return results
+
+
+def compare(current: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    """Print current vs. baseline and return the metrics that regressed beyond ``tolerance``."""
+    regressions = []
+    width = max(len(metric) for metric in current)
+    print(f"{'metric':<{width}}  {'current':>12}  {'baseline':>12}  {'change':>8}")
+    for metric, value in current.items():
+        base = baseline.get(metric)
+        if base is None or base == 0:
+            print(f"{metric:<{width}}  {value:12.4f}  {'-':>12}  {'new':>8}")
+            continue
+        change = value / base - 1
+        # records_per_s is derived from the parse time, so only the time is checked.
+        worse = change > tolerance and not metric.endswith("records_per_s")
+        flag = "  REGRESSION" if worse else ""
+        print(f"{metric:<{width}}  {value:12.4f}  {base:12.4f}  {change:+8.1%}{flag}")
+        if worse:
+            regressions.append(metric)
+    return regressions
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark cvpr_extractor parsing and search offline.")
+    parser.add_argument("--html", default=str(FIXTURE), help="Saved page to scale (default: the test fixture)")
+    parser.add_argument("--rows", default=DEFAULT_ROWS, help="Comma-separated synthetic page sizes (default: %(default)s)")
+    parser.add_argument("--engines", help=f"Comma-separated parser engines (default: every installed one of {', '.join(PARSER_ENGINES)})")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best is kept (default: %(default)s)")
+    parser.add_argument("--baseline", default=str(BASELINE), help="Baseline file (default: benchmarks/baseline.json)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown before failing (default: %(default)s)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline.")
+    parser.add_argument("--json", dest="json_path", help="Also write the raw results to this file.")
+    # Internal: parse --html once with this engine and print the peak RSS growth (see peak_rss_mb).
+    parser.add_argument("--measure-rss", metavar="ENGINE", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = parse_args(argv if argv is not None else sys.argv[1:])
+    html = Path(args.html).read_text(encoding="utf-8")
+    if args.measure_rss:
+        print(_measure_rss(html, args.measure_rss))
+        return 0
+    sizes = [int(size) for size in args.rows.split(",") if size.strip()]
+    engines = args.engines.split(",") if args.engines else available_engines()
+    results = run(html, sizes, engines, max(1, args.repeat))
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "rows": sizes,
+        "engines": engines,
+        "results": results,
+    }
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {baseline_path}")
+        return 0
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results"] if baseline_path.exists() else {}
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
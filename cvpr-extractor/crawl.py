@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Crawl several years and CVF conferences concurrently into one deduplicated dataset."""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List
+from urllib.parse import urlsplit
+
+import requests
+
+from cvpr_extractor import (
+    CONFERENCE_URLS,
+    ENRICHMENT_FIELDS,
+    PaperEntry,
+    configure_http_cache,
+    fetch_page,
+    normalize_title,
+    parse_papers,
+)
+from exporters import FORMATS, export_papers
+from http_cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_TTL, CacheEntry
+from snapshot_store import Snapshot, get_snapshot_store
+
+DEFAULT_FETCH_WORKERS = 8
+DEFAULT_MIN_INTERVAL = 0.5
+
+
+class HostRateLimiter:
+    """Spaces out request start times per host by at least ``min_interval`` seconds."""
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL) -> None:
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def parse_years(spec: str) -> List[int]:
+    """Parse ``2020-2024``, ``2019,2021`` or a mix of both."""
+    years: List[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, sep, end = part.partition("-")
+        if sep:
+            low, high = sorted((int(start), int(end)))
+            years.extend(range(low, high + 1))
+        else:
+            years.append(int(part))
+    return sorted(set(years))
+
+
+def merge_papers(snapshots: Iterable[Snapshot]) -> List[PaperEntry]:
+    """Merge snapshots, collapsing duplicate rows of the same paper within a conference year.
+
+    Duplicates keep the first row and borrow any field it is missing from
+    later rows; a paper is highlighted if any of its rows is.
+    """
+    merged: Dict[tuple, PaperEntry] = {}
+    for snapshot in sorted(snapshots, key=lambda snap: (snap.conference, snap.year)):
+        for paper in snapshot.papers:
+            key = (snapshot.conference, snapshot.year, normalize_title(paper.title))
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = dataclasses.replace(
+                    paper, authors=list(paper.authors), conference=snapshot.conference, year=snapshot.year
+                )
+                continue
+            existing.link = existing.link or paper.link
+            existing.session = existing.session or paper.session
+            existing.location = existing.location or paper.location
+            existing.authors = existing.authors or list(paper.authors)
+            existing.highlight = existing.highlight or paper.highlight
+            for name in ENRICHMENT_FIELDS:
+                if getattr(existing, name) is None:
+                    setattr(existing, name, getattr(paper, name))
+    return list(merged.values())
+
+
+def crawl(
+    conferences: List[str],
+    years: List[int],
+    fetch_workers: int = DEFAULT_FETCH_WORKERS,
+    parse_workers: int | None = None,
+    min_interval: float = DEFAULT_MIN_INTERVAL,
+    refresh: bool = False,
+) -> List[Snapshot]:
+    """Fetch every (conference, year) page concurrently and parse them in a process pool.
+
+    Pages go through the shared HTTP cache and parsed results through the
+    snapshot store, so re-crawls only download and parse what changed.
+    Pages that do not exist (e.g. a conference that was not held that year)
+    or fail to parse are reported and skipped.
+    """
+    store = get_snapshot_store()
+    limiter = HostRateLimiter(min_interval)
+    targets = [(conference, year) for conference in conferences for year in years]
+
+    def fetch(conference: str, year: int) -> CacheEntry:
+        # Pages the cache answers on its own do not wait for the per-host limiter.
+        return fetch_page(
+            year, refresh=refresh, conference=conference, cache=store.http_cache, throttle=limiter.wait
+        )
+
+    snapshots: List[Snapshot] = []
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_pool, ProcessPoolExecutor(
+        max_workers=parse_workers
+    ) as parse_pool:
+        pending: Dict[Future, tuple] = {
+            fetch_pool.submit(fetch, conference, year): ("fetch", conference, year)
+            for conference, year in targets
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, conference, year, *rest = pending.pop(future)
+                try:
+                    result = future.result()
+                except requests.RequestException as exc:
+                    print(f"Skipping {conference} {year}: {exc}", file=sys.stderr)
+                    continue
+                except Exception as exc:
+                    if stage != "parse":
+                        raise
+                    # One malformed page (or a crashed worker) must not abort the whole crawl.
+                    print(f"Skipping {conference} {year}: could not parse page: {exc!r}", file=sys.stderr)
+                    continue
+                if stage == "fetch":
+                    cached = store.load_disk(conference, year, result.sha256)
+                    if cached is not None:
+                        snapshots.append(cached)
+                        continue
+                    try:
+                        pending[parse_pool.submit(parse_papers, result.body)] = ("parse", conference, year, result.sha256)
+                    except BrokenProcessPool as exc:
+                        print(f"Skipping {conference} {year}: could not parse page: {exc!r}", file=sys.stderr)
+                    continue
+                if not result:
+                    print(f"Skipping {conference} {year}: no papers parsed", file=sys.stderr)
+                    continue
+                snapshots.append(store.build(conference, year, rest[0], result))
+    return snapshots
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Crawl accepted papers for several years and CVF conferences.")
+    parser.add_argument("--years", required=True, help="Years to crawl, e.g. 2015-2024 or 2022,2024")
+    parser.add_argument(
+        "--conferences",
+        default="CVPR",
+        help=f"Comma-separated conferences (default: CVPR; available: {', '.join(CONFERENCE_URLS)})",
+    )
+    parser.add_argument("--json", dest="json_path", default="cvf_corpus.json", help="Merged output path, or - for stdout (default: %(default)s)")
+    parser.add_argument("--format", choices=FORMATS, help="Output format (default: inferred from the --json extension)")
+    parser.add_argument("--fetch-workers", type=int, default=DEFAULT_FETCH_WORKERS, help="Concurrent page downloads (default: %(default)s)")
+    parser.add_argument("--parse-workers", type=int, help="Parser processes (default: CPU count)")
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=DEFAULT_MIN_INTERVAL,
+        help="Minimum seconds between requests to the same host (default: %(default)s)",
+    )
+    parser.add_argument("--refresh", action="store_true", help="Revalidate cached pages even if they are still fresh.")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"Cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL, help="Cache TTL in seconds (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = parse_args(argv or sys.argv[1:])
+    conferences = [name.strip().upper() for name in args.conferences.split(",") if name.strip()]
+    unknown = [name for name in conferences if name not in CONFERENCE_URLS]
+    if unknown:
+        print(f"Unknown conference(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    try:
+        years = parse_years(args.years)
+    except ValueError:
+        print(f"Invalid --years value: {args.years}", file=sys.stderr)
+        return 2
+    configure_http_cache(args.cache_dir, args.cache_ttl)
+
+    started = time.perf_counter()
+    snapshots = crawl(
+        conferences,
+        years,
+        fetch_workers=args.fetch_workers,
+        parse_workers=args.parse_workers,
+        min_interval=args.min_interval,
+        refresh=args.refresh,
+    )
+    if not snapshots:
+        print("No pages could be crawled.", file=sys.stderr)
+        return 1
+    papers = merge_papers(snapshots)
+    try:
+        count = export_papers(papers, args.json_path, args.format)
+    except (ValueError, RuntimeError) as exc:
+        print(f"Cannot write {args.json_path}: {exc}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - started
+    status = sys.stderr if args.json_path == "-" else sys.stdout
+    for snapshot in sorted(snapshots, key=lambda snap: (snap.conference, snap.year)):
+        print(f"{snapshot.conference} {snapshot.year}: {len(snapshot.papers)} rows", file=status)
+    print(f"Wrote {count} deduplicated records to {args.json_path} in {elapsed:.1f}s", file=status)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
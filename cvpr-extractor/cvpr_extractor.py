@@ -5,25 +5,42 @@ from __future__ import annotations
 
 import argparse
 import dataclasses
-import json
+import os
 import re
 import sys
-from pathlib import Path
-from typing import Iterable, List
+from html.parser import HTMLParser
+from itertools import chain, islice
+from typing import IO, Callable, Dict, Iterable, Iterator, List
 
 import requests
 from bs4 import BeautifulSoup, NavigableString, Tag
 
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # lxml is optional; the stream engine is used instead
+    lxml_etree = None
+
+from http_cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_TTL, CacheEntry, HTTPCache
 
 
 CVPR_BASE_URL = "https://cvpr.thecvf.com/Conferences/{year}/AcceptedPapers"
+# Other CVF-style conferences publish accepted papers with the same page layout.
+CONFERENCE_URLS = {
+    "CVPR": CVPR_BASE_URL,
+    "ICCV": "https://iccv.thecvf.com/Conferences/{year}/AcceptedPapers",
+    "WACV": "https://wacv.thecvf.com/Conferences/{year}/AcceptedPapers",
+    "ECCV": "https://eccv.ecva.net/Conferences/{year}/AcceptedPapers",
+}
 USER_AGENT = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
     "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15"
 )
+PARSER_ENGINES = ("bs4", "lxml", "stream")
+# bs4 stays the default: lxml repairs some malformed markup differently (see tests/test_parsers.py).
+DEFAULT_PARSER_ENGINE = "bs4"
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PaperEntry:
     title: str
     link: str | None
@@ -31,16 +48,82 @@ class PaperEntry:
     authors: List[str]
     location: str | None
     highlight: bool
+    conference: str | None = None
+    year: int | None = None
+    # Filled in by enrichment.py; None until a paper has been enriched.
+    resolved_link: str | None = None
+    arxiv_id: str | None = None
+    pdf_url: str | None = None
+    pdf_size: int | None = None
+    page_title: str | None = None
+
+
+ENRICHMENT_FIELDS = ("resolved_link", "arxiv_id", "pdf_url", "pdf_size", "page_title")
+
+
+def normalize_title(title: str) -> str:
+    """Case- and punctuation-insensitive key used to match the same paper across pages."""
+    return " ".join(re.findall(r"\w+", title.casefold()))
 
 
 def _normalize(text: str | None) -> str | None:
     if not text:
         return None
     cleaned = re.sub(r"\s+", " ", text).strip()
-    return cleaned or None
+    # Sessions and locations repeat across thousands of rows; share one copy.
+    return sys.intern(cleaned) if cleaned else None
+
+
+_http_cache: HTTPCache | None = None
 
 
-def fetch_html(year: int) -> str:
+def get_http_cache() -> HTTPCache:
+    global _http_cache
+    if _http_cache is None:
+        _http_cache = HTTPCache()
+    return _http_cache
+
+
+def configure_http_cache(cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_CACHE_TTL) -> HTTPCache:
+    global _http_cache
+    _http_cache = HTTPCache(cache_dir=cache_dir, ttl=ttl)
+    return _http_cache
+
+
+def fetch_page(
+    year: int,
+    refresh: bool = False,
+    conference: str = "CVPR",
+    cache: HTTPCache | None = None,
+    throttle: Callable[[str], None] | None = None,
+) -> CacheEntry:
+    """Fetch the accepted-papers page through the on-disk HTTP cache (``cache`` or the configured one).
+
+    ``throttle`` is called with the URL before each network request (see ``HTTPCache.fetch``).
+    """
+    url = CONFERENCE_URLS[conference].format(year=year)
+    return (cache or get_http_cache()).fetch(
+        url,
+        key=f"{conference.lower()}_{year}",
+        headers={"User-Agent": USER_AGENT},
+        refresh=refresh,
+        throttle=throttle,
+    )
+
+
+def stream_html(year: int, conference: str = "CVPR", chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """Yield the page in decoded chunks as it downloads (bypasses the cache)."""
+    url = CONFERENCE_URLS[conference].format(year=year)
+    with requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=30, stream=True) as resp:
+        resp.raise_for_status()
+        if resp.encoding is None:
+            resp.encoding = "utf-8"
+        yield from resp.iter_content(chunk_size=chunk_size, decode_unicode=True)
+
+
+def fetch_html(year: int, use_cache: bool = True, refresh: bool = False) -> str:
+    if use_cache:
+        return fetch_page(year, refresh=refresh).body
     url = CVPR_BASE_URL.format(year=year)
     resp = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=30)
     resp.raise_for_status()
@@ -66,59 +149,355 @@ def _extract_session(cell: Tag) -> str | None:
     return None
 
 
+_AUTHOR_SEPARATOR = re.compile(r"[·\u00B7]+")
+
+
+def _split_authors(text: str) -> List[str]:
+    if not text:
+        return []
+    return [sys.intern(author.strip()) for author in _AUTHOR_SEPARATOR.split(text) if author.strip()]
+
+
+def _is_highlight_title(title: str) -> bool:
+    title = title.strip().lower()
+    return "highlight" in title or "award" in title
+
+
 def _extract_authors(cell: Tag) -> List[str]:
     block = cell.select_one("div.indented")
     if not block:
         return []
-    text = block.get_text(" ", strip=True)
-    if not text:
-        return []
-    authors = [
-        author.strip()
-        for author in re.split(r"[·\u00B7]+", text)
-        if author.strip()
-    ]
-    return authors
+    return _split_authors(block.get_text(" ", strip=True))
 
 
 def _is_highlight(cell: Tag) -> bool:
     img = cell.find("img")
     if not img:
         return False
-    title = img.get("title", "").strip().lower()
-    return "highlight" in title or "award" in title
+    return _is_highlight_title(img.get("title", ""))
+
+
+def _bs4_entry(row: Tag) -> PaperEntry | None:
+    cells = row.find_all("td")
+    if not cells:
+        return None
+    first = cells[0]
+    title_tag = first.find(["a", "strong"])
+    if not title_tag:
+        return None
+    location = None
+    if len(cells) >= 3:
+        location = _normalize(cells[2].get_text(" ", strip=True))
+    return PaperEntry(
+        title=title_tag.get_text(" ", strip=True),
+        link=title_tag.get("href"),
+        session=_extract_session(first),
+        authors=_extract_authors(first),
+        location=location,
+        highlight=_is_highlight(first),
+    )
 
 
-def parse_papers(html: str) -> List[PaperEntry]:
+def _iter_bs4(html: str) -> Iterator[PaperEntry]:
     soup = BeautifulSoup(html, "html.parser")
-    papers: List[PaperEntry] = []
     for row in soup.select("table tr"):
-        cells = row.find_all("td")
-        if not cells:
-            continue
-        first = cells[0]
-        title_tag = first.find(["a", "strong"])
-        if not title_tag:
-            continue
-        title = title_tag.get_text(" ", strip=True)
-        link = title_tag.get("href")
-        session = _extract_session(first)
-        authors = _extract_authors(first)
-        location = None
-        if len(cells) >= 3:
-            location = _normalize(cells[2].get_text(" ", strip=True))
-        highlight = _is_highlight(first)
-        papers.append(
-            PaperEntry(
-                title=title,
-                link=link,
-                session=session,
-                authors=authors,
-                location=location,
-                highlight=highlight,
-            )
-        )
-    return papers
+        paper = _bs4_entry(row)
+        if paper is not None:
+            yield paper
+
+
+# The lxml and stream engines below mirror the BeautifulSoup semantics used
+# above (get_text(" ", strip=True), previous_sibling walks, html.parser
+# nesting) so all engines produce identical records; see tests/test_parsers.py.
+
+# Strings inside these tags are left out of BeautifulSoup's get_text().
+_HIDDEN_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+_VOID_TAGS = frozenset(
+    {
+        "area", "base", "basefont", "bgsound", "br", "col", "command", "embed",
+        "frame", "hr", "image", "img", "input", "isindex", "keygen", "link",
+        "menuitem", "meta", "nextid", "param", "source", "spacer", "track", "wbr",
+    }
+)
+
+
+def _lxml_strings(element) -> Iterator[str]:
+    if element.text:
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in _HIDDEN_TEXT_TAGS:
+            yield from _lxml_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _lxml_text(element) -> str:
+    return " ".join(part.strip() for part in _lxml_strings(element) if part.strip())
+
+
+def _lxml_session(cell) -> str | None:
+    br = next(cell.iterdescendants("br"), None)
+    if br is None:
+        return None
+    sib = br.getprevious()
+    while True:
+        text = sib.tail if sib is not None else br.getparent().text
+        if text and text.strip():
+            return _normalize(text.strip())
+        if sib is None:
+            return None
+        if isinstance(sib.tag, str):
+            text = _normalize(_lxml_text(sib))
+            if text:
+                return text
+        elif sib.text and sib.text.strip():
+            return _normalize(sib.text.strip())
+        sib = sib.getprevious()
+
+
+def _lxml_entry(row) -> PaperEntry | None:
+    cells = list(row.iterdescendants("td"))
+    if not cells:
+        return None
+    first = cells[0]
+    title_tag = next(first.iterdescendants("a", "strong"), None)
+    if title_tag is None:
+        return None
+    block = next(
+        (div for div in first.iterdescendants("div") if "indented" in (div.get("class") or "").split()),
+        None,
+    )
+    img = next(first.iterdescendants("img"), None)
+    location = None
+    if len(cells) >= 3:
+        location = _normalize(_lxml_text(cells[2]))
+    return PaperEntry(
+        title=_lxml_text(title_tag),
+        link=title_tag.get("href"),
+        session=_lxml_session(first),
+        authors=_split_authors(_lxml_text(block)) if block is not None else [],
+        location=location,
+        highlight=_is_highlight_title(img.get("title") or "") if img is not None else False,
+    )
+
+
+def _iter_lxml(html: str) -> Iterator[PaperEntry]:
+    root = lxml_etree.fromstring(html.encode("utf-8"), lxml_etree.HTMLParser(encoding="utf-8"))
+    if root is None:
+        return
+    for row in root.xpath("//table//tr"):
+        paper = _lxml_entry(row)
+        if paper is not None:
+            yield paper
+
+
+class _Comment(str):
+    """Comment text inside a streamed row; a sibling for session lookup but not part of get_text."""
+
+
+class _Node:
+    """Minimal element used by the stream engine for the rows it is currently parsing."""
+
+    __slots__ = ("tag", "attrs", "children")
+
+    def __init__(self, tag: str, attrs: Dict[str, str], children: list | None) -> None:
+        self.tag = tag
+        self.attrs = attrs
+        self.children = children
+
+    def descendants(self) -> Iterator[_Node]:
+        for child in self.children:
+            if isinstance(child, _Node):
+                yield child
+                yield from child.descendants()
+
+    def find(self, *tags: str) -> _Node | None:
+        return next((node for node in self.descendants() if node.tag in tags), None)
+
+    def strings(self) -> Iterator[str]:
+        for child in self.children:
+            if isinstance(child, _Node):
+                if child.tag not in _HIDDEN_TEXT_TAGS:
+                    yield from child.strings()
+            elif not isinstance(child, _Comment):
+                yield child
+
+    def get_text(self) -> str:
+        return " ".join(part.strip() for part in self.strings() if part.strip())
+
+
+def _node_find_with_parent(node: _Node, tag: str) -> tuple[_Node, int] | None:
+    for idx, child in enumerate(node.children):
+        if isinstance(child, _Node):
+            if child.tag == tag:
+                return node, idx
+            found = _node_find_with_parent(child, tag)
+            if found:
+                return found
+    return None
+
+
+def _node_session(cell: _Node) -> str | None:
+    found = _node_find_with_parent(cell, "br")
+    if not found:
+        return None
+    parent, idx = found
+    for sib in reversed(parent.children[:idx]):
+        if isinstance(sib, _Node):
+            text = _normalize(sib.get_text())
+            if text:
+                return text
+        elif sib.strip():
+            return _normalize(sib.strip())
+    return None
+
+
+def _node_entry(row: _Node) -> PaperEntry | None:
+    cells = [node for node in row.descendants() if node.tag == "td"]
+    if not cells:
+        return None
+    first = cells[0]
+    title_tag = first.find("a", "strong")
+    if title_tag is None:
+        return None
+    block = next(
+        (
+            node
+            for node in first.descendants()
+            if node.tag == "div" and "indented" in node.attrs.get("class", "").split()
+        ),
+        None,
+    )
+    img = first.find("img")
+    location = None
+    if len(cells) >= 3:
+        location = _normalize(cells[2].get_text())
+    return PaperEntry(
+        title=title_tag.get_text(),
+        link=title_tag.attrs.get("href"),
+        session=_node_session(first),
+        authors=_split_authors(block.get_text()) if block is not None else [],
+        location=location,
+        highlight=_is_highlight_title(img.attrs.get("title", "")) if img is not None else False,
+    )
+
+
+class _RowStreamParser(HTMLParser):
+    """Incremental parser that only materialises ``<tr>`` subtrees inside tables.
+
+    Elements outside table rows are tracked on the open-tag stack but keep no
+    children, and each finished row is handed out and dropped, so memory use
+    stays bounded by the largest row rather than the whole page.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._stack: List[_Node] = []
+        self._open: Dict[str, int] = {}
+        self._capture: _Node | None = None
+        self.rows: List[_Node] = []
+
+    def handle_starttag(self, tag, attrs):
+        attributes = {name: "" if value is None else value for name, value in attrs}
+        if self._capture is not None:
+            node = _Node(tag, attributes, [])
+            self._stack[-1].children.append(node)
+        elif tag == "tr" and self._open.get("table"):
+            node = _Node(tag, attributes, [])
+            self._capture = node
+        else:
+            node = _Node(tag, attributes, None)
+        if tag in _VOID_TAGS:
+            return
+        self._stack.append(node)
+        self._open[tag] = self._open.get(tag, 0) + 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if not self._open.get(tag):
+            return
+        while self._stack:
+            node = self._pop()
+            if node.tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._capture is None:
+            return
+        children = self._stack[-1].children
+        if children and type(children[-1]) is str:
+            children[-1] += data
+        else:
+            children.append(data)
+
+    def handle_comment(self, data):
+        if self._capture is not None:
+            self._stack[-1].children.append(_Comment(data))
+
+    def _pop(self) -> _Node:
+        node = self._stack.pop()
+        self._open[node.tag] -= 1
+        if node is self._capture:
+            self.rows.append(node)
+            self._capture = None
+        return node
+
+    def close(self) -> None:
+        super().close()
+        while self._stack:
+            self._pop()
+
+
+def _iter_stream(chunks: Iterable[str]) -> Iterator[PaperEntry]:
+    parser = _RowStreamParser()
+    for chunk in chain(chunks, [None]):
+        if chunk is None:
+            parser.close()
+        else:
+            parser.feed(chunk)
+        rows, parser.rows = parser.rows, []
+        for root in rows:
+            # Rows of nested tables come after their enclosing row, as with select("table tr").
+            for row in chain([root], (node for node in root.descendants() if node.tag == "tr")):
+                paper = _node_entry(row)
+                if paper is not None:
+                    yield paper
+
+
+def _resolve_engine(engine: str) -> str:
+    if engine == "auto":
+        return "lxml" if lxml_etree is not None else "stream"
+    if engine not in PARSER_ENGINES:
+        raise ValueError(f"Unknown parser engine {engine!r}; choose from auto, {', '.join(PARSER_ENGINES)}")
+    if engine == "lxml" and lxml_etree is None:
+        raise RuntimeError("The lxml parser engine requires `pip install lxml`.")
+    return engine
+
+
+def iter_papers(source: str | Iterable[str], engine: str = DEFAULT_PARSER_ENGINE) -> Iterator[PaperEntry]:
+    """Yield papers from ``source``, either a full page or an iterable of HTML chunks.
+
+    ``engine`` is one of ``bs4`` (the default), ``lxml``, ``stream`` or
+    ``auto``, which picks lxml when it is installed and the stream engine otherwise. Only the
+    stream engine consumes chunks incrementally.
+    """
+    engine = _resolve_engine(engine)
+    if engine == "stream":
+        yield from _iter_stream([source] if isinstance(source, str) else source)
+        return
+    html = source if isinstance(source, str) else "".join(source)
+    if engine == "lxml":
+        yield from _iter_lxml(html)
+    else:
+        yield from _iter_bs4(html)
+
+
+def parse_papers(html: str, engine: str = DEFAULT_PARSER_ENGINE) -> List[PaperEntry]:
+    return list(iter_papers(html, engine))
 
 
 def filter_papers(papers: Iterable[PaperEntry], keyword: str | None) -> List[PaperEntry]:
@@ -137,27 +516,30 @@ def filter_papers(papers: Iterable[PaperEntry], keyword: str | None) -> List[Pap
     return filtered
 
 
+def render_paper(idx: int, paper: PaperEntry, file: IO = sys.stdout) -> None:
+    print(f"{idx}. {paper.title}", file=file)
+    if paper.link:
+        print(f"   URL: {paper.link}", file=file)
+    if paper.session:
+        print(f"   Session: {paper.session}", file=file)
+    if paper.location:
+        print(f"   Location: {paper.location}", file=file)
+    if paper.authors:
+        print(f"   Authors: {', '.join(paper.authors)}", file=file)
+    if paper.highlight:
+        print("   ⭐ Highlighted", file=file)
+    print(file=file)
+
+
 def render_papers(papers: Iterable[PaperEntry]) -> None:
     for idx, paper in enumerate(papers, start=1):
-        print(f"{idx}. {paper.title}")
-        if paper.link:
-            print(f"   URL: {paper.link}")
-        if paper.session:
-            print(f"   Session: {paper.session}")
-        if paper.location:
-            print(f"   Location: {paper.location}")
-        if paper.authors:
-            print(f"   Authors: {', '.join(paper.authors)}")
-        if paper.highlight:
-            print("   ⭐ Highlighted")
-        print()
+        render_paper(idx, paper)
 
 
 def write_json(papers: Iterable[PaperEntry], path: str) -> None:
-    target = Path(path)
-    target.parent.mkdir(parents=True, exist_ok=True)
-    with target.open("w", encoding="utf-8") as handle:
-        json.dump([dataclasses.asdict(p) for p in papers], handle, indent=2, ensure_ascii=False)
+    from exporters import export_papers
+
+    export_papers(papers, path, "json")
 
 
 def parse_args(argv: List[str]) -> argparse.Namespace:
@@ -167,40 +549,190 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     parser.add_argument("--year", type=int, default=2024, help="Conference year to fetch (default: 2024)")
     parser.add_argument(
         "--keyword",
-        help="If set, only keep papers whose title/session/authors contain this substring.",
+        help=(
+            "Search query ranked by relevance: words match title/authors/session by prefix; "
+            'supports author:, session:, title:, location:, highlight:true, "phrases", OR, NOT/-word.'
+        ),
+    )
+    parser.add_argument("--author", help="Only keep papers (co-)written by this author (exact or case-insensitive name).")
+    parser.add_argument(
+        "--coauthors",
+        metavar="AUTHOR",
+        help="List the co-authors of AUTHOR with their number of shared papers, then exit.",
+    )
+    parser.add_argument(
+        "--like",
+        metavar="TITLE_OR_TEXT",
+        help="Rank papers by TF-IDF similarity to this paper title or free text (default --limit 10).",
+    )
+    parser.add_argument(
+        "--clusters",
+        type=int,
+        metavar="K",
+        help="Group the papers into K topic clusters, print them (--limit titles each), then exit.",
     )
     parser.add_argument("--limit", type=int, help="Return only the first N matches.")
-    parser.add_argument("--json", dest="json_path", help="Custom JSON output path (default: cvpr_<year>_accepted.json)")
+    parser.add_argument(
+        "--json",
+        dest="json_path",
+        help="Custom output path, or - to stream to stdout (default: cvpr_<year>_accepted.<format>)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("json", "ndjson", "csv", "parquet", "arrow"),
+        help="Output format (default: inferred from the --json extension, else json)",
+    )
     parser.add_argument(
         "--no-json",
         action="store_true",
         help="Disable automatic JSON export (prints only).",
     )
+    parser.add_argument(
+        "--parser",
+        choices=("auto",) + PARSER_ENGINES,
+        default=DEFAULT_PARSER_ENGINE,
+        help="HTML parser engine; auto = lxml if installed, else stream (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Revalidate the cached page with the server even if it is still fresh.",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk HTTP cache.")
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directory for cached pages (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_CACHE_TTL,
+        help="Seconds a cached page is served without revalidation (default: %(default)s)",
+    )
     return parser.parse_args(argv)
 
 
+def _stamp(papers: Iterable[PaperEntry], year: int) -> Iterator[PaperEntry]:
+    for paper in papers:
+        paper.conference = "CVPR"
+        paper.year = year
+        yield paper
+
+
 def main(argv: List[str] | None = None) -> int:
     args = parse_args(argv or sys.argv[1:])
+    http_cache = configure_http_cache(args.cache_dir, args.cache_ttl)
+    from exporters import FORMAT_EXTENSIONS, infer_format, open_exporter
+    from author_index import AuthorIndex
+    from search_index import SearchIndex, SearchQueryError
+    from snapshot_store import configure_snapshot_store
+
+    fmt = args.format or infer_format(args.json_path)
+    json_path: str | None = None
+    if not args.no_json and not (args.coauthors or args.clusters):
+        json_path = args.json_path or f"cvpr_{args.year}_accepted.{FORMAT_EXTENSIONS[fmt]}"
+    # With --json - the records own stdout, so the human-readable listing is skipped.
+    to_stdout = json_path == "-"
+    status = sys.stderr if to_stdout else sys.stdout
+
+    papers: Iterable[PaperEntry]
+    streaming = args.no_cache and not (args.keyword or args.author or args.coauthors or args.like or args.clusters)
     try:
-        html = fetch_html(args.year)
-    except requests.HTTPError as exc:
+        if streaming:
+            # Nothing needs the full list, so export rows as they are parsed off the wire.
+            # bs4 cannot consume chunks; the stream engine matches it, malformed markup included.
+            engine = "stream" if args.parser == DEFAULT_PARSER_ENGINE else args.parser
+            papers = _stamp(iter_papers(stream_html(args.year), engine=engine), args.year)
+        else:
+            needs_authors = bool(args.author or args.coauthors)
+            needs_similarity = bool(args.like or args.clusters)
+            if args.no_cache:
+                from similarity import SimilarityIndex
+
+                papers = list(_stamp(parse_papers(fetch_html(args.year, use_cache=False), engine=args.parser), args.year))
+                index = SearchIndex(papers) if args.keyword else None
+                authors = AuthorIndex(papers) if needs_authors else None
+                similar = SimilarityIndex.build(papers) if needs_similarity and papers else None
+            else:
+                # Run as a script this module is __main__, and snapshot_store imports a
+                # second copy with its own cache global, so hand the cache over explicitly.
+                store = configure_snapshot_store(http_cache)
+                snapshot = store.get(args.year, refresh=args.refresh)
+                papers = snapshot.papers
+                index = store.index_for(snapshot) if args.keyword else None
+                authors = store.author_index_for(snapshot) if needs_authors else None
+                similar = store.similarity_for(snapshot) if needs_similarity and papers else None
+            if not papers:
+                print("No papers were parsed from the page.", file=sys.stderr)
+                return 1
+            if args.coauthors:
+                coauthors = authors.coauthors(args.coauthors)
+                for name, shared in coauthors:
+                    print(f"{shared:3d}  {name}")
+                print(f"{args.coauthors} has {len(coauthors)} co-authors.")
+                return 0
+            if args.clusters:
+                for cluster in similar.cluster(args.clusters):
+                    print(f"== Cluster {cluster.label}: {len(cluster.doc_ids)} papers — {', '.join(cluster.terms)}")
+                    for doc_id in cluster.doc_ids[: args.limit or 5]:
+                        print(f"   {papers[doc_id].title}")
+                return 0
+            wanted = None
+            if authors is not None:
+                wanted = {id(papers[row]) for row in authors.papers_by_author(args.author)}
+            if similar is not None:
+                # Similarity order wins; --keyword and --author only narrow the candidates.
+                if index is not None:
+                    keyword_ids = {id(paper) for paper in index.filter(papers, args.keyword)}
+                    wanted = keyword_ids if wanted is None else wanted & keyword_ids
+                papers = [papers[hit.doc_id] for hit in similar.like(args.like, k=len(papers))]
+                if args.limit is None:
+                    args.limit = 10
+            elif index is not None:
+                papers = index.filter(papers, args.keyword)
+            if wanted is not None:
+                papers = [paper for paper in papers if id(paper) in wanted]
+        if args.limit is not None:
+            papers = islice(papers, args.limit)
+
+        exporter = None
+        if json_path:
+            try:
+                exporter = open_exporter(json_path, fmt)
+            except (ValueError, RuntimeError) as exc:
+                print(f"Cannot write {json_path}: {exc}", file=sys.stderr)
+                return 2
+        count = 0
+        try:
+            for paper in papers:
+                count += 1
+                if exporter is not None:
+                    exporter.write(paper)
+                if not to_stdout:
+                    render_paper(count, paper)
+        finally:
+            if exporter is not None:
+                exporter.close()
+    except requests.RequestException as exc:
         print(f"Failed to fetch CVPR data: {exc}", file=sys.stderr)
         return 1
-    papers = parse_papers(html)
-    if not papers:
+    except BrokenPipeError:
+        # The consumer of --json - (e.g. `head`) stopped reading; that is not an error.
+        sys.stdout = open(os.devnull, "w")
+        return 0
+    except SearchQueryError as exc:
+        print(f"Invalid --keyword query: {exc}", file=sys.stderr)
+        return 2
+    except RuntimeError as exc:  # an optional dependency (lxml, numpy/scipy) is missing
+        print(str(exc), file=sys.stderr)
+        return 2
+    if count == 0 and streaming:
         print("No papers were parsed from the page.", file=sys.stderr)
         return 1
-    papers = filter_papers(papers, args.keyword)
-    if args.limit is not None:
-        papers = papers[: args.limit]
-    json_path: str | None = None
-    if not args.no_json:
-        json_path = args.json_path or f"cvpr_{args.year}_accepted.json"
-    if json_path:
-        write_json(papers, json_path)
-        print(f"Wrote {len(papers)} records to {json_path}")
-    render_papers(papers)
-    print(f"Displayed {len(papers)} records.")
+    if json_path and not to_stdout:
+        print(f"Wrote {count} records to {json_path}", file=status)
+    print(f"Displayed {count} records.", file=status)
     return 0
 
 
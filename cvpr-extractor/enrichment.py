@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""Resolve paper links and enrich papers with arXiv ids, PDF links/sizes and page titles."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import os
+import re
+import sqlite3
+import sys
+import time
+from html import unescape
+from pathlib import Path
+from typing import Dict, Iterable, List
+from urllib.parse import quote, urljoin, urlsplit
+
+import requests
+
+from cvpr_extractor import (
+    CONFERENCE_URLS,
+    ENRICHMENT_FIELDS,
+    USER_AGENT,
+    PaperEntry,
+    configure_http_cache,
+    normalize_title,
+)
+from http_cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_TTL
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional; without it requests runs on worker threads
+    aiohttp = None
+
+ENRICHMENT_DB = "enrichment.sqlite3"
+DEFAULT_CONCURRENCY = 32
+DEFAULT_MIN_INTERVAL = 0.2
+# arXiv asks API clients to leave three seconds between requests.
+HOST_INTERVALS = {"export.arxiv.org": 3.0}
+DEFAULT_MAX_AGE_DAYS = 30.0
+DEFAULT_TIMEOUT = 20.0
+MAX_BODY_BYTES = 512 * 1024
+CHECKPOINT_EVERY = 50
+ARXIV_API = "https://export.arxiv.org/api/query?max_results=3&search_query=ti:{query}"
+
+_ARXIV_ID = re.compile(r"arxiv\.org/(?:abs|pdf)/(\d{4}\.\d{4,5})", re.I)
+_TITLE_TAG = re.compile(r"<title[^>]*>(.*?)</title>", re.I | re.S)
+_PDF_HREF = re.compile(r"""href=["']([^"'#?]+\.pdf)(?:[?#][^"']*)?["']""", re.I)
+_ATOM_ENTRY = re.compile(r"<entry>(.*?)</entry>", re.S)
+_ATOM_ID = re.compile(r"<id>\s*https?://arxiv\.org/abs/(\d{4}\.\d{4,5})")
+
+if aiohttp is not None:
+    _NETWORK_ERRORS: tuple = (requests.RequestException, aiohttp.ClientError, asyncio.TimeoutError, UnicodeError)
+else:
+    _NETWORK_ERRORS = (requests.RequestException, asyncio.TimeoutError, UnicodeError)
+
+
+@dataclasses.dataclass
+class Fetched:
+    status: int
+    final_url: str
+    content_type: str
+    content_length: int | None
+    # Only HTML/XML bodies are read (up to MAX_BODY_BYTES); PDFs are never downloaded.
+    text: str | None
+
+
+@dataclasses.dataclass
+class LinkInfo:
+    """What one URL resolved to; cached in the ``responses`` table."""
+
+    url: str
+    status: int
+    final_url: str
+    content_type: str
+    content_length: int | None
+    title: str | None
+    arxiv_id: str | None
+    pdf_url: str | None
+    fetched_at: float
+
+    @property
+    def is_pdf(self) -> bool:
+        return self.content_type == "application/pdf"
+
+
+def _content_type(header: str | None) -> str:
+    return (header or "").split(";")[0].strip().lower()
+
+
+def _wants_body(content_type: str) -> bool:
+    return "html" in content_type or "xml" in content_type
+
+
+class _AiohttpClient:
+    def __init__(self, concurrency: int, timeout: float) -> None:
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.session = None
+
+    async def __aenter__(self) -> _AiohttpClient:
+        self.session = aiohttp.ClientSession(
+            headers={"User-Agent": USER_AGENT},
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.session.close()
+
+    async def get(self, url: str) -> Fetched:
+        async with self.session.get(url, allow_redirects=True) as response:
+            content_type = _content_type(response.headers.get("Content-Type"))
+            text = None
+            if _wants_body(content_type):
+                raw = await response.content.read(MAX_BODY_BYTES)
+                text = raw.decode(response.charset or "utf-8", errors="replace")
+            return Fetched(response.status, str(response.url), content_type, response.content_length, text)
+
+
+class _ThreadedClient:
+    """Fallback when aiohttp is missing: blocking requests calls on the default executor."""
+
+    def __init__(self, concurrency: int, timeout: float) -> None:
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    async def __aenter__(self) -> _ThreadedClient:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.session.close()
+
+    def _get(self, url: str) -> Fetched:
+        with self.session.get(url, timeout=self.timeout, stream=True, allow_redirects=True) as response:
+            content_type = _content_type(response.headers.get("Content-Type"))
+            length = response.headers.get("Content-Length")
+            text = None
+            if _wants_body(content_type):
+                raw = response.raw.read(MAX_BODY_BYTES, decode_content=True)
+                text = raw.decode(response.encoding or "utf-8", errors="replace")
+            return Fetched(response.status_code, response.url, content_type, int(length) if length else None, text)
+
+    async def get(self, url: str) -> Fetched:
+        return await asyncio.to_thread(self._get, url)
+
+
+class AsyncHostRateLimiter:
+    """asyncio counterpart of ``crawl.HostRateLimiter``: spaces out request starts per host."""
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL, overrides: Dict[str, float] | None = None) -> None:
+        self.min_interval = min_interval
+        self.overrides = HOST_INTERVALS if overrides is None else overrides
+        self._next_slot: Dict[str, float] = {}
+
+    async def wait(self, url: str) -> None:
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.overrides.get(host, self.min_interval)
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class EnrichmentCache:
+    """SQLite file holding the response cache and the per-paper results.
+
+    ``responses`` caches what each URL resolved to, so papers sharing a link
+    and re-runs do not refetch it. ``papers`` is the checkpoint: a row is
+    written as each paper finishes, so an interrupted run resumes where it
+    stopped and later runs only visit new, changed or stale papers.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY, status INTEGER, final_url TEXT, content_type TEXT,
+                content_length INTEGER, title TEXT, arxiv_id TEXT, pdf_url TEXT, fetched_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS papers (
+                conference TEXT, year INTEGER, key TEXT, link TEXT,
+                resolved_link TEXT, arxiv_id TEXT, pdf_url TEXT, pdf_size INTEGER, page_title TEXT,
+                error TEXT, enriched_at REAL,
+                PRIMARY KEY (conference, year, key)
+            );
+            """
+        )
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    def response(self, url: str, max_age: float) -> LinkInfo | None:
+        row = self.conn.execute(
+            "SELECT url, status, final_url, content_type, content_length, title, arxiv_id, pdf_url, fetched_at"
+            " FROM responses WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None or time.time() - row[-1] > max_age:
+            return None
+        return LinkInfo(*row)
+
+    def put_response(self, info: LinkInfo) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            dataclasses.astuple(info),
+        )
+
+    def results(self, conference: str, year: int) -> Dict[str, Dict]:
+        cursor = self.conn.execute(
+            f"SELECT key, link, error, enriched_at, {', '.join(ENRICHMENT_FIELDS)}"
+            " FROM papers WHERE conference = ? AND year = ?",
+            (conference, year),
+        )
+        names = [column[0] for column in cursor.description]
+        return {row[0]: dict(zip(names, row)) for row in cursor}
+
+    def put_result(self, conference: str, year: int, paper: PaperEntry, values: Dict, error: str | None) -> None:
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO papers (conference, year, key, link, error, enriched_at, {', '.join(ENRICHMENT_FIELDS)})"
+            f" VALUES (?, ?, ?, ?, ?, ?, {', '.join('?' for _ in ENRICHMENT_FIELDS)})",
+            (conference, year, normalize_title(paper.title), paper.link, error, time.time(),
+             *(values.get(name) for name in ENRICHMENT_FIELDS)),
+        )
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+
+def apply_results(papers: Iterable[PaperEntry], results: Dict[str, Dict]) -> int:
+    """Copy stored enrichment onto ``papers`` (matched by normalized title); returns how many matched."""
+    applied = 0
+    for paper in papers:
+        row = results.get(normalize_title(paper.title))
+        if row is None or row["link"] != paper.link:
+            continue
+        for name in ENRICHMENT_FIELDS:
+            setattr(paper, name, row[name])
+        applied += 1
+    return applied
+
+
+def apply_stored(db_path: str | os.PathLike, conference: str, year: int, papers: List[PaperEntry]) -> int:
+    """Merge previously stored enrichment into freshly parsed papers, without any network access."""
+    if not Path(db_path).exists():
+        return 0
+    cache = EnrichmentCache(db_path)
+    try:
+        return apply_results(papers, cache.results(conference, year))
+    finally:
+        cache.close()
+
+
+class Enricher:
+    """Enriches papers concurrently with bounded concurrency and per-host rate limiting."""
+
+    def __init__(
+        self,
+        cache: EnrichmentCache,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+        arxiv_search: bool = False,
+    ) -> None:
+        self.cache = cache
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.max_age = max_age_days * 86400
+        self.arxiv_search = arxiv_search
+        self.requests_made = 0
+        self._limiter = AsyncHostRateLimiter(min_interval)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def pending(self, conference: str, year: int, papers: Iterable[PaperEntry], force: bool = False) -> List[PaperEntry]:
+        """Papers that are new, whose link changed, that failed last time, or whose result is stale."""
+        results = self.cache.results(conference, year)
+        todo = []
+        for paper in papers:
+            if not paper.link and not self.arxiv_search:
+                continue
+            row = results.get(normalize_title(paper.title))
+            if (
+                force
+                or row is None
+                or row["link"] != paper.link
+                or row["error"] is not None
+                or time.time() - row["enriched_at"] > self.max_age
+            ):
+                todo.append(paper)
+        return todo
+
+    async def _link_info(self, client, url: str) -> LinkInfo:
+        cached = self.cache.response(url, self.max_age)
+        if cached is not None:
+            return cached
+        # Papers sharing a link (or a PDF) wait for the same request.
+        task = self._inflight.get(url)
+        if task is None:
+            task = self._inflight[url] = asyncio.ensure_future(self._fetch_link(client, url))
+        return await asyncio.shield(task)
+
+    async def _fetch_link(self, client, url: str) -> LinkInfo:
+        try:
+            await self._limiter.wait(url)
+            self.requests_made += 1
+            fetched = await client.get(url)
+        finally:
+            self._inflight.pop(url, None)
+        title = arxiv_id = pdf_url = None
+        if fetched.text is not None:
+            match = _TITLE_TAG.search(fetched.text)
+            if match:
+                title = " ".join(unescape(match.group(1)).split()) or None
+            found = _ARXIV_ID.search(fetched.final_url) or _ARXIV_ID.search(fetched.text)
+            arxiv_id = found.group(1) if found else None
+            pdf = _PDF_HREF.search(fetched.text)
+            pdf_url = urljoin(fetched.final_url, unescape(pdf.group(1))) if pdf else None
+        else:
+            found = _ARXIV_ID.search(fetched.final_url)
+            arxiv_id = found.group(1) if found else None
+        info = LinkInfo(
+            url=url,
+            status=fetched.status,
+            final_url=fetched.final_url,
+            content_type=fetched.content_type,
+            content_length=fetched.content_length,
+            title=title,
+            arxiv_id=arxiv_id,
+            pdf_url=pdf_url,
+            fetched_at=time.time(),
+        )
+        # Failures are not cached so the next run retries them.
+        if fetched.status < 400:
+            self.cache.put_response(info)
+        return info
+
+    async def _search_arxiv(self, client, title: str) -> str | None:
+        """arXiv id of the search hit whose title matches exactly, if any."""
+        await self._limiter.wait(ARXIV_API)
+        self.requests_made += 1
+        fetched = await client.get(ARXIV_API.format(query=quote(f'"{title}"')))
+        wanted = normalize_title(title)
+        for entry in _ATOM_ENTRY.findall(fetched.text or ""):
+            found = _ATOM_ID.search(entry)
+            match = _TITLE_TAG.search(entry)
+            if found and match and normalize_title(unescape(match.group(1))) == wanted:
+                return found.group(1)
+        return None
+
+    async def _enrich(self, client, paper: PaperEntry) -> Dict:
+        values: Dict = {}
+        if paper.link:
+            info = await self._link_info(client, paper.link)
+            if info.status >= 400:
+                raise requests.HTTPError(f"HTTP {info.status} for {paper.link}")
+            values["resolved_link"] = info.final_url
+            values["page_title"] = info.title
+            values["arxiv_id"] = info.arxiv_id
+            if info.is_pdf:
+                values["pdf_url"], values["pdf_size"] = info.final_url, info.content_length
+            elif info.pdf_url:
+                pdf = await self._link_info(client, info.pdf_url)
+                if pdf.is_pdf:
+                    values["pdf_url"], values["pdf_size"] = pdf.final_url, pdf.content_length
+        if not values.get("arxiv_id") and self.arxiv_search:
+            values["arxiv_id"] = await self._search_arxiv(client, paper.title)
+        if values.get("arxiv_id") and not values.get("pdf_url"):
+            values["pdf_url"] = f"https://arxiv.org/pdf/{values['arxiv_id']}"
+        return values
+
+    async def run(self, conference: str, year: int, papers: List[PaperEntry], progress=None) -> int:
+        """Enrich ``papers`` and checkpoint each result; returns how many failed.
+
+        A paper that fails, for whatever reason, is recorded as failed (and so
+        retried next run) without stopping the others.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        done = failed = 0
+
+        async def worker(paper: PaperEntry) -> None:
+            nonlocal done, failed
+            async with semaphore:
+                try:
+                    values, error = await self._enrich(client, paper), None
+                except _NETWORK_ERRORS as exc:
+                    values, error = {}, str(exc) or type(exc).__name__
+                except Exception as exc:  # pylint: disable=broad-except
+                    print(f"Skipping {paper.title!r}: could not enrich: {exc!r}", file=sys.stderr)
+                    values, error = {}, repr(exc)
+            self.cache.put_result(conference, year, paper, values, error)
+            done += 1
+            failed += error is not None
+            if done % CHECKPOINT_EVERY == 0:
+                self.cache.commit()
+                if progress is not None:
+                    progress(done, len(papers), failed)
+
+        client_cls = _AiohttpClient if aiohttp is not None else _ThreadedClient
+        try:
+            async with client_cls(self.concurrency, self.timeout) as client:
+                await asyncio.gather(*(worker(paper) for paper in papers))
+        finally:
+            self.cache.commit()
+        return failed
+
+
+def enrich_snapshot(store, snapshot, enricher: Enricher, force: bool = False, progress=None) -> tuple[int, int]:
+    """Enrich what is pending in ``snapshot``, merge every stored result into it and persist it.
+
+    Returns (papers visited, failures).
+    """
+    todo = enricher.pending(snapshot.conference, snapshot.year, snapshot.papers, force=force)
+    failed = asyncio.run(enricher.run(snapshot.conference, snapshot.year, todo, progress)) if todo else 0
+    apply_results(snapshot.papers, enricher.cache.results(snapshot.conference, snapshot.year))
+    store.save_disk(snapshot)
+    return len(todo), failed
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Resolve paper links and add arXiv ids, PDF links/sizes and page titles.")
+    parser.add_argument("--years", default="2024", help="Years to enrich, e.g. 2023-2024 (default: %(default)s)")
+    parser.add_argument("--conferences", default="CVPR", help="Comma-separated conferences (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Requests in flight (default: %(default)s)")
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=DEFAULT_MIN_INTERVAL,
+        help="Minimum seconds between requests to the same host (default: %(default)s)",
+    )
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-request timeout in seconds (default: %(default)s)")
+    parser.add_argument(
+        "--max-age-days",
+        type=float,
+        default=DEFAULT_MAX_AGE_DAYS,
+        help="Re-check results and cached responses older than this (default: %(default)s)",
+    )
+    parser.add_argument("--arxiv-search", action="store_true", help="Look up arXiv ids by title for papers without one (slow: 3s per query).")
+    parser.add_argument("--force", action="store_true", help="Re-enrich every paper, ignoring stored results (cached responses are still used).")
+    parser.add_argument("--json", dest="json_path", help="Also export the enriched papers here (format inferred from the extension).")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"Cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL, help="Cache TTL in seconds (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> int:
+    from crawl import parse_years
+    from exporters import export_papers
+    from snapshot_store import get_snapshot_store
+
+    args = parse_args(argv or sys.argv[1:])
+    conferences = [name.strip().upper() for name in args.conferences.split(",") if name.strip()]
+    unknown = [name for name in conferences if name not in CONFERENCE_URLS]
+    if unknown:
+        print(f"Unknown conference(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    configure_http_cache(args.cache_dir, args.cache_ttl)
+    store = get_snapshot_store()
+    cache = EnrichmentCache(store.snapshot_dir.parent / ENRICHMENT_DB)
+    enricher = Enricher(
+        cache,
+        concurrency=args.concurrency,
+        min_interval=args.min_interval,
+        timeout=args.timeout,
+        max_age_days=args.max_age_days,
+        arxiv_search=args.arxiv_search,
+    )
+
+    def progress(done: int, total: int, failed: int) -> None:
+        print(f"  {done}/{total} enriched ({failed} failed)", file=sys.stderr, flush=True)
+
+    enriched: List[PaperEntry] = []
+    try:
+        for conference in conferences:
+            for year in parse_years(args.years):
+                try:
+                    snapshot = store.get(year, conference=conference)
+                except requests.RequestException as exc:
+                    print(f"Skipping {conference} {year}: {exc}", file=sys.stderr)
+                    continue
+                started = time.perf_counter()
+                visited, failed = enrich_snapshot(store, snapshot, enricher, force=args.force, progress=progress)
+                with_arxiv = sum(1 for paper in snapshot.papers if paper.arxiv_id)
+                print(
+                    f"{conference} {year}: visited {visited} of {len(snapshot.papers)} papers"
+                    f" ({failed} failed) in {time.perf_counter() - started:.1f}s; {with_arxiv} have an arXiv id"
+                )
+                enriched.extend(snapshot.papers)
+    except KeyboardInterrupt:
+        print("Interrupted; finished papers are checkpointed and will be skipped next time.", file=sys.stderr)
+        return 130
+    finally:
+        cache.close()
+    print(f"{enricher.requests_made} HTTP requests made.")
+    if args.json_path and enriched:
+        count = export_papers(enriched, args.json_path)
+        print(f"Wrote {count} records to {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,199 @@
+"""Streaming writers for JSON, NDJSON, CSV, Parquet and Arrow IPC output."""
+
+from __future__ import annotations
+
+import abc
+import csv
+import dataclasses
+import json
+import sys
+from pathlib import Path
+from typing import IO, Dict, Iterable, List
+
+from cvpr_extractor import PaperEntry
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional; only the columnar formats need it
+    pa = None
+
+FORMATS = ("json", "ndjson", "csv", "parquet", "arrow")
+FORMAT_EXTENSIONS = {"json": "json", "ndjson": "ndjson", "csv": "csv", "parquet": "parquet", "arrow": "arrow"}
+BINARY_FORMATS = ("parquet", "arrow")
+COLUMNS = [field.name for field in dataclasses.fields(PaperEntry)]
+BATCH_SIZE = 8192
+
+
+def infer_format(path: str | None, default: str = "json") -> str:
+    if not path or path == "-":
+        return default
+    suffix = Path(path).suffix.lower().lstrip(".")
+    if suffix in ("jsonl", "ndjson"):
+        return "ndjson"
+    if suffix in ("feather", "ipc", "arrow"):
+        return "arrow"
+    return suffix if suffix in FORMATS else default
+
+
+def _record(paper: PaperEntry) -> Dict:
+    return {name: getattr(paper, name) for name in COLUMNS}
+
+
+class Exporter(abc.ABC):
+    """Writes papers one at a time; use as a context manager or call ``close()``."""
+
+    def __init__(self, handle: IO, owns_handle: bool) -> None:
+        self.handle = handle
+        self.owns_handle = owns_handle
+        self.count = 0
+
+    @abc.abstractmethod
+    def write(self, paper: PaperEntry) -> None:
+        ...
+
+    def write_all(self, papers: Iterable[PaperEntry]) -> int:
+        for paper in papers:
+            self.write(paper)
+        return self.count
+
+    def close(self) -> None:
+        if self.owns_handle:
+            self.handle.close()
+        else:
+            self.handle.flush()
+
+    def __enter__(self) -> Exporter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class JSONExporter(Exporter):
+    """Streams a JSON array laid out exactly like ``json.dump(records, indent=2)``."""
+
+    def write(self, paper: PaperEntry) -> None:
+        self.handle.write("[\n  " if self.count == 0 else ",\n  ")
+        text = json.dumps(_record(paper), indent=2, ensure_ascii=False)
+        self.handle.write(text.replace("\n", "\n  "))
+        self.count += 1
+
+    def close(self) -> None:
+        self.handle.write("\n]" if self.count else "[]")
+        super().close()
+
+
+class NDJSONExporter(Exporter):
+    def write(self, paper: PaperEntry) -> None:
+        self.handle.write(json.dumps(_record(paper), ensure_ascii=False))
+        self.handle.write("\n")
+        self.count += 1
+
+
+class CSVExporter(Exporter):
+    """One row per paper; authors are joined with ``"; "``."""
+
+    def __init__(self, handle: IO, owns_handle: bool) -> None:
+        super().__init__(handle, owns_handle)
+        self.writer = csv.writer(handle)
+        self.writer.writerow(COLUMNS)
+
+    def write(self, paper: PaperEntry) -> None:
+        record = _record(paper)
+        record["authors"] = "; ".join(paper.authors)
+        self.writer.writerow(["" if record[name] is None else record[name] for name in COLUMNS])
+        self.count += 1
+
+
+def arrow_schema():
+    return pa.schema(
+        [
+            ("title", pa.string()),
+            ("link", pa.string()),
+            ("session", pa.string()),
+            ("authors", pa.list_(pa.string())),
+            ("location", pa.string()),
+            ("highlight", pa.bool_()),
+            ("conference", pa.dictionary(pa.int32(), pa.string())),
+            ("year", pa.int32()),
+            ("resolved_link", pa.string()),
+            ("arxiv_id", pa.string()),
+            ("pdf_url", pa.string()),
+            ("pdf_size", pa.int64()),
+            ("page_title", pa.string()),
+        ]
+    )
+
+
+class _ColumnarExporter(Exporter):
+    """Buffers at most ``BATCH_SIZE`` papers, then writes them as one record batch."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(handle=None, owns_handle=False)
+        self.schema = arrow_schema()
+        self.writer = self._open_writer(path)
+        self._columns: Dict[str, List] = {name: [] for name in COLUMNS}
+
+    @abc.abstractmethod
+    def _open_writer(self, path: str):
+        ...
+
+    def write(self, paper: PaperEntry) -> None:
+        for name in COLUMNS:
+            self._columns[name].append(getattr(paper, name))
+        self.count += 1
+        if len(self._columns["title"]) >= BATCH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._columns["title"]:
+            return
+        batch = pa.RecordBatch.from_pydict(self._columns, schema=self.schema)
+        self.writer.write_batch(batch)
+        self._columns = {name: [] for name in COLUMNS}
+
+    def close(self) -> None:
+        self._flush()
+        self.writer.close()
+
+
+class ArrowExporter(_ColumnarExporter):
+    """Arrow IPC file (Feather v2); readers can memory-map it without copying."""
+
+    def _open_writer(self, path: str):
+        return pa.ipc.new_file(path, self.schema)
+
+
+class ParquetExporter(_ColumnarExporter):
+    def _open_writer(self, path: str):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(path, self.schema, compression="zstd")
+
+
+def open_exporter(path: str, fmt: str | None = None) -> Exporter:
+    """Open a streaming exporter; ``path`` may be ``-`` for stdout (text formats only)."""
+    fmt = fmt or infer_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; choose from {', '.join(FORMATS)}")
+    if fmt in BINARY_FORMATS:
+        if pa is None:
+            raise RuntimeError(f"The {fmt} format requires `pip install pyarrow`.")
+        if path == "-":
+            raise ValueError(f"The {fmt} format needs a file path, not stdout.")
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        return ArrowExporter(path) if fmt == "arrow" else ParquetExporter(path)
+    if path == "-":
+        handle, owns_handle = sys.stdout, False
+    else:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        handle, owns_handle = target.open("w", encoding="utf-8", newline="" if fmt == "csv" else None), True
+    exporter_cls = {"json": JSONExporter, "ndjson": NDJSONExporter, "csv": CSVExporter}[fmt]
+    return exporter_cls(handle, owns_handle)
+
+
+def export_papers(papers: Iterable[PaperEntry], path: str, fmt: str | None = None) -> int:
+    """Write ``papers`` to ``path`` without materialising the whole list; returns the count."""
+    with open_exporter(path, fmt) as exporter:
+        return exporter.write_all(papers)
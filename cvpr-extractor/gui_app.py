@@ -3,18 +3,35 @@
 
 from __future__ import annotations
 
-import threading
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from tkinter import messagebox
 from tkinter.scrolledtext import ScrolledText
 
-from cvpr_extractor import (
-    PaperEntry,
-    fetch_html,
-    filter_papers,
-    parse_papers,
-    write_json,
-)
+from cvpr_extractor import PaperEntry, write_json
+from refresher import Changeset, Refresher
+from search_index import SearchQueryError
+from snapshot_store import get_snapshot_store
+
+# Papers inserted per Tk event-loop turn, and the pause after the last keystroke before filtering.
+RENDER_BATCH = 200
+DEBOUNCE_MS = 250
+
+
+def _format_paper(idx: int, paper: PaperEntry) -> str:
+    lines = [f"{idx}. {paper.title}"]
+    if paper.link:
+        lines.append(f"   URL: {paper.link}")
+    if paper.session:
+        lines.append(f"   Session: {paper.session}")
+    if paper.location:
+        lines.append(f"   Location: {paper.location}")
+    if paper.authors:
+        lines.append(f"   Authors: {', '.join(paper.authors)}")
+    if paper.highlight:
+        lines.append("   ⭐ Highlighted")
+    lines.append("")
+    return "\n".join(lines)
 
 
 class ExtractorGUI(tk.Tk):
@@ -29,7 +46,20 @@ class ExtractorGUI(tk.Tk):
         self.limit_var = tk.StringVar(value="10")
         self.status_var = tk.StringVar(value="Ready.")
 
+        # Every query bumps the generation; results and render batches of older ones are dropped.
+        self._generation = 0
+        self._pending: Future | None = None
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cvpr-gui")
+        self._debounce_id: str | None = None
+        self._notice: str | None = None
+
         self._build_form()
+        self.keyword_var.trace_add("write", self._on_filter_changed)
+        self.limit_var.trace_add("write", self._on_filter_changed)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._refresher = Refresher()
+        self._refresher.subscribe(self._on_dataset_changed)
+        self._refresher.start()
 
     def _build_form(self) -> None:
         wrapper = tk.Frame(self, padx=10, pady=10)
@@ -64,12 +94,13 @@ class ExtractorGUI(tk.Tk):
             fill="x"
         )
 
-    def fetch_papers(self) -> None:
+    def _read_form(self, interactive: bool) -> tuple[int, str | None, int | None] | None:
         try:
             year = int(self.year_var.get())
         except ValueError:
-            messagebox.showerror("Invalid year", "Year must be an integer.")
-            return
+            if interactive:
+                messagebox.showerror("Invalid year", "Year must be an integer.")
+            return None
 
         keyword = self.keyword_var.get().strip() or None
         limit_str = self.limit_var.get().strip()
@@ -78,68 +109,127 @@ class ExtractorGUI(tk.Tk):
             try:
                 limit = max(1, int(limit_str))
             except ValueError:
-                messagebox.showerror("Invalid limit", "Limit must be an integer.")
-                return
+                if interactive:
+                    messagebox.showerror("Invalid limit", "Limit must be an integer.")
+                return None
+        return year, keyword, limit
 
-        self.fetch_button.config(state="disabled")
-        self.status_var.set("Fetching CVPR data…")
-        self.output.delete("1.0", tk.END)
-
-        threading.Thread(
-            target=self._fetch_worker, args=(year, keyword, limit), daemon=True
-        ).start()
+    def fetch_papers(self) -> None:
+        form = self._read_form(interactive=True)
+        if form is not None:
+            self._submit(*form, save_json=True)
+
+    def _on_filter_changed(self, *_args) -> None:
+        if self._debounce_id is not None:
+            self.after_cancel(self._debounce_id)
+        self._debounce_id = self.after(DEBOUNCE_MS, self._filter_locally)
+
+    def _filter_locally(self) -> None:
+        """Re-run the query as the user types, but only over papers already in memory."""
+        self._debounce_id = None
+        form = self._read_form(interactive=False)
+        if form is None:
+            return
+        if get_snapshot_store().current(form[0]) is None:
+            self.status_var.set(f"Press Fetch Papers to load {form[0]}.")
+            return
+        self._submit(*form, save_json=False)
+
+    def _submit(self, year: int, keyword: str | None, limit: int | None, save_json: bool) -> None:
+        self._generation += 1
+        if self._pending is not None:
+            self._pending.cancel()
+        if save_json:
+            self.fetch_button.config(state="disabled")
+            self.status_var.set("Fetching CVPR data…")
+        else:
+            self.status_var.set("Filtering…")
+        self._pending = self._pool.submit(
+            self._query_worker, self._generation, year, keyword, limit, save_json
+        )
 
-    def _fetch_worker(self, year: int, keyword: str | None, limit: int | None) -> None:
+    def _query_worker(
+        self, generation: int, year: int, keyword: str | None, limit: int | None, save_json: bool
+    ) -> None:
+        if generation != self._generation:
+            return
+        json_path = None
         try:
-            html = fetch_html(year)
-            papers = parse_papers(html)
-            papers = filter_papers(papers, keyword)
+            # Only the first query for a year touches the network; later ones hit memory.
+            papers = get_snapshot_store().search(year, keyword)
             if limit is not None:
                 papers = papers[:limit]
-            json_path = f"cvpr_{year}_accepted.json"
-            write_json(papers, json_path)
+            if generation != self._generation:
+                return
+            if save_json:
+                json_path = f"cvpr_{year}_accepted.json"
+                write_json(papers, json_path)
+            self._refresher.watch(year)
+        except SearchQueryError as exc:
+            message = f"Invalid search query: {exc}"
+            self.after(0, lambda: self._handle_error(generation, message, popup=save_json))
+            return
         except Exception as exc:  # pylint: disable=broad-except
-            self.after(
-                0,
-                lambda: self._handle_error(
-                    f"Failed to fetch papers: {exc}",
-                ),
-            )
+            message = f"Failed to fetch papers: {exc}"
+            self.after(0, lambda: self._handle_error(generation, message))
             return
 
-        self.after(0, lambda: self._display_results(papers, json_path))
+        self.after(0, lambda: self._display_results(generation, papers, json_path))
 
-    def _display_results(self, papers: list[PaperEntry], json_path: str) -> None:
+    def _display_results(self, generation: int, papers: list[PaperEntry], json_path: str | None) -> None:
+        if generation != self._generation:
+            return
         self.fetch_button.config(state="normal")
+        self.output.delete("1.0", tk.END)
         if not papers:
             self.status_var.set("No papers matched your filters.")
             return
+        self._render_batch(generation, papers, 0, json_path)
 
-        buffer = []
-        for idx, paper in enumerate(papers, start=1):
-            buffer.append(f"{idx}. {paper.title}")
-            if paper.link:
-                buffer.append(f"   URL: {paper.link}")
-            if paper.session:
-                buffer.append(f"   Session: {paper.session}")
-            if paper.location:
-                buffer.append(f"   Location: {paper.location}")
-            if paper.authors:
-                buffer.append(f"   Authors: {', '.join(paper.authors)}")
-            if paper.highlight:
-                buffer.append("   ⭐ Highlighted")
-            buffer.append("")
-
-        self.output.insert("1.0", "\n".join(buffer))
-        self.status_var.set(
-            f"Fetched {len(papers)} papers. Saved JSON to {json_path}."
-        )
+    def _render_batch(self, generation: int, papers: list[PaperEntry], start: int, json_path: str | None) -> None:
+        """Insert the next ``RENDER_BATCH`` papers, then yield to the event loop."""
+        if generation != self._generation:
+            return
+        end = min(start + RENDER_BATCH, len(papers))
+        chunk = [_format_paper(idx, paper) for idx, paper in enumerate(papers[start:end], start=start + 1)]
+        self.output.insert(tk.END, "\n".join(chunk) + "\n")
+        if end < len(papers):
+            self.status_var.set(f"Rendering {end} of {len(papers)} papers…")
+            self.after(1, lambda: self._render_batch(generation, papers, end, json_path))
+            return
 
-    def _handle_error(self, message: str) -> None:
+        status = f"Showing {len(papers)} papers."
+        if json_path:
+            status += f" Saved JSON to {json_path}."
+        if self._notice:
+            status = f"{self._notice} {status}"
+            self._notice = None
+        self.status_var.set(status)
+
+    def _on_dataset_changed(self, changes: Changeset) -> None:
+        # Called on the refresher thread; hand the update to the Tk loop.
+        def apply() -> None:
+            self._notice = f"Dataset updated ({changes.summary()})."
+            self._on_filter_changed()
+
+        self.after(0, apply)
+
+    def _handle_error(self, generation: int, message: str, popup: bool = True) -> None:
+        if generation != self._generation:
+            return
         self.fetch_button.config(state="normal")
+        if not popup:
+            self.status_var.set(message)
+            return
         self.status_var.set("Error.")
         messagebox.showerror("CVPR Extractor", message)
 
+    def _on_close(self) -> None:
+        self._generation += 1
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._refresher.stop(timeout=5.0)
+        self.destroy()
+
 
 def main() -> None:
     app = ExtractorGUI()
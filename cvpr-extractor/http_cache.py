@@ -0,0 +1,178 @@
+"""On-disk HTTP cache with conditional revalidation for the CVPR pages."""
+
+from __future__ import annotations
+
+import dataclasses
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+import requests
+
+DEFAULT_CACHE_DIR = os.environ.get("CVPR_CACHE_DIR", ".cvpr_cache")
+DEFAULT_CACHE_TTL = float(os.environ.get("CVPR_CACHE_TTL", "3600"))
+
+
+@dataclasses.dataclass
+class CacheEntry:
+    url: str
+    body: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+    sha256: str
+    # "network" (fresh 200), "revalidated" (304), "fresh" (within TTL) or "stale" (offline fallback)
+    source: str = "network"
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class HTTPCache:
+    """Stores gzip-compressed response bodies plus their validators on disk.
+
+    Within ``ttl`` seconds an entry is served straight from disk. After that
+    it is revalidated with ``If-None-Match``/``If-Modified-Since``; a 304 only
+    refreshes the timestamp. When the network is unreachable a stale entry is
+    served instead of failing.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | os.PathLike = DEFAULT_CACHE_DIR,
+        ttl: float = DEFAULT_CACHE_TTL,
+        session: requests.Session | None = None,
+        timeout: float = 30,
+    ) -> None:
+        self.root = Path(cache_dir)
+        self.cache_dir = self.root / "http"
+        self.ttl = ttl
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self._lock = threading.Lock()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.cache_dir / f"{key}.meta.json", self.cache_dir / f"{key}.html.gz"
+
+    def _load_meta(self, key: str) -> Dict | None:
+        meta_path, body_path = self._paths(key)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _load_entry(self, key: str, meta: Dict, source: str) -> CacheEntry:
+        _, body_path = self._paths(key)
+        body = gzip.decompress(body_path.read_bytes()).decode("utf-8")
+        return CacheEntry(
+            url=meta["url"],
+            body=body,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            fetched_at=meta["fetched_at"],
+            sha256=meta["sha256"],
+            source=source,
+        )
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        meta_path, body_path = self._paths(key)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write(body_path, gzip.compress(entry.body.encode("utf-8"), compresslevel=6))
+        self._write_meta(meta_path, entry)
+
+    @staticmethod
+    def _write_meta(meta_path: Path, entry: CacheEntry) -> None:
+        meta = {
+            "url": entry.url,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "fetched_at": entry.fetched_at,
+            "sha256": entry.sha256,
+        }
+        _atomic_write(meta_path, json.dumps(meta, indent=2).encode("utf-8"))
+
+    def peek(self, key: str) -> CacheEntry | None:
+        """Return the cached entry for ``key`` without touching the network."""
+        meta = self._load_meta(key)
+        if meta is None:
+            return None
+        return self._load_entry(key, meta, "fresh")
+
+    def fetch(
+        self,
+        url: str,
+        key: str,
+        headers: Dict[str, str] | None = None,
+        refresh: bool = False,
+        throttle: Callable[[str], None] | None = None,
+    ) -> CacheEntry:
+        """Return the body for ``url``, using the cache entry stored under ``key``.
+
+        ``refresh`` skips the TTL check and always revalidates with the server.
+        ``throttle`` is called with ``url`` right before a network request, so
+        rate limits only apply when the cache cannot answer on its own.
+        """
+        with self._lock:
+            meta = self._load_meta(key)
+        now = time.time()
+        if meta and not refresh and now - meta["fetched_at"] < self.ttl:
+            return self._load_entry(key, meta, "fresh")
+
+        request_headers = dict(headers or {})
+        if meta and meta.get("url") == url:
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+
+        if throttle is not None:
+            throttle(url)
+        try:
+            resp = self.session.get(url, headers=request_headers, timeout=self.timeout)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            if meta is None:
+                raise
+            print(f"Network unavailable ({exc}); serving cached copy of {url}", file=sys.stderr)
+            return self._load_entry(key, meta, "stale")
+
+        if resp.status_code == 304:
+            if meta is None:
+                # raise_for_status() lets 304 through, which would cache an empty body.
+                raise requests.HTTPError(f"304 Not Modified for {url} with no cached copy", response=resp)
+            entry = self._load_entry(key, meta, "revalidated")
+            entry.fetched_at = now
+            entry.etag = resp.headers.get("ETag", entry.etag)
+            entry.last_modified = resp.headers.get("Last-Modified", entry.last_modified)
+            with self._lock:
+                self._write_meta(self._paths(key)[0], entry)
+            return entry
+
+        resp.raise_for_status()
+        body = resp.text
+        entry = CacheEntry(
+            url=url,
+            body=body,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            fetched_at=now,
+            sha256=hashlib.sha256(body.encode("utf-8")).hexdigest(),
+            source="network",
+        )
+        with self._lock:
+            self._store(key, entry)
+        return entry
+
+    def invalidate(self, key: str) -> None:
+        for path in self._paths(key):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Background refresher that keeps served snapshots current and logs what changed."""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import requests
+
+from cvpr_extractor import PaperEntry, configure_http_cache, fetch_page, normalize_title, parse_papers
+from http_cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_TTL
+from snapshot_store import Snapshot, SnapshotStore, get_snapshot_store
+
+DEFAULT_REFRESH_INTERVAL = float(os.environ.get("CVPR_REFRESH_INTERVAL", "900"))
+# Unset means "changes/" next to the store's cache directory.
+DEFAULT_CHANGELOG_DIR = os.environ.get("CVPR_CHANGELOG_DIR")
+# Fields compared between revisions; conference and year are part of the key.
+_COMPARED = ("title", "link", "session", "authors", "location", "highlight")
+
+
+@dataclasses.dataclass
+class Changeset:
+    conference: str
+    year: int
+    previous_hash: str
+    content_hash: str
+    added: List[PaperEntry]
+    removed: List[PaperEntry]
+    # (old, new) pairs of the same paper whose fields differ
+    changed: List[tuple[PaperEntry, PaperEntry]]
+    detected_at: float = dataclasses.field(default_factory=time.time)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self) -> str:
+        return f"{self.conference} {self.year}: +{len(self.added)} -{len(self.removed)} ~{len(self.changed)}"
+
+    def to_record(self) -> Dict:
+        return {
+            "detected_at": self.detected_at,
+            "conference": self.conference,
+            "year": self.year,
+            "previous_hash": self.previous_hash,
+            "content_hash": self.content_hash,
+            "added": [dataclasses.asdict(paper) for paper in self.added],
+            "removed": [paper.title for paper in self.removed],
+            "changed": [
+                {
+                    "title": new.title,
+                    "fields": {
+                        name: [getattr(old, name), getattr(new, name)]
+                        for name in _COMPARED
+                        if getattr(old, name) != getattr(new, name)
+                    },
+                }
+                for old, new in self.changed
+            ],
+        }
+
+
+def _by_title(papers: List[PaperEntry]) -> Dict[str, PaperEntry]:
+    keyed: Dict[str, PaperEntry] = {}
+    for paper in papers:
+        keyed.setdefault(normalize_title(paper.title), paper)
+    return keyed
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> Changeset:
+    """Compare two revisions of a page, matching papers by normalized title."""
+    before, after = _by_title(old.papers), _by_title(new.papers)
+    changed = [
+        (before[key], paper)
+        for key, paper in after.items()
+        if key in before and any(getattr(before[key], name) != getattr(paper, name) for name in _COMPARED)
+    ]
+    return Changeset(
+        conference=new.conference,
+        year=new.year,
+        previous_hash=old.content_hash,
+        content_hash=new.content_hash,
+        added=[paper for key, paper in after.items() if key not in before],
+        removed=[paper for key, paper in before.items() if key not in after],
+        changed=changed,
+    )
+
+
+class Refresher:
+    """Polls watched pages with conditional GETs and swaps in new snapshots.
+
+    New revisions are parsed and indexed on the refresher thread, then
+    installed with ``SnapshotStore.install`` so readers see either the old or
+    the new snapshot, never a half-built one. Watched years are pinned in the
+    store while the refresher runs, so the request path never revalidates or
+    parses them. Each detected change is appended to
+    ``<conference>_<year>_changes.jsonl`` in ``changelog_dir`` (default:
+    ``changes/`` next to the store's cache directory).
+
+    The owner starts the polling thread with ``start()`` and ends it with
+    ``stop()``, which also unpins every watched year.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_REFRESH_INTERVAL,
+        store: SnapshotStore | None = None,
+        changelog_dir: str | os.PathLike | None = DEFAULT_CHANGELOG_DIR,
+    ) -> None:
+        self.interval = interval
+        self.store = store
+        self.changelog_dir = Path(changelog_dir) if changelog_dir is not None else None
+        self._due: Dict[tuple[str, int], float] = {}
+        self._listeners: List[Callable[[Changeset], None]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _store(self) -> SnapshotStore:
+        return self.store or get_snapshot_store()
+
+    def _changelog_dir(self) -> Path:
+        if self.changelog_dir is not None:
+            return self.changelog_dir
+        return self._store().snapshot_dir.parent / "changes"
+
+    def watch(self, year: int, conference: str = "CVPR") -> None:
+        """Keep ``year`` current once the refresher runs; loads it in the background if it is not yet."""
+        key = (conference, year)
+        with self._lock:
+            if key in self._due:
+                return
+            store = self._store()
+            loaded = store.current(year, conference) is not None
+            if loaded:
+                store.pin(year, conference)
+            self._due[key] = time.monotonic() + (self.interval if loaded else 0.0)
+        self._wake.set()
+
+    def subscribe(self, listener: Callable[[Changeset], None]) -> None:
+        """Call ``listener`` (on the refresher thread) for every detected change."""
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="cvpr-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop polling and forget the watched years; requests revalidate them again."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._lock:
+            watched, self._due = list(self._due), {}
+        store = self._store()
+        for conference, year in watched:
+            store.unpin(year, conference)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            now = time.monotonic()
+            with self._lock:
+                due = [key for key, at in self._due.items() if at <= now]
+            for conference, year in due:
+                try:
+                    self.refresh(year, conference)
+                except requests.RequestException as exc:
+                    print(f"Refresh of {conference} {year} failed: {exc}", file=sys.stderr)
+                except Exception as exc:  # pylint: disable=broad-except
+                    print(f"Refresh of {conference} {year} crashed: {exc!r}", file=sys.stderr)
+                with self._lock:
+                    self._due[(conference, year)] = time.monotonic() + self.interval
+            with self._lock:
+                next_at = min(self._due.values(), default=None)
+            timeout = None if next_at is None else max(0.0, next_at - time.monotonic())
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def refresh(self, year: int, conference: str = "CVPR") -> Changeset | None:
+        """Revalidate one page now; returns the changes if a new revision was installed."""
+        store = self._store()
+        previous = store.current(year, conference)
+        entry = fetch_page(year, refresh=previous is not None, conference=conference, cache=store.http_cache)
+        if previous is not None and previous.content_hash == entry.sha256:
+            store.install(previous, pin=True)
+            return None
+        snapshot = store.load_disk(conference, year, entry.sha256)
+        if snapshot is None:
+            snapshot = store.build(conference, year, entry.sha256, parse_papers(entry.body))
+        # Build the derived structures here so the first request after the swap is cheap.
+        store.index_for(snapshot)
+        store.install(snapshot, pin=True)
+        if previous is None:
+            return None
+        changes = diff_snapshots(previous, snapshot)
+        if changes:
+            self._log(changes)
+            for listener in list(self._listeners):
+                listener(changes)
+        return changes
+
+    def _log(self, changes: Changeset) -> None:
+        directory = self._changelog_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{changes.conference.lower()}_{changes.year}_changes.jsonl"
+        line = json.dumps(changes.to_record(), ensure_ascii=False)
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Poll accepted-papers pages and log every change.")
+    parser.add_argument("--year", type=int, action="append", help="Year to watch (repeatable; default: 2024)")
+    parser.add_argument("--conference", default="CVPR", help="Conference to watch (default: %(default)s)")
+    parser.add_argument("--interval", type=float, default=DEFAULT_REFRESH_INTERVAL, help="Seconds between polls (default: %(default)s)")
+    parser.add_argument("--changelog-dir", default=DEFAULT_CHANGELOG_DIR, help="Directory for *_changes.jsonl files (default: changes/ in the cache directory)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"Cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL, help="Cache TTL in seconds (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = parse_args(argv or sys.argv[1:])
+    configure_http_cache(args.cache_dir, args.cache_ttl)
+    refresher = Refresher(interval=args.interval, changelog_dir=args.changelog_dir)
+    refresher.subscribe(lambda changes: print(changes.summary(), flush=True))
+    for year in args.year or [2024]:
+        refresher.watch(year, args.conference.upper())
+    refresher.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        refresher.stop(timeout=5)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,328 @@
+"""Inverted index with field-scoped boolean queries and BM25 ranking."""
+
+from __future__ import annotations
+
+import bisect
+import dataclasses
+import math
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Sequence, Set
+
+from cvpr_extractor import PaperEntry
+
+# Unscoped terms search these fields, mirroring the old substring filter.
+DEFAULT_FIELDS = ("title", "author", "session")
+FIELD_WEIGHTS = {"title": 2.0, "author": 1.5, "session": 0.5, "location": 0.5}
+FIELD_ALIASES = {"authors": "author", "sessions": "session"}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+")
+_QUERY_TOKEN_RE = re.compile(r'\s*(\(|\)|-?[\w.]+:"[^"]*"?|-?"[^"]*"?|[^\s()]+)')
+
+
+class SearchQueryError(ValueError):
+    pass
+
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: str | None) -> List[str]:
+    if not text:
+        return []
+    return _TOKEN_RE.findall(_fold(text))
+
+
+def _field_texts(paper: PaperEntry) -> Dict[str, List[str]]:
+    return {
+        "title": [paper.title],
+        "author": list(paper.authors),
+        "session": [paper.session] if paper.session else [],
+        "location": [paper.location] if paper.location else [],
+    }
+
+
+@dataclasses.dataclass
+class SearchHit:
+    doc_id: int
+    score: float
+
+
+class SearchIndex:
+    """Per-field postings (term -> {doc_id: term frequency}) over a paper list.
+
+    Build it once per snapshot; ``search`` only touches the postings of the
+    query terms, so lookups stay fast regardless of corpus size. Document ids
+    are positions in the list the index was built from.
+    """
+
+    def __init__(self, papers: Sequence[PaperEntry]) -> None:
+        self.size = len(papers)
+        self.postings: Dict[str, Dict[str, Dict[int, int]]] = {field: {} for field in FIELD_WEIGHTS}
+        self.lengths: Dict[str, List[int]] = {field: [0] * self.size for field in FIELD_WEIGHTS}
+        # Space-joined tokens per value, used to verify quoted phrases.
+        self.phrases: Dict[str, List[List[str]]] = {field: [] for field in FIELD_WEIGHTS}
+        self.highlights: Set[int] = set()
+        for doc_id, paper in enumerate(papers):
+            if paper.highlight:
+                self.highlights.add(doc_id)
+            for field, values in _field_texts(paper).items():
+                folded = []
+                postings = self.postings[field]
+                for value in values:
+                    tokens = tokenize(value)
+                    folded.append(" ".join(tokens))
+                    self.lengths[field][doc_id] += len(tokens)
+                    for token in tokens:
+                        docs = postings.setdefault(token, {})
+                        docs[doc_id] = docs.get(doc_id, 0) + 1
+                self.phrases[field].append(folded)
+        self.avg_lengths = {
+            field: (sum(lengths) / self.size if self.size else 0.0) or 1.0
+            for field, lengths in self.lengths.items()
+        }
+        self.vocabulary = {field: sorted(postings) for field, postings in self.postings.items()}
+
+    def _expand(self, field: str, term: str, prefix: bool) -> List[str]:
+        if not prefix:
+            return [term] if term in self.postings[field] else []
+        vocab = self.vocabulary[field]
+        start = bisect.bisect_left(vocab, term)
+        end = bisect.bisect_left(vocab, term + "\U0010ffff", start)
+        return vocab[start:end]
+
+    def _idf(self, field: str, term: str) -> float:
+        df = len(self.postings[field][term])
+        return math.log(1 + (self.size - df + 0.5) / (df + 0.5))
+
+    def _score_term(self, field: str, term: str, scores: Dict[int, float], docs: Set[int]) -> None:
+        idf = self._idf(field, term)
+        weight = FIELD_WEIGHTS[field]
+        avg = self.avg_lengths[field]
+        lengths = self.lengths[field]
+        for doc_id, tf in self.postings[field][term].items():
+            if doc_id not in docs:
+                continue
+            norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_id] / avg)
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight * idf * tf * (BM25_K1 + 1) / norm
+
+    def search(self, query: str | None, implicit_prefix: bool = False) -> List[SearchHit]:
+        """Return hits for ``query`` ordered by BM25 score (then by document order).
+
+        Syntax: bare words (AND-ed), ``word*`` for prefixes, ``"quoted phrases"``,
+        ``author:``/``session:``/``title:``/``location:`` field scopes,
+        ``highlight:true``, ``OR``, ``NOT``/``-word`` and parentheses. With
+        ``implicit_prefix`` every bare word also matches as a prefix, which
+        keeps the old substring-style keyword filter forgiving.
+        """
+        if not query or not query.strip():
+            return [SearchHit(doc_id, 0.0) for doc_id in range(self.size)]
+        node = _QueryParser(query).parse()
+        if node is None:
+            return [SearchHit(doc_id, 0.0) for doc_id in range(self.size)]
+        docs = node.evaluate(self, implicit_prefix)
+        scores: Dict[int, float] = {}
+        for field, term in node.scoring_terms(self, implicit_prefix):
+            self._score_term(field, term, scores, docs)
+        return sorted(
+            (SearchHit(doc_id, scores.get(doc_id, 0.0)) for doc_id in docs),
+            key=lambda hit: (-hit.score, hit.doc_id),
+        )
+
+    def filter(self, papers: Sequence[PaperEntry], query: str | None, implicit_prefix: bool = True) -> List[PaperEntry]:
+        return [papers[hit.doc_id] for hit in self.search(query, implicit_prefix=implicit_prefix)]
+
+
+@dataclasses.dataclass
+class _Term:
+    fields: Sequence[str]
+    tokens: List[str]
+    prefix: bool = False
+    phrase: bool = False
+
+    def scoring_terms(self, index: SearchIndex, implicit_prefix: bool) -> Iterable[tuple[str, str]]:
+        prefix = self.prefix or (implicit_prefix and not self.phrase)
+        for field in self.fields:
+            for pos, token in enumerate(self.tokens):
+                last = pos == len(self.tokens) - 1
+                for term in index._expand(field, token, prefix and (last or not self.phrase)):
+                    yield field, term
+
+    def evaluate(self, index: SearchIndex, implicit_prefix: bool) -> Set[int]:
+        prefix = self.prefix or (implicit_prefix and not self.phrase)
+        result: Set[int] = set()
+        for field in self.fields:
+            field_docs: Set[int] | None = None
+            for pos, token in enumerate(self.tokens):
+                use_prefix = prefix and (pos == len(self.tokens) - 1 or not self.phrase)
+                docs: Set[int] = set()
+                for term in index._expand(field, token, use_prefix):
+                    docs.update(index.postings[field][term])
+                field_docs = docs if field_docs is None else field_docs & docs
+                if not field_docs:
+                    break
+            if field_docs and self.phrase and len(self.tokens) > 1:
+                needle = " ".join(self.tokens)
+                field_docs = {
+                    doc_id
+                    for doc_id in field_docs
+                    if any(_phrase_in(needle, value, self.prefix) for value in index.phrases[field][doc_id])
+                }
+            result |= field_docs or set()
+        return result
+
+
+def _phrase_in(needle: str, value: str, prefix: bool) -> bool:
+    haystack = f" {value} "
+    return f" {needle}" in haystack if prefix else f" {needle} " in haystack
+
+
+@dataclasses.dataclass
+class _Highlight:
+    wanted: bool
+
+    def evaluate(self, index: SearchIndex, implicit_prefix: bool) -> Set[int]:
+        if self.wanted:
+            return set(index.highlights)
+        return set(range(index.size)) - index.highlights
+
+    def scoring_terms(self, index: SearchIndex, implicit_prefix: bool) -> Iterable[tuple[str, str]]:
+        return ()
+
+
+@dataclasses.dataclass
+class _Not:
+    child: object
+
+    def evaluate(self, index: SearchIndex, implicit_prefix: bool) -> Set[int]:
+        return set(range(index.size)) - self.child.evaluate(index, implicit_prefix)
+
+    def scoring_terms(self, index: SearchIndex, implicit_prefix: bool) -> Iterable[tuple[str, str]]:
+        return ()
+
+
+@dataclasses.dataclass
+class _And:
+    children: List[object]
+
+    def evaluate(self, index: SearchIndex, implicit_prefix: bool) -> Set[int]:
+        positives = [child for child in self.children if not isinstance(child, _Not)]
+        negatives = [child for child in self.children if isinstance(child, _Not)]
+        if positives:
+            # Evaluate cheap-to-intersect operands first.
+            sets = sorted((child.evaluate(index, implicit_prefix) for child in positives), key=len)
+            docs = set.intersection(*sets)
+        else:
+            docs = set(range(index.size))
+        for negative in negatives:
+            if not docs:
+                break
+            docs -= negative.child.evaluate(index, implicit_prefix)
+        return docs
+
+    def scoring_terms(self, index: SearchIndex, implicit_prefix: bool) -> Iterable[tuple[str, str]]:
+        for child in self.children:
+            yield from child.scoring_terms(index, implicit_prefix)
+
+
+@dataclasses.dataclass
+class _Or:
+    children: List[object]
+
+    def evaluate(self, index: SearchIndex, implicit_prefix: bool) -> Set[int]:
+        docs: Set[int] = set()
+        for child in self.children:
+            docs |= child.evaluate(index, implicit_prefix)
+        return docs
+
+    def scoring_terms(self, index: SearchIndex, implicit_prefix: bool) -> Iterable[tuple[str, str]]:
+        for child in self.children:
+            yield from child.scoring_terms(index, implicit_prefix)
+
+
+class _QueryParser:
+    def __init__(self, query: str) -> None:
+        self.tokens = [match.group(1) for match in _QUERY_TOKEN_RE.finditer(query) if match.group(1)]
+        self.pos = 0
+
+    def _peek(self) -> str | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self) -> str:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self):
+        node = self._or()
+        if self._peek() is not None:
+            raise SearchQueryError(f"Unexpected {self._peek()!r} in query")
+        return node
+
+    def _or(self):
+        children = [self._and()]
+        while self._peek() == "OR":
+            self._next()
+            children.append(self._and())
+        children = [child for child in children if child is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else _Or(children)
+
+    def _and(self):
+        children = []
+        while self._peek() not in (None, ")", "OR"):
+            if self._peek() == "AND":
+                self._next()
+                continue
+            node = self._unary()
+            if node is not None:
+                children.append(node)
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else _And(children)
+
+    def _unary(self):
+        token = self._peek()
+        if token == "NOT" or (token.startswith("-") and len(token) > 1):
+            if token == "NOT":
+                self._next()
+            else:
+                self.tokens[self.pos] = token[1:]
+            if self._peek() in (None, ")", "OR"):
+                return None
+            child = self._unary()
+            return _Not(child) if child is not None else None
+        if token == "(":
+            self._next()
+            node = self._or()
+            if self._peek() != ")":
+                raise SearchQueryError("Unbalanced parentheses in query")
+            self._next()
+            return node
+        if token == ")":
+            raise SearchQueryError("Unbalanced parentheses in query")
+        return self._term(self._next())
+
+    def _term(self, token: str):
+        fields: Sequence[str] = DEFAULT_FIELDS
+        field, sep, value = token.partition(":")
+        if sep and field and value:
+            field = FIELD_ALIASES.get(field.lower(), field.lower())
+            if field == "highlight":
+                if value.lower() not in ("true", "false", "yes", "no", "1", "0"):
+                    raise SearchQueryError(f"highlight: expects true or false, got {value!r}")
+                return _Highlight(value.lower() in ("true", "yes", "1"))
+            if field in FIELD_WEIGHTS:
+                fields = (field,)
+                token = value
+        phrase = token.startswith('"')
+        prefix = token.endswith("*")
+        tokens = tokenize(token.strip('"').rstrip("*"))
+        if not tokens:
+            return None
+        return _Term(fields=fields, tokens=tokens, prefix=prefix, phrase=phrase)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""TF-IDF similarity search and topic clustering over paper titles and sessions."""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import hashlib
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from cvpr_extractor import CONFERENCE_URLS, PaperEntry, configure_http_cache, normalize_title
+from http_cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_TTL
+from search_index import tokenize
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # numpy/scipy are optional; only the similarity features need them
+    np = sparse = None
+
+SESSION_WEIGHT = 0.5
+DEFAULT_TOP_K = 10
+DEFAULT_CLUSTERS = 20
+# Rows scored per sparse matmul when ranking many papers at once.
+BATCH_SIZE = 1024
+_STOPWORDS = frozenset(
+    "a an and are as at by for from in into is it of on or the to via with without towards using "
+    "we our its be can based new poster posters session sessions oral orals exhibit hall".split()
+)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("Similarity search requires `pip install numpy scipy`.")
+
+
+def _terms(text: str | None) -> List[str]:
+    return [token for token in tokenize(text) if len(token) > 1 and token not in _STOPWORDS]
+
+
+@dataclasses.dataclass
+class SimilarHit:
+    doc_id: int
+    score: float
+
+
+@dataclasses.dataclass
+class Cluster:
+    label: int
+    terms: List[str]
+    doc_ids: List[int]
+
+
+class SimilarityIndex:
+    """Row-normalised TF-IDF matrix (papers x terms) in SciPy CSR form.
+
+    Title terms count fully and session terms at ``SESSION_WEIGHT``. Because
+    rows have unit length, cosine similarity against every paper is one
+    sparse matrix product, so top-k queries never loop over papers in Python.
+    """
+
+    def __init__(self, matrix, idf, vocabulary: Sequence[str], titles: Sequence[str]) -> None:
+        self.matrix = matrix
+        self.idf = idf
+        self.vocabulary = list(vocabulary)
+        self.term_ids: Dict[str, int] = {term: idx for idx, term in enumerate(self.vocabulary)}
+        # Normalized title -> first row with that title, for "papers like this one" lookups.
+        self.titles = list(titles)
+        self.title_rows: Dict[str, int] = {}
+        for doc_id, title in enumerate(self.titles):
+            self.title_rows.setdefault(title, doc_id)
+
+    @property
+    def size(self) -> int:
+        return self.matrix.shape[0]
+
+    @classmethod
+    def build(cls, papers: Sequence[PaperEntry]) -> SimilarityIndex:
+        _require_numpy()
+        term_ids: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        weights: List[float] = []
+        for doc_id, paper in enumerate(papers):
+            for text, weight in ((paper.title, 1.0), (paper.session, SESSION_WEIGHT)):
+                for term in _terms(text):
+                    rows.append(doc_id)
+                    cols.append(term_ids.setdefault(term, len(term_ids)))
+                    weights.append(weight)
+        shape = (len(papers), len(term_ids))
+        # Duplicate (row, col) pairs are summed, which yields the weighted term frequencies.
+        tf = sparse.csr_matrix((np.array(weights, dtype=np.float32), (rows, cols)), shape=shape)
+        tf.sum_duplicates()
+        df = np.bincount(tf.indices, minlength=shape[1])
+        idf = (np.log((1 + shape[0]) / (1 + df)) + 1).astype(np.float32)
+        matrix = _normalize_rows(tf @ sparse.diags(idf))
+        vocabulary = sorted(term_ids, key=term_ids.get)
+        titles = [normalize_title(paper.title) for paper in papers]
+        return cls(matrix.tocsr().astype(np.float32), idf, vocabulary, titles)
+
+    def save(self, path: str | os.PathLike) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(
+            tmp,
+            data=self.matrix.data,
+            indices=self.matrix.indices,
+            indptr=self.matrix.indptr,
+            shape=np.array(self.matrix.shape),
+            idf=self.idf,
+            vocabulary=np.array(self.vocabulary, dtype=str),
+            titles=np.array(self.titles, dtype=str),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> SimilarityIndex:
+        _require_numpy()
+        with np.load(path, allow_pickle=False) as arrays:
+            matrix = sparse.csr_matrix(
+                (arrays["data"], arrays["indices"], arrays["indptr"]), shape=tuple(arrays["shape"])
+            )
+            return cls(matrix, arrays["idf"], arrays["vocabulary"].tolist(), arrays["titles"].tolist())
+
+    @classmethod
+    def load_or_build(cls, papers: Sequence[PaperEntry], path: str | os.PathLike) -> SimilarityIndex:
+        """Load the matrices persisted at ``path`` if they match ``papers``, else build and save."""
+        if Path(path).exists():
+            try:
+                index = cls.load(path)
+                if index.size == len(papers):
+                    return index
+            except (OSError, ValueError, KeyError):
+                pass
+        index = cls.build(papers)
+        index.save(path)
+        return index
+
+    def vectorize(self, text: str):
+        """TF-IDF row vector for free text, using this index's vocabulary."""
+        counts: Dict[int, float] = {}
+        for term in _terms(text):
+            col = self.term_ids.get(term)
+            if col is not None:
+                counts[col] = counts.get(col, 0.0) + 1.0
+        cols = np.fromiter(counts, dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts)) * self.idf[cols]
+        vector = sparse.csr_matrix((values, (np.zeros(len(cols), dtype=np.int64), cols)), shape=(1, len(self.vocabulary)))
+        return _normalize_rows(vector)
+
+    def _top_k(self, queries, k: int, exclude: Sequence[int] | None = None) -> List[List[SimilarHit]]:
+        results: List[List[SimilarHit]] = []
+        for start in range(0, queries.shape[0], BATCH_SIZE):
+            scores = (queries[start:start + BATCH_SIZE] @ self.matrix.T).toarray()
+            if exclude is not None:
+                batch = np.arange(scores.shape[0])
+                scores[batch, np.asarray(exclude[start:start + BATCH_SIZE])] = -1.0
+            count = min(k, scores.shape[1])
+            if count == 0:
+                results.extend([] for _ in range(scores.shape[0]))
+                continue
+            top = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+            for row, candidates in enumerate(top):
+                ranked = candidates[np.argsort(-scores[row, candidates], kind="stable")]
+                results.append([SimilarHit(int(doc), float(scores[row, doc])) for doc in ranked if scores[row, doc] > 0])
+        return results
+
+    def similar_to(self, doc_ids: Sequence[int], k: int = DEFAULT_TOP_K) -> List[List[SimilarHit]]:
+        """The ``k`` nearest papers of each paper in ``doc_ids`` (itself excluded), batched."""
+        return self._top_k(self.matrix[list(doc_ids)], k, exclude=list(doc_ids))
+
+    def query(self, text: str, k: int = DEFAULT_TOP_K) -> List[SimilarHit]:
+        return self._top_k(self.vectorize(text), k)[0]
+
+    def cluster(self, n_clusters: int = DEFAULT_CLUSTERS, iterations: int = 25, seed: int = 0, top_terms: int = 6) -> List[Cluster]:
+        """Spherical k-means: assign by cosine similarity, re-centre on the mean direction."""
+        n_clusters = max(1, min(n_clusters, self.size))
+        rng = np.random.default_rng(seed)
+        centroids = self.matrix[rng.choice(self.size, n_clusters, replace=False)].toarray()
+        labels = np.full(self.size, -1)
+        for _ in range(iterations):
+            similarity = np.asarray(self.matrix @ centroids.T)
+            new_labels = similarity.argmax(axis=1)
+            if np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+            membership = sparse.csr_matrix(
+                (np.ones(self.size, dtype=np.float32), (labels, np.arange(self.size))),
+                shape=(n_clusters, self.size),
+            )
+            centroids = np.asarray((membership @ self.matrix).todense())
+            empty = np.flatnonzero(np.bincount(labels, minlength=n_clusters) == 0)
+            if len(empty):
+                # Re-seed empty clusters with the papers that fit their cluster worst.
+                worst = np.argsort(similarity.max(axis=1))[: len(empty)]
+                centroids[empty] = self.matrix[worst].toarray()
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            centroids /= np.where(norms == 0, 1, norms)
+
+        clusters = []
+        for label in range(n_clusters):
+            members = np.flatnonzero(labels == label)
+            if not len(members):
+                continue
+            # Members closest to the centre first.
+            order = np.argsort(-(self.matrix[members] @ centroids[label]), kind="stable")
+            terms = [self.vocabulary[col] for col in np.argsort(-centroids[label])[:top_terms] if centroids[label, col] > 0]
+            clusters.append(Cluster(label=label, terms=terms, doc_ids=members[order].tolist()))
+        clusters.sort(key=lambda cluster: len(cluster.doc_ids), reverse=True)
+        return clusters
+
+    def find(self, title: str) -> int | None:
+        """Row of the paper whose normalized title equals ``title``, if any."""
+        return self.title_rows.get(normalize_title(title))
+
+    def like(self, text: str, k: int = DEFAULT_TOP_K) -> List[SimilarHit]:
+        """Papers like the one titled ``text``, or like ``text`` itself if no title matches."""
+        doc_id = self.find(text)
+        if doc_id is not None:
+            return self.similar_to([doc_id], k)[0]
+        return self.query(text, k)
+
+
+def _normalize_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ matrix
+
+
+def corpus_key(snapshots) -> str:
+    """Stable key for a set of snapshots, used to name persisted corpus matrices."""
+    parts = sorted(f"{snap.conference}:{snap.year}:{snap.content_hash}" for snap in snapshots)
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Find related papers and topic clusters across years.")
+    parser.add_argument("--years", default="2024", help="Years to include, e.g. 2022-2024 (default: %(default)s)")
+    parser.add_argument("--conferences", default="CVPR", help="Comma-separated conferences (default: %(default)s)")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--like", metavar="TITLE_OR_TEXT", help="List papers similar to this title or free text.")
+    group.add_argument("--clusters", type=int, metavar="K", help="Group the corpus into K topic clusters.")
+    parser.add_argument("-k", "--top", type=int, default=DEFAULT_TOP_K, help="Results (or papers per cluster) to show (default: %(default)s)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"Cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL, help="Cache TTL in seconds (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> int:
+    import requests
+
+    from crawl import parse_years
+    from snapshot_store import get_snapshot_store
+
+    args = parse_args(argv or sys.argv[1:])
+    configure_http_cache(args.cache_dir, args.cache_ttl)
+    conferences = [name.strip().upper() for name in args.conferences.split(",") if name.strip()]
+    unknown = [name for name in conferences if name not in CONFERENCE_URLS]
+    if unknown:
+        print(f"Unknown conference(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    store = get_snapshot_store()
+    snapshots = []
+    for conference in conferences:
+        for year in parse_years(args.years):
+            try:
+                snapshots.append(store.get(year, conference=conference))
+            except requests.RequestException as exc:
+                print(f"Skipping {conference} {year}: {exc}", file=sys.stderr)
+    if not snapshots:
+        print("No snapshots could be loaded.", file=sys.stderr)
+        return 1
+    try:
+        if len(snapshots) == 1:
+            papers = snapshots[0].papers
+            index = store.similarity_for(snapshots[0])
+        else:
+            papers = [paper for snapshot in snapshots for paper in snapshot.papers]
+            path = store.snapshot_dir / f"corpus_{corpus_key(snapshots)}.similarity.npz"
+            index = SimilarityIndex.load_or_build(papers, path)
+    except RuntimeError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+
+    if args.like:
+        for rank, hit in enumerate(index.like(args.like, args.top), start=1):
+            paper = papers[hit.doc_id]
+            print(f"{rank:2d}. [{hit.score:.3f}] {paper.title} ({paper.conference} {paper.year})")
+        return 0
+    for cluster in index.cluster(args.clusters):
+        print(f"== Cluster {cluster.label}: {len(cluster.doc_ids)} papers — {', '.join(cluster.terms)}")
+        for doc_id in cluster.doc_ids[: args.top]:
+            print(f"   {papers[doc_id].title}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,279 @@
+"""Parsed-paper snapshots so filtering never has to re-parse the HTML."""
+
+from __future__ import annotations
+
+import dataclasses
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Set
+
+from cvpr_extractor import PaperEntry, fetch_page, get_http_cache, parse_papers
+from author_index import AuthorIndex
+from http_cache import HTTPCache
+from search_index import SearchIndex
+
+# Bump whenever the on-disk layout or the parser output changes.
+SNAPSHOT_VERSION = 4
+_FIELDS = [field.name for field in dataclasses.fields(PaperEntry)]
+
+
+@dataclasses.dataclass
+class Snapshot:
+    year: int
+    content_hash: str
+    papers: List[PaperEntry]
+    built_at: float
+    conference: str = "CVPR"
+    index: SearchIndex | None = dataclasses.field(default=None, repr=False, compare=False)
+    author_index: AuthorIndex | None = dataclasses.field(default=None, repr=False, compare=False)
+    similarity: object | None = dataclasses.field(default=None, repr=False, compare=False)
+
+
+def _to_columns(papers: List[PaperEntry]) -> Dict[str, list]:
+    return {name: [getattr(paper, name) for paper in papers] for name in _FIELDS}
+
+
+def _from_columns(columns: Dict[str, list]) -> List[PaperEntry]:
+    return [PaperEntry(*row) for row in zip(*(columns[name] for name in _FIELDS))]
+
+
+def _dump(path: Path, payload) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as handle:
+        pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+class SnapshotStore:
+    """Keeps one parsed snapshot per (conference, year) in memory and on disk.
+
+    Snapshots are keyed by conference, year and the SHA-256 of the page they were parsed
+    from, so the HTML is parsed at most once per page revision. On disk each
+    snapshot is a pickled dict of columns (one list per ``PaperEntry`` field),
+    which loads far faster than re-running BeautifulSoup.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | os.PathLike | None = None,
+        check_interval: float | None = None,
+        http_cache: HTTPCache | None = None,
+    ) -> None:
+        http_cache = http_cache or get_http_cache()
+        self.http_cache = http_cache
+        root = Path(cache_dir) if cache_dir is not None else http_cache.root
+        self.snapshot_dir = root / "snapshots"
+        self.check_interval = http_cache.ttl if check_interval is None else check_interval
+        self._memory: Dict[tuple[str, int], Snapshot] = {}
+        self._checked_at: Dict[tuple[str, int], float] = {}
+        # Keys kept current by a background refresher; requests never revalidate them.
+        self._pinned: Set[tuple[str, int]] = set()
+        # Guards the dicts above only; never held across network, parse or index work.
+        self._lock = threading.Lock()
+        # One lock per (purpose, conference, year) so a slow page never blocks other years.
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+
+    def _key_lock(self, purpose: str, key: tuple[str, int]) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault((purpose, *key), threading.Lock())
+
+    def _served(self, key: tuple[str, int]) -> Snapshot | None:
+        """The in-memory snapshot for ``key`` if it may be served without revalidating."""
+        with self._lock:
+            current = self._memory.get(key)
+            if current and (key in self._pinned or time.time() - self._checked_at.get(key, 0.0) < self.check_interval):
+                return current
+        return None
+
+    def _path(self, conference: str, year: int, content_hash: str, kind: str = "papers") -> Path:
+        name = f"{conference.lower()}_{year}_v{SNAPSHOT_VERSION}_{content_hash[:16]}.{kind}.pickle"
+        return self.snapshot_dir / name
+
+    def load_disk(self, conference: str, year: int, content_hash: str) -> Snapshot | None:
+        """Load a previously saved snapshot for this exact page revision, if any."""
+        path = self._path(conference, year, content_hash)
+        if not path.exists():
+            return None
+        try:
+            with path.open("rb") as handle:
+                payload = pickle.load(handle)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if payload.get("content_hash") != content_hash:
+            return None
+        return Snapshot(
+            year=year,
+            content_hash=content_hash,
+            papers=_from_columns(payload["columns"]),
+            built_at=payload["built_at"],
+            conference=conference,
+        )
+
+    def save_disk(self, snapshot: Snapshot) -> None:
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(snapshot.conference, snapshot.year, snapshot.content_hash)
+        payload = {
+            "year": snapshot.year,
+            "content_hash": snapshot.content_hash,
+            "built_at": snapshot.built_at,
+            "columns": _to_columns(snapshot.papers),
+        }
+        _dump(path, payload)
+        for stale in self.snapshot_dir.glob(f"{snapshot.conference.lower()}_{snapshot.year}_v*"):
+            if f"_{snapshot.content_hash[:16]}." not in stale.name:
+                stale.unlink(missing_ok=True)
+
+    def _load_index(self, snapshot: Snapshot) -> SearchIndex:
+        path = self._path(snapshot.conference, snapshot.year, snapshot.content_hash, "index")
+        if path.exists():
+            try:
+                with path.open("rb") as handle:
+                    index = pickle.load(handle)
+                if isinstance(index, SearchIndex) and index.size == len(snapshot.papers):
+                    return index
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                pass
+        index = SearchIndex(snapshot.papers)
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        _dump(path, index)
+        return index
+
+    def build(self, conference: str, year: int, content_hash: str, papers: List[PaperEntry]) -> Snapshot:
+        """Stamp freshly parsed ``papers`` with their origin and persist them."""
+        from enrichment import ENRICHMENT_DB, apply_stored
+
+        for paper in papers:
+            paper.conference = conference
+            paper.year = year
+        # Carry over enrichment from earlier runs so a page revision does not lose it.
+        apply_stored(self.snapshot_dir.parent / ENRICHMENT_DB, conference, year, papers)
+        snapshot = Snapshot(
+            year=year,
+            content_hash=content_hash,
+            papers=papers,
+            built_at=time.time(),
+            conference=conference,
+        )
+        self.save_disk(snapshot)
+        return snapshot
+
+    def get(self, year: int, refresh: bool = False, conference: str = "CVPR") -> Snapshot:
+        """Return the snapshot for ``year``, parsing the page only if it changed.
+
+        Fetching and parsing run under a lock for that (conference, year) only;
+        requests for other years, or for this one while it is still fresh, are
+        served without waiting.
+        """
+        key = (conference, year)
+        current = None if refresh else self._served(key)
+        if current is not None:
+            return current
+        with self._key_lock("fetch", key):
+            # Another request may have revalidated the page while we waited.
+            current = None if refresh else self._served(key)
+            if current is not None:
+                return current
+            current = self.current(year, conference)
+            entry = fetch_page(year, refresh=refresh, conference=conference, cache=self.http_cache)
+            snapshot = current if current and current.content_hash == entry.sha256 else None
+            if snapshot is None:
+                snapshot = self.load_disk(conference, year, entry.sha256)
+            if snapshot is None:
+                snapshot = self.build(conference, year, entry.sha256, parse_papers(entry.body))
+            with self._lock:
+                self._memory[key] = snapshot
+                self._checked_at[key] = time.time()
+            return snapshot
+
+    def current(self, year: int, conference: str = "CVPR") -> Snapshot | None:
+        """The snapshot currently served for ``year``, without any network or disk access."""
+        with self._lock:
+            return self._memory.get((conference, year))
+
+    def install(self, snapshot: Snapshot, pin: bool = False) -> Snapshot | None:
+        """Atomically make ``snapshot`` the one served for its year; returns the previous one.
+
+        With ``pin`` the key stops being revalidated on the request path, because
+        something else (the background refresher) keeps it current.
+        """
+        key = (snapshot.conference, snapshot.year)
+        with self._lock:
+            previous = self._memory.get(key)
+            self._memory[key] = snapshot
+            self._checked_at[key] = time.time()
+            if pin:
+                self._pinned.add(key)
+        return previous
+
+    def pin(self, year: int, conference: str = "CVPR") -> None:
+        with self._lock:
+            self._pinned.add((conference, year))
+
+    def unpin(self, year: int, conference: str = "CVPR") -> None:
+        with self._lock:
+            self._pinned.discard((conference, year))
+
+    def papers(self, year: int, refresh: bool = False, conference: str = "CVPR") -> List[PaperEntry]:
+        return self.get(year, refresh=refresh, conference=conference).papers
+
+    def index_for(self, snapshot: Snapshot) -> SearchIndex:
+        """Return the search index of ``snapshot``, built once and persisted next to it."""
+        if snapshot.index is None:
+            with self._key_lock("index", (snapshot.conference, snapshot.year)):
+                if snapshot.index is None:
+                    snapshot.index = self._load_index(snapshot)
+        return snapshot.index
+
+    def author_index_for(self, snapshot: Snapshot) -> AuthorIndex:
+        """Return the author -> papers index over ``snapshot.papers``, built on first use."""
+        if snapshot.author_index is None:
+            with self._key_lock("author_index", (snapshot.conference, snapshot.year)):
+                if snapshot.author_index is None:
+                    snapshot.author_index = AuthorIndex(snapshot.papers)
+        return snapshot.author_index
+
+    def similarity_for(self, snapshot: Snapshot):
+        """Return the TF-IDF similarity index of ``snapshot``, persisted as ``.similarity.npz``.
+
+        Raises RuntimeError if numpy/scipy are not installed.
+        """
+        if snapshot.similarity is None:
+            from similarity import SimilarityIndex
+
+            with self._key_lock("similarity", (snapshot.conference, snapshot.year)):
+                if snapshot.similarity is None:
+                    path = self._path(snapshot.conference, snapshot.year, snapshot.content_hash, "similarity")
+                    snapshot.similarity = SimilarityIndex.load_or_build(snapshot.papers, path.with_suffix(".npz"))
+        return snapshot.similarity
+
+    def index(self, year: int, refresh: bool = False, conference: str = "CVPR") -> SearchIndex:
+        return self.index_for(self.get(year, refresh=refresh, conference=conference))
+
+    def search(
+        self, year: int, query: str | None, refresh: bool = False, conference: str = "CVPR"
+    ) -> List[PaperEntry]:
+        """Papers matching ``query`` in relevance order (all papers if the query is empty)."""
+        snapshot = self.get(year, refresh=refresh, conference=conference)
+        if not query or not query.strip():
+            return list(snapshot.papers)
+        return self.index_for(snapshot).filter(snapshot.papers, query)
+
+
+_store: SnapshotStore | None = None
+
+
+def get_snapshot_store() -> SnapshotStore:
+    global _store
+    if _store is None:
+        _store = SnapshotStore()
+    return _store
+
+
+def configure_snapshot_store(http_cache: HTTPCache | None = None, **kwargs) -> SnapshotStore:
+    """Replace the shared store with one over ``http_cache`` (default: the configured cache)."""
+    global _store
+    _store = SnapshotStore(http_cache=http_cache, **kwargs)
+    return _store
@@ -0,0 +1,27 @@
+"""
+Shared test helpers
+"""
+
+import hashlib
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from http_cache import CacheEntry
+
+FIXTURE = Path(__file__).parent / "fixtures" / "cvpr_2024_sample.html"
+
+
+def cache_entry(body, url="https://example.invalid/2024", source="network"):
+    """A freshly fetched cache entry for ``body``, as HTTPCache.fetch would return it"""
+    return CacheEntry(
+        url=url,
+        body=body,
+        etag=None,
+        last_modified=None,
+        fetched_at=time.time(),
+        sha256=hashlib.sha256(body.encode("utf-8")).hexdigest(),
+        source=source,
+    )
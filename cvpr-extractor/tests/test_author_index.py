@@ -0,0 +1,36 @@
+"""
+Tests for the author index
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from author_index import AuthorIndex
+from conftest import FIXTURE
+from cvpr_extractor import PaperEntry, parse_papers
+
+PAPERS = [
+    PaperEntry("Diffusion Models Without Attention", None, "Orals 3A", ["Jing Yang", "Ana Park"], "Hall A", True),
+    PaperEntry("Efficient Dataset Distillation", "/p/2", "Poster Session 1", ["Ana Park", "Lee Splatt"], None, False, "CVPR", 2024),
+    PaperEntry("Mip-Splatting", "/p/3", None, ["José Yu", "Ana Park", "Jing Yang"], "Hall B", True),
+]
+
+
+def test_rows_match_parsed_papers():
+    """Test every row's author ids map back to that paper's authors"""
+    papers = parse_papers(FIXTURE.read_text(encoding="utf-8"))
+    index = AuthorIndex(papers)
+    assert len(index) == len(papers)
+    for row, paper in enumerate(papers):
+        assert [index.authors.strings[author] for author in index.author_ids_of(row)] == paper.authors
+
+
+def test_author_lookups():
+    """Test author rows, case-insensitive names and co-author counts"""
+    index = AuthorIndex(PAPERS)
+    assert index.papers_by_author("Ana Park") == [0, 1, 2]
+    assert index.papers_by_author("jing yang") == [0, 2]
+    assert index.papers_by_author("Nobody") == []
+    assert index.coauthors("Ana Park") == [("Jing Yang", 2), ("Lee Splatt", 1), ("José Yu", 1)]
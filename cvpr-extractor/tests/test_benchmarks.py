@@ -0,0 +1,34 @@
+"""
+Smoke tests for the offline benchmark suite
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+import bench_cvpr
+from cvpr_extractor import parse_papers
+
+
+def test_synthesize_scales_page_with_unique_titles():
+    """Test the generator scales the table and keeps every engine in agreement"""
+    html = bench_cvpr.FIXTURE.read_text(encoding="utf-8")
+    page = bench_cvpr.synthesize(html, 200)
+    papers = parse_papers(page, engine="stream")
+    assert len(papers) >= 190
+    assert len({paper.title for paper in papers}) > len(papers) // 2
+    assert parse_papers(page, engine="bs4") == papers
+
+
+def test_run_and_compare_flag_regressions(capsys):
+    """Test a tiny run reports every metric group and compare flags slowdowns"""
+    html = bench_cvpr.FIXTURE.read_text(encoding="utf-8")
+    results = bench_cvpr.run(html, [50], ["stream"], repeat=1)
+    assert {"parse.stream.50.seconds", "parse.stream.50.peak_rss_mb", "index_build.50.seconds"} <= set(results)
+    assert any(metric.startswith("query.50.") for metric in results)
+    baseline = {metric: value / 2 for metric, value in results.items()}
+    regressions = bench_cvpr.compare(results, baseline, tolerance=0.3)
+    assert "parse.stream.50.seconds" in regressions
+    assert "parse.stream.50.records_per_s" not in regressions
+    assert "REGRESSION" in capsys.readouterr().out
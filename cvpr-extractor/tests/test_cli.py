@@ -0,0 +1,35 @@
+"""
+End-to-end tests that run cvpr_extractor.py as a script
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from conftest import FIXTURE, cache_entry
+from http_cache import HTTPCache
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_script_honours_cache_dir(tmp_path):
+    """Test --cache-dir reaches the snapshot store when run as __main__"""
+    cache_dir = tmp_path / "mycache"
+    body = FIXTURE.read_text(encoding="utf-8")
+    HTTPCache(cache_dir=str(cache_dir), ttl=3600)._store("cvpr_2024", cache_entry(body))
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+    result = subprocess.run(
+        [sys.executable, str(ROOT / "cvpr_extractor.py"), "--year", "2024", "--no-json",
+         "--cache-dir", str(cache_dir), "--cache-ttl", "3600", "--keyword", "segmentation"],
+        cwd=workdir,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "segmentation" in result.stdout.lower()
+    assert list((cache_dir / "snapshots").glob("cvpr_2024_*.papers.pickle"))
+    assert not (workdir / ".cvpr_cache").exists()
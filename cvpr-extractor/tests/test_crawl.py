@@ -0,0 +1,132 @@
+"""
+Tests for the multi-year crawler: year specs, merging and per-host pacing
+"""
+
+import sys
+import time
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+
+import crawl
+from conftest import FIXTURE, cache_entry
+from cvpr_extractor import PaperEntry, parse_papers
+from http_cache import HTTPCache
+from snapshot_store import Snapshot, SnapshotStore
+
+
+def _paper(title, **fields):
+    values = dict(link=None, session=None, authors=[], location=None, highlight=False)
+    values.update(fields)
+    return PaperEntry(title=title, **values)
+
+
+def _snapshot(conference, year, papers):
+    return Snapshot(year=year, content_hash="0" * 64, papers=papers, built_at=0.0, conference=conference)
+
+
+def _broken_parser(html):
+    if "broken" in html:
+        raise ValueError("unexpected markup")
+    return parse_papers(html)
+
+
+def test_parse_years():
+    """Test ranges, lists, reversed ranges and duplicates in --years"""
+    assert crawl.parse_years("2020-2022") == [2020, 2021, 2022]
+    assert crawl.parse_years("2024, 2019,,2022-2021,2024") == [2019, 2021, 2022, 2024]
+    with pytest.raises(ValueError):
+        crawl.parse_years("2020-")
+
+
+def test_merge_papers_dedups_within_conference_year():
+    """Test duplicate rows merge by normalized title and fill in missing fields"""
+    first = _paper("Deep Nets: A Study", session="Oral 1", arxiv_id="2401.00001")
+    duplicate = _paper(
+        "deep nets - a study", link="/poster/1", session="Poster 2", authors=["Ada"],
+        location="Hall A", highlight=True, arxiv_id="2401.99999", pdf_url="https://x/1.pdf",
+    )
+    merged = crawl.merge_papers([
+        _snapshot("ICCV", 2023, [_paper("Deep Nets: A Study")]),
+        _snapshot("CVPR", 2024, [first, duplicate, _paper("Other Paper")]),
+    ])
+    assert [(paper.conference, paper.year, paper.title) for paper in merged] == [
+        ("CVPR", 2024, "Deep Nets: A Study"),
+        ("CVPR", 2024, "Other Paper"),
+        ("ICCV", 2023, "Deep Nets: A Study"),
+    ]
+    paper = merged[0]
+    assert (paper.link, paper.session, paper.authors, paper.location) == ("/poster/1", "Oral 1", ["Ada"], "Hall A")
+    assert paper.highlight
+    assert (paper.arxiv_id, paper.pdf_url) == ("2401.00001", "https://x/1.pdf")
+    assert first.link is None and first.conference is None
+
+
+def test_host_rate_limiter_spaces_requests_per_host():
+    """Test requests to one host are spaced while other hosts are not held up"""
+    limiter = crawl.HostRateLimiter(min_interval=0.1)
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.wait("https://openaccess.thecvf.com/CVPR2024")
+    assert time.monotonic() - started >= 0.19
+    started = time.monotonic()
+    limiter.wait("https://other.example/")
+    assert time.monotonic() - started < 0.05
+
+
+def test_crawl_skips_page_that_fails_to_parse(tmp_path, monkeypatch, capsys):
+    """Test a parser error is reported and the remaining pages are still crawled"""
+    body = FIXTURE.read_text(encoding="utf-8")
+    pages = {2023: "<html>broken</html>", 2024: body}
+    store = SnapshotStore(http_cache=HTTPCache(cache_dir=str(tmp_path), ttl=3600))
+    monkeypatch.setattr(crawl, "get_snapshot_store", lambda: store)
+    monkeypatch.setattr(crawl, "fetch_page", lambda year, refresh=False, conference="CVPR", cache=None, throttle=None: cache_entry(pages[year]))
+    monkeypatch.setattr(crawl, "parse_papers", _broken_parser)
+    snapshots = crawl.crawl(["CVPR"], [2023, 2024], parse_workers=1, min_interval=0)
+    assert [snapshot.year for snapshot in snapshots] == [2024]
+    assert snapshots[0].papers
+    assert "Skipping CVPR 2023: could not parse page" in capsys.readouterr().err
+
+
+def test_cached_crawl_skips_rate_limit(tmp_path, monkeypatch):
+    """Test pages served from the HTTP cache do not wait for the per-host limiter"""
+    body = FIXTURE.read_text(encoding="utf-8")
+    cache = HTTPCache(cache_dir=str(tmp_path), ttl=3600)
+    years = [2019, 2020, 2021, 2022]
+    for year in years:
+        cache._store(f"cvpr_{year}", cache_entry(body))
+    store = SnapshotStore(http_cache=cache)
+    monkeypatch.setattr(crawl, "get_snapshot_store", lambda: store)
+    started = time.monotonic()
+    snapshots = crawl.crawl(["CVPR"], years, parse_workers=1, min_interval=5)
+    assert len(snapshots) == len(years)
+    assert time.monotonic() - started < 5
+
+
+class _BrokenPool:
+    def __init__(self, max_workers=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+    def submit(self, fn, *args):
+        raise BrokenProcessPool("A child process terminated abruptly")
+
+
+def test_crawl_survives_broken_process_pool(tmp_path, monkeypatch, capsys):
+    """Test a pool that breaks before a page is submitted skips that page instead of aborting"""
+    body = FIXTURE.read_text(encoding="utf-8")
+    store = SnapshotStore(http_cache=HTTPCache(cache_dir=str(tmp_path), ttl=3600))
+    monkeypatch.setattr(crawl, "get_snapshot_store", lambda: store)
+    monkeypatch.setattr(crawl, "fetch_page", lambda year, refresh=False, conference="CVPR", cache=None, throttle=None: cache_entry(body))
+    monkeypatch.setattr(crawl, "ProcessPoolExecutor", _BrokenPool)
+    assert crawl.crawl(["CVPR"], [2023, 2024], min_interval=0) == []
+    err = capsys.readouterr().err
+    assert "Skipping CVPR 2023: could not parse page" in err and "Skipping CVPR 2024" in err
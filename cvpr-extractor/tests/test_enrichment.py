@@ -0,0 +1,130 @@
+"""
+Tests for the link resolver and metadata enrichment pipeline
+"""
+
+import asyncio
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from cvpr_extractor import PaperEntry, normalize_title
+from enrichment import ENRICHMENT_DB, EnrichmentCache, Enricher, apply_results
+from snapshot_store import SnapshotStore
+
+PROJECT_PAGE = b"""<html><head><title>Fancy &amp; Fast Project</title></head><body>
+<a href="https://arxiv.org/abs/2401.01234">arXiv</a> <a href="/files/paper.pdf">PDF</a>
+</body></html>"""
+PDF_BODY = b"%PDF-1.4" + b"0" * 4088
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        self.hits.append(self.path)
+        if self.path.startswith("/paper/"):
+            self.send_response(302)
+            self.send_header("Location", "/project/" + self.path.rsplit("/", 1)[1])
+            self.end_headers()
+        elif self.path.startswith("/project/"):
+            self._send("text/html; charset=utf-8", PROJECT_PAGE)
+        elif self.path == "/files/paper.pdf":
+            self._send("application/pdf", PDF_BODY)
+        else:
+            self.send_error(404)
+
+    def _send(self, content_type, body):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Local HTTP server with a redirecting paper link, a project page and a PDF"""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    _Handler.hits.clear()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _papers(base):
+    return [
+        PaperEntry("Fancy Paper", f"{base}/paper/1", None, [], None, False),
+        PaperEntry("Sibling Paper", f"{base}/paper/2", None, [], None, False),
+        PaperEntry("Broken Paper", f"{base}/missing", None, [], None, False),
+        PaperEntry("Unlinked Paper", None, None, [], None, False),
+    ]
+
+
+def test_enrich_follows_redirects_and_skips_fresh_results(server, tmp_path):
+    """Test enrichment resolves links, dedupes the shared PDF and a re-run makes no requests"""
+    cache = EnrichmentCache(tmp_path / ENRICHMENT_DB)
+    enricher = Enricher(cache, concurrency=4, min_interval=0)
+    papers = _papers(server)
+    todo = enricher.pending("CVPR", 2024, papers)
+    assert [paper.title for paper in todo] == ["Fancy Paper", "Sibling Paper", "Broken Paper"]
+    failed = asyncio.run(enricher.run("CVPR", 2024, todo))
+    assert failed == 1
+    assert _Handler.hits.count("/files/paper.pdf") == 1
+    assert apply_results(papers, cache.results("CVPR", 2024)) == 3
+    fancy = papers[0]
+    assert fancy.resolved_link == f"{server}/project/1"
+    assert fancy.page_title == "Fancy & Fast Project"
+    assert fancy.arxiv_id == "2401.01234"
+    assert fancy.pdf_url == f"{server}/files/paper.pdf"
+    assert fancy.pdf_size == len(PDF_BODY)
+    assert papers[2].resolved_link is None
+
+    _Handler.hits.clear()
+    assert [paper.title for paper in enricher.pending("CVPR", 2024, papers)] == ["Broken Paper"]
+    papers[1].link = f"{server}/paper/3"
+    assert len(enricher.pending("CVPR", 2024, papers)) == 2
+    asyncio.run(enricher.run("CVPR", 2024, [papers[0]]))
+    assert _Handler.hits == []
+    cache.close()
+
+
+def test_snapshot_build_applies_stored_enrichment(server, tmp_path):
+    """Test a rebuilt snapshot picks up enrichment stored by an earlier run"""
+    cache = EnrichmentCache(tmp_path / ENRICHMENT_DB)
+    enricher = Enricher(cache, concurrency=2, min_interval=0)
+    asyncio.run(enricher.run("CVPR", 2024, _papers(server)[:1]))
+    cache.close()
+    store = SnapshotStore(cache_dir=tmp_path)
+    snapshot = store.build("CVPR", 2024, "0" * 64, _papers(server))
+    assert snapshot.papers[0].arxiv_id == "2401.01234"
+    assert snapshot.papers[1].arxiv_id is None
+    assert store.load_disk("CVPR", 2024, "0" * 64).papers[0].pdf_size == len(PDF_BODY)
+
+
+def test_unexpected_error_skips_only_that_paper(server, tmp_path, monkeypatch):
+    """Test a paper raising an unexpected error is recorded as failed and the rest still finish"""
+    cache = EnrichmentCache(tmp_path / ENRICHMENT_DB)
+    enricher = Enricher(cache, concurrency=2, min_interval=0)
+    enrich = enricher._enrich
+
+    async def flaky(client, paper):
+        if paper.title == "Sibling Paper":
+            raise ValueError("bad markup")
+        return await enrich(client, paper)
+
+    monkeypatch.setattr(enricher, "_enrich", flaky)
+    failed = asyncio.run(enricher.run("CVPR", 2024, _papers(server)[:2]))
+    assert failed == 1
+    results = cache.results("CVPR", 2024)
+    assert results[normalize_title("Fancy Paper")]["arxiv_id"] == "2401.01234"
+    assert "bad markup" in results[normalize_title("Sibling Paper")]["error"]
+    cache.close()
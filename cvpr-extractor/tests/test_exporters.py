@@ -0,0 +1,72 @@
+"""
+Tests for the streaming exporters
+"""
+
+import csv
+import dataclasses
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from cvpr_extractor import PaperEntry
+from exporters import Exporter, _ColumnarExporter, export_papers, infer_format, pa
+
+
+PAPERS = [
+    PaperEntry("Diffusion Models Without Attention", None, "Orals 3A", ["Jing Yang", "Ana Park"], "Hall A", True, "CVPR", 2024),
+    PaperEntry("Mip-Splatting", "/p/3", None, ["José Yu"], None, False, "CVPR", 2024),
+]
+
+
+def test_json_matches_indented_dump(tmp_path):
+    """Test streamed JSON is byte-identical to json.dump(..., indent=2)"""
+    for papers in (PAPERS, []):
+        target = tmp_path / "out.json"
+        export_papers(iter(papers), str(target))
+        expected = json.dumps([dataclasses.asdict(p) for p in papers], indent=2, ensure_ascii=False)
+        assert target.read_text(encoding="utf-8") == expected
+
+
+def test_ndjson_and_csv(tmp_path):
+    """Test line-oriented formats"""
+    export_papers(PAPERS, str(tmp_path / "out.ndjson"))
+    lines = (tmp_path / "out.ndjson").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["title"] for line in lines] == [p.title for p in PAPERS]
+
+    export_papers(PAPERS, str(tmp_path / "out.csv"))
+    with (tmp_path / "out.csv").open(encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert rows[0]["authors"] == "Jing Yang; Ana Park"
+    assert rows[1]["session"] == ""
+
+
+def test_base_exporters_are_abstract(tmp_path):
+    """Test exporters missing their format hooks cannot be instantiated"""
+    with pytest.raises(TypeError):
+        Exporter(sys.stdout, owns_handle=False)
+
+    class NoWriter(_ColumnarExporter):
+        pass
+
+    with pytest.raises(TypeError):
+        NoWriter(str(tmp_path / "out.bin"))
+
+
+def test_infer_format():
+    """Test format inference from the output path"""
+    assert infer_format("a.jsonl") == "ndjson"
+    assert infer_format("a.feather") == "arrow"
+    assert infer_format("-") == "json"
+
+
+@pytest.mark.skipif(pa is None, reason="pyarrow not installed")
+def test_arrow_round_trip(tmp_path):
+    """Test the Arrow IPC file can be memory-mapped back"""
+    target = tmp_path / "out.arrow"
+    export_papers(PAPERS, str(target))
+    table = pa.ipc.open_file(pa.memory_map(str(target))).read_all()
+    assert table.column("authors").to_pylist() == [p.authors for p in PAPERS]
+    assert table.column("year").to_pylist() == [2024, 2024]
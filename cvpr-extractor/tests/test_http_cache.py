@@ -0,0 +1,107 @@
+"""
+Tests for the on-disk HTTP cache and its conditional revalidation
+"""
+
+import gzip
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+import requests
+from http_cache import HTTPCache
+
+URL = "https://example.invalid/2024"
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}", response=self)
+
+
+class FakeSession:
+    """Replays queued responses (or exceptions) and records request headers"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def _cache(tmp_path, session, ttl=3600):
+    return HTTPCache(cache_dir=tmp_path, ttl=ttl, session=session)
+
+
+def _first_response():
+    return FakeResponse(200, "<html>papers</html>", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+
+def test_serves_within_ttl_without_request(tmp_path):
+    """Test a fresh entry is served from disk without touching the network or the throttle"""
+    session = FakeSession(_first_response())
+    cache = _cache(tmp_path, session)
+    throttled = []
+    assert cache.fetch(URL, "cvpr_2024", throttle=throttled.append).source == "network"
+    entry = cache.fetch(URL, "cvpr_2024", throttle=throttled.append)
+    assert entry.source == "fresh" and entry.body == "<html>papers</html>"
+    assert len(session.requests) == 1
+    assert throttled == [URL]
+
+
+def test_revalidates_after_ttl_and_304_refreshes(tmp_path):
+    """Test an expired entry sends validators and a 304 serves the stored body"""
+    session = FakeSession(_first_response(), FakeResponse(304, headers={"ETag": '"v1"'}))
+    cache = _cache(tmp_path, session, ttl=0)
+    first = cache.fetch(URL, "cvpr_2024")
+    time.sleep(0.01)
+    entry = cache.fetch(URL, "cvpr_2024")
+    assert session.requests[1]["If-None-Match"] == '"v1"'
+    assert session.requests[1]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert entry.source == "revalidated"
+    assert entry.body == first.body and entry.sha256 == first.sha256
+    assert entry.fetched_at > first.fetched_at
+    assert cache.peek("cvpr_2024").fetched_at == entry.fetched_at
+
+
+def test_stale_copy_on_connection_error(tmp_path):
+    """Test the cached copy is served when the network is down"""
+    session = FakeSession(_first_response(), requests.ConnectionError("offline"))
+    cache = _cache(tmp_path, session, ttl=0)
+    cache.fetch(URL, "cvpr_2024")
+    entry = cache.fetch(URL, "cvpr_2024")
+    assert entry.source == "stale" and entry.body == "<html>papers</html>"
+    with pytest.raises(requests.ConnectionError):
+        _cache(tmp_path / "empty", FakeSession(requests.ConnectionError("offline"))).fetch(URL, "cvpr_2024")
+
+
+def test_body_stored_gzipped(tmp_path):
+    """Test bodies round-trip through gzip on disk"""
+    body = "<html>" + "Über résumé " * 500 + "</html>"
+    cache = _cache(tmp_path, FakeSession(FakeResponse(200, body)))
+    cache.fetch(URL, "cvpr_2024")
+    stored = tmp_path / "http" / "cvpr_2024.html.gz"
+    assert stored.stat().st_size < len(body.encode("utf-8")) // 5
+    assert gzip.decompress(stored.read_bytes()).decode("utf-8") == body
+    assert cache.peek("cvpr_2024").body == body
+
+
+def test_304_without_cached_copy_is_an_error(tmp_path):
+    """Test a 304 with nothing cached raises instead of caching an empty body"""
+    cache = _cache(tmp_path, FakeSession(FakeResponse(304)))
+    with pytest.raises(requests.HTTPError):
+        cache.fetch(URL, "cvpr_2024")
+    assert cache.peek("cvpr_2024") is None
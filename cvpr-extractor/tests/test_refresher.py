@@ -0,0 +1,57 @@
+"""
+Tests for the background refresher's change detection and snapshot swap
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cvpr_extractor
+import refresher
+from conftest import FIXTURE, cache_entry
+from snapshot_store import SnapshotStore
+
+
+def test_refresh_swaps_snapshot_and_logs_changes(tmp_path, monkeypatch):
+    """Test a new page revision is diffed, installed and written to the changelog"""
+    cvpr_extractor.configure_http_cache(str(tmp_path / "cache"), 3600)
+    store = SnapshotStore()
+    body = FIXTURE.read_text(encoding="utf-8")
+    papers = cvpr_extractor.parse_papers(body)
+    removed = papers[0]
+    relinked = next(paper for paper in papers[1:] if paper.link)
+    pages = iter([body, body.replace(removed.title, "Entirely New Benchmark").replace(f'"{relinked.link}"', '"/poster/moved"')])
+    monkeypatch.setattr(refresher, "fetch_page", lambda year, refresh=False, conference="CVPR", cache=None: cache_entry(next(pages)))
+    worker = refresher.Refresher(store=store, changelog_dir=tmp_path)
+
+    assert worker.refresh(2024) is None
+    first = store.current(2024)
+    changes = worker.refresh(2024)
+    assert store.current(2024) is not first
+    assert store.get(2024) is store.current(2024)
+    assert [paper.title for paper in changes.removed] == [removed.title]
+    assert [paper.title for paper in changes.added] == ["Entirely New Benchmark"]
+    assert [(old.link, new.link) for old, new in changes.changed] == [(relinked.link, "/poster/moved")]
+
+    records = [json.loads(line) for line in (tmp_path / "cvpr_2024_changes.jsonl").read_text().splitlines()]
+    assert len(records) == 1
+    assert records[0]["removed"] == [removed.title]
+    assert records[0]["changed"][0]["fields"] == {"link": [relinked.link, "/poster/moved"]}
+
+
+def test_changelog_defaults_to_cache_directory(tmp_path, monkeypatch):
+    """Test the changelog is written next to the cache, not the working directory"""
+    cvpr_extractor.configure_http_cache(str(tmp_path / "cache"), 3600)
+    store = SnapshotStore()
+    body = FIXTURE.read_text(encoding="utf-8")
+    pages = iter([body, body.replace(cvpr_extractor.parse_papers(body)[0].title, "Entirely New Benchmark")])
+    monkeypatch.setattr(refresher, "fetch_page", lambda year, refresh=False, conference="CVPR", cache=None: cache_entry(next(pages)))
+    monkeypatch.chdir(tmp_path)
+    worker = refresher.Refresher(store=store, changelog_dir=None)
+
+    worker.refresh(2024)
+    assert worker.refresh(2024) is not None
+    assert (tmp_path / "cache" / "changes" / "cvpr_2024_changes.jsonl").exists()
+    assert not list(tmp_path.glob("*.jsonl"))
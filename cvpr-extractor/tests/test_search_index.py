@@ -0,0 +1,64 @@
+"""
+Tests for the inverted index and query language
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from cvpr_extractor import PaperEntry
+from search_index import SearchIndex, SearchQueryError
+
+
+PAPERS = [
+    PaperEntry("Diffusion Models Without Attention", None, "Orals 3A", ["Jing Yang", "Ana Park"], "Hall A", True),
+    PaperEntry("Efficient Dataset Distillation via Minimax Diffusion", None, "Poster Session 1", ["Ana Park"], None, False),
+    PaperEntry("Mip-Splatting: Alias-free 3D Gaussian Splatting", "/p/3", "Poster Session 2", ["José Yu"], "Hall B", True),
+    PaperEntry("Gaussian Process Regression for Pose", None, "Orals 5B", ["Lee Splatt"], None, False),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    """Index over a handful of papers"""
+    return SearchIndex(PAPERS)
+
+
+def titles(index, query, implicit_prefix=False):
+    return [PAPERS[hit.doc_id].title for hit in index.search(query, implicit_prefix=implicit_prefix)]
+
+
+def test_empty_query_returns_everything_in_order(index):
+    """Test an empty query keeps document order"""
+    assert titles(index, "") == [paper.title for paper in PAPERS]
+
+
+def test_ranked_by_bm25(index):
+    """Test shorter titles with the term rank first"""
+    assert titles(index, "diffusion") == [PAPERS[0].title, PAPERS[1].title]
+
+
+def test_field_scopes_and_highlight(index):
+    """Test author:, session: and highlight: filters"""
+    # The single-author paper has the shorter author field, so it ranks first.
+    assert titles(index, "author:park") == [PAPERS[1].title, PAPERS[0].title]
+    assert titles(index, "author:park highlight:true") == [PAPERS[0].title]
+    assert titles(index, "session:orals -diffusion") == [PAPERS[3].title]
+
+
+def test_boolean_phrase_and_prefix(index):
+    """Test OR, quoted phrases, prefixes and accent folding"""
+    assert set(titles(index, "minimax OR pose")) == {PAPERS[1].title, PAPERS[3].title}
+    assert titles(index, '"gaussian splatting"') == [PAPERS[2].title]
+    assert set(titles(index, "splat*")) == {PAPERS[2].title, PAPERS[3].title}
+    assert titles(index, "author:jose") == [PAPERS[2].title]
+    assert titles(index, "diffus") == []
+    assert len(titles(index, "diffus", implicit_prefix=True)) == 2
+
+
+def test_invalid_query(index):
+    """Test unbalanced parentheses are reported"""
+    with pytest.raises(SearchQueryError):
+        index.search("(diffusion")
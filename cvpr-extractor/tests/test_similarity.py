@@ -0,0 +1,58 @@
+"""
+Tests for TF-IDF similarity search and clustering
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from cvpr_extractor import PaperEntry
+from similarity import SimilarityIndex
+
+
+PAPERS = [
+    PaperEntry("Gaussian Splatting for Dynamic Scenes", None, "Orals 1A: 3D vision", [], None, False),
+    PaperEntry("Anti-Aliased Gaussian Splatting", None, "Poster Session 1", [], None, False),
+    PaperEntry("Video Diffusion Models", None, "Orals 2B: Generative models", [], None, False),
+    PaperEntry("Latent Diffusion Models for Video Editing", None, "Poster Session 2", [], None, False),
+    PaperEntry("Sparse Gaussian Splatting of Dynamic Scenes", None, "Poster Session 1", [], None, False),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    """Similarity index over a handful of papers"""
+    return SimilarityIndex.build(PAPERS)
+
+
+def test_similar_papers_batched(index):
+    """Test nearest neighbours exclude the paper itself and share its topic"""
+    splatting, diffusion = index.similar_to([0, 2], k=2)
+    assert [hit.doc_id for hit in splatting] == [4, 1]
+    assert diffusion[0].doc_id == 3
+    assert all(hit.score <= 1.0 for hit in splatting + diffusion)
+
+
+def test_like_title_or_free_text(index):
+    """Test like() uses an exact title match, otherwise the text itself"""
+    assert index.like("video diffusion models", k=1)[0].doc_id == 3
+    assert index.like("diffusion for video", k=1)[0].doc_id in (2, 3)
+    assert index.query("unrelated words", k=3) == []
+
+
+def test_clusters_and_persistence(index, tmp_path):
+    """Test clustering separates topics and saved matrices load back unchanged"""
+    clusters = index.cluster(2)
+    groups = sorted(sorted(cluster.doc_ids) for cluster in clusters)
+    assert groups == [[0, 1, 4], [2, 3]]
+    path = tmp_path / "papers.similarity.npz"
+    index.save(path)
+    loaded = SimilarityIndex.load_or_build(PAPERS, path)
+    assert loaded.vocabulary == index.vocabulary
+    assert (loaded.matrix != index.matrix).nnz == 0
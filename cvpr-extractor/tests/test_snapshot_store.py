@@ -0,0 +1,70 @@
+"""
+Tests for the snapshot store's per-year locking
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import snapshot_store
+from conftest import FIXTURE, cache_entry
+from http_cache import HTTPCache
+from snapshot_store import SnapshotStore
+
+
+def test_slow_fetch_does_not_block_other_years(tmp_path, monkeypatch):
+    """Test a year stuck in fetch_page leaves cached years and their indexes servable"""
+    body = FIXTURE.read_text(encoding="utf-8")
+    release = threading.Event()
+    fetching = threading.Event()
+    calls = []
+
+    def fake_fetch(year, refresh=False, conference="CVPR", cache=None):
+        calls.append(year)
+        if year == 2023:
+            fetching.set()
+            release.wait(5)
+        return cache_entry(body)
+
+    monkeypatch.setattr(snapshot_store, "fetch_page", fake_fetch)
+    store = SnapshotStore(http_cache=HTTPCache(cache_dir=str(tmp_path), ttl=3600))
+    cached = store.get(2024)
+    slow = threading.Thread(target=store.get, args=(2023,))
+    slow.start()
+    try:
+        assert fetching.wait(5)
+        started = time.monotonic()
+        assert store.get(2024) is cached
+        assert store.index_for(cached).size == len(cached.papers)
+        assert len(store.author_index_for(cached)) == len(cached.papers)
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+        slow.join(5)
+    assert store.current(2023) is not None
+    assert calls == [2024, 2023]
+
+
+def test_concurrent_gets_fetch_once(tmp_path, monkeypatch):
+    """Test requests racing for a cold year share one fetch"""
+    body = FIXTURE.read_text(encoding="utf-8")
+    calls = []
+
+    def fake_fetch(year, refresh=False, conference="CVPR", cache=None):
+        calls.append(year)
+        time.sleep(0.1)
+        return cache_entry(body)
+
+    monkeypatch.setattr(snapshot_store, "fetch_page", fake_fetch)
+    store = SnapshotStore(http_cache=HTTPCache(cache_dir=str(tmp_path), ttl=3600))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.get(2024))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert calls == [2024]
+    assert all(result is results[0] for result in results)
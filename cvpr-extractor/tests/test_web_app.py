@@ -0,0 +1,122 @@
+"""
+Tests for the paginated search API and cached page rendering
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+import cvpr_extractor
+import snapshot_store
+import web_app
+from conftest import FIXTURE, cache_entry
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Flask test client over a cache pre-seeded with the sample page"""
+    body = FIXTURE.read_text(encoding="utf-8")
+    cache = cvpr_extractor.configure_http_cache(str(tmp_path / "cache"), 3600)
+    cache._store("cvpr_2024", cache_entry(body))
+    monkeypatch.setattr(snapshot_store, "_store", snapshot_store.SnapshotStore())
+    monkeypatch.chdir(tmp_path)
+    web_app._results.clear()
+    web_app._pages.clear()
+    web_app._written.clear()
+    yield web_app.app.test_client()
+    web_app.stop_refresher()
+
+
+def test_api_cursor_pagination(client):
+    """Test cursors walk every result exactly once"""
+    titles = []
+    cursor = None
+    while True:
+        query = {"year": 2024, "limit": 6, "sort": "title"}
+        if cursor:
+            query["cursor"] = cursor
+        data = client.get("/api/search", query_string=query).get_json()
+        titles.extend(paper["title"] for paper in data["papers"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert len(titles) == data["total"] == 19
+    assert titles == sorted(titles, key=str.casefold)
+
+
+def test_api_etag_and_errors(client):
+    """Test If-None-Match returns 304 and bad input returns 400"""
+    first = client.get("/api/search?year=2024&q=segmentation")
+    assert first.status_code == 200 and first.get_json()["total"] >= 1
+    repeat = client.get("/api/search?year=2024&q=segmentation", headers={"If-None-Match": first.headers["ETag"]})
+    assert repeat.status_code == 304
+    assert client.get("/api/search?year=2024&sort=bogus").status_code == 400
+    assert client.get("/api/search?year=2024&cursor=!!").status_code == 400
+    assert client.get("/api/search?year=2024&q=(diffusion").status_code == 400
+
+
+def test_page_render_is_cached_and_json_written_once(client, tmp_path):
+    """Test repeat views reuse the rendered page and skip rewriting the JSON file"""
+    first = client.get("/?year=2024&limit=&page=1")
+    assert first.status_code == 200
+    json_file = tmp_path / "cvpr_2024_accepted.json"
+    written_at = json_file.stat().st_mtime_ns
+    web_app._pages.clear()
+    client.post("/", data={"year": "2024", "keyword": "", "limit": ""})
+    assert json_file.stat().st_mtime_ns == written_at
+    repeat = client.get("/?year=2024&limit=&page=1", headers={"If-None-Match": first.headers["ETag"]})
+    assert repeat.status_code == 304
+
+
+def test_similar_and_cluster_endpoints(client):
+    """Test the similarity and clustering endpoints answer from the snapshot"""
+    pytest.importorskip("scipy")
+    data = client.get("/api/similar?year=2024&q=video segmentation&k=3").get_json()
+    assert 0 < len(data["papers"]) <= 3
+    assert data["papers"][0]["score"] >= data["papers"][-1]["score"]
+    clusters = client.get("/api/clusters?year=2024&k=3&per=2").get_json()["clusters"]
+    assert sum(cluster["size"] for cluster in clusters) == 19
+    assert client.get("/api/similar?year=2024").status_code == 400
+
+
+def test_json_file_per_revision_and_download(client, tmp_path):
+    """Test alternating queries never rewrite the year file and downloads follow the query"""
+    json_file = tmp_path / "cvpr_2024_accepted.json"
+    first = client.get("/?year=2024&keyword=diffusion")
+    written_at = json_file.stat().st_mtime_ns
+    assert len(json.loads(json_file.read_text(encoding="utf-8"))) == 19
+    for keyword in ("segmentation", "diffusion", "segmentation"):
+        client.post("/", data={"year": "2024", "keyword": keyword, "limit": ""})
+    assert json_file.stat().st_mtime_ns == written_at
+
+    json_file.unlink()
+    repeat = client.get("/?year=2024&keyword=diffusion", headers={"If-None-Match": first.headers["ETag"]})
+    assert repeat.status_code == 304
+    assert not json_file.exists()
+
+    download = client.get("/download.json?year=2024&keyword=diffusion&limit=2")
+    assert download.headers["Content-Disposition"] == 'attachment; filename="cvpr_2024_results.json"'
+    titles = [paper["title"] for paper in download.get_json()]
+    assert len(titles) == 2 and all("diffusion" in title.lower() for title in titles)
+    cached = client.get("/download.json?year=2024&keyword=diffusion&limit=2", headers={"If-None-Match": download.headers["ETag"]})
+    assert cached.status_code == 304
+
+
+def test_refresher_runs_only_between_start_and_stop(client):
+    """Test requests watch years only on a started refresher, and stopping unpins them"""
+    store = snapshot_store.get_snapshot_store()
+    assert client.get("/api/search", query_string={"year": 2024}).status_code == 200
+    assert ("CVPR", 2024) not in store._pinned
+
+    worker = web_app.start_refresher(interval=3600)
+    assert client.get("/api/search", query_string={"year": 2024}).status_code == 200
+    assert ("CVPR", 2024) in store._pinned
+    assert worker._thread.is_alive()
+
+    web_app.stop_refresher()
+    assert not worker._thread.is_alive()
+    assert ("CVPR", 2024) not in store._pinned
+    assert "cvpr_refresher" not in web_app.app.extensions
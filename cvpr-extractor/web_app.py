@@ -3,31 +3,318 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
+import dataclasses
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, List
 
-from flask import Flask, render_template, request
+from flask import Flask, Response, current_app, jsonify, render_template, request
 
-from cvpr_extractor import (
-    PaperEntry,
-    fetch_html,
-    filter_papers,
-    parse_papers,
-    write_json,
-)
+from cvpr_extractor import PaperEntry, write_json
+from exporters import JSONExporter
+from refresher import Refresher
+from search_index import SearchQueryError
+from snapshot_store import Snapshot, get_snapshot_store
 
 app = Flask(__name__)
 
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+CACHE_SIZE = 256
+SORT_KEYS: Dict[str, Callable[[PaperEntry], object]] = {
+    "title": lambda paper: paper.title.casefold(),
+    "session": lambda paper: (paper.session or "").casefold(),
+    "highlight": lambda paper: not paper.highlight,
+}
+SIMILAR_K = 10
+DEFAULT_CLUSTERS = 20
+SORT_OPTIONS = ("relevance", *SORT_KEYS, *(f"-{name}" for name in SORT_KEYS))
 
-def _extract_papers(year: int, keyword: str | None, limit: int | None) -> tuple[List[PaperEntry], str]:
-    html = fetch_html(year)
-    papers = parse_papers(html)
-    papers = filter_papers(papers, keyword)
-    if limit is not None:
-        papers = papers[:limit]
-    json_path = Path(f"cvpr_{year}_accepted.json")
-    write_json(papers, str(json_path))
-    return papers, json_path.name
+
+def start_refresher(flask_app: Flask = app, **kwargs) -> Refresher:
+    """Start ``flask_app``'s background refresher; ``kwargs`` go to ``Refresher``.
+
+    Call once at startup and pair with ``stop_refresher``. Without a running
+    refresher, served years are revalidated on the request path instead.
+    """
+    stop_refresher(flask_app)
+    refresher = Refresher(**kwargs)
+    refresher.start()
+    flask_app.extensions["cvpr_refresher"] = refresher
+    return refresher
+
+
+def stop_refresher(flask_app: Flask = app, timeout: float | None = 5.0) -> None:
+    refresher = flask_app.extensions.pop("cvpr_refresher", None)
+    if refresher is not None:
+        refresher.stop(timeout)
+
+
+def _watch(year: int) -> None:
+    refresher = current_app.extensions.get("cvpr_refresher")
+    if refresher is not None:
+        refresher.watch(year)
+
+
+class _LRUCache:
+    """Thread-safe bounded mapping; keys embed the snapshot hash, so stale entries just age out."""
+
+    def __init__(self, maxsize: int = CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build: Callable[[], object]):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+        value = build()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_results = _LRUCache()
+_pages = _LRUCache()
+_written: Dict[str, str] = {}
+_written_lock = threading.Lock()
+
+
+def _etag(*parts: object) -> str:
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:32]
+
+
+def _not_modified(etag: str) -> Response | None:
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
+def _search(snapshot: Snapshot, keyword: str | None, sort: str = "relevance") -> List[PaperEntry]:
+    """Matching papers in ``sort`` order, computed once per snapshot revision."""
+
+    def build() -> List[PaperEntry]:
+        store = get_snapshot_store()
+        if keyword:
+            papers = store.index_for(snapshot).filter(snapshot.papers, keyword)
+        else:
+            papers = list(snapshot.papers)
+        if sort != "relevance":
+            name = sort.lstrip("-")
+            papers = sorted(papers, key=SORT_KEYS[name], reverse=sort.startswith("-"))
+        return papers
+
+    return _results.get_or_build((snapshot.conference, snapshot.year, snapshot.content_hash, keyword, sort), build)
+
+
+def _encode_cursor(snapshot: Snapshot, offset: int) -> str:
+    payload = json.dumps({"h": snapshot.content_hash[:16], "o": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, snapshot: Snapshot) -> int:
+    """Offset stored in ``cursor``; raises ValueError if it is malformed or from an older dataset."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        content_hash, offset = payload["h"], int(payload["o"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Malformed cursor.") from exc
+    if content_hash != snapshot.content_hash[:16]:
+        raise ValueError("The dataset changed since this cursor was issued; restart from the first page.")
+    return max(0, offset)
+
+
+def _save_json(snapshot: Snapshot) -> str:
+    """Write the year's full dataset once per page revision; queries never rewrite it."""
+    json_path = Path(f"cvpr_{snapshot.year}_accepted.json")
+    with _written_lock:
+        if _written.get(json_path.name) != snapshot.content_hash or not json_path.exists():
+            write_json(snapshot.papers, str(json_path))
+            _written[json_path.name] = snapshot.content_hash
+    return json_path.name
+
+
+def _int_arg(value: str | None, default: int | None, minimum: int, maximum: int | None = None) -> int | None:
+    if value is None or not value.strip():
+        return default
+    number = max(minimum, int(value))
+    return min(number, maximum) if maximum is not None else number
+
+
+@app.route("/api/search")
+def api_search():
+    """Paginated search: ``?year=&q=&sort=&limit=&cursor=``.
+
+    Responses carry an ETag derived from the page revision and the request,
+    so a repeat request with ``If-None-Match`` costs a 304 and no search.
+    """
+    try:
+        year = int(request.args.get("year", "2024"))
+        page_size = _int_arg(request.args.get("limit"), PAGE_SIZE, 1, MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify(error="year and limit must be numbers."), 400
+    keyword = request.args.get("q", "").strip() or None
+    sort = request.args.get("sort", "relevance")
+    if sort not in SORT_OPTIONS:
+        return jsonify(error=f"sort must be one of: {', '.join(SORT_OPTIONS)}"), 400
+    cursor = request.args.get("cursor") or None
+    try:
+        snapshot = get_snapshot_store().get(year)
+    except Exception as exc:  # pylint: disable=broad-except
+        return jsonify(error=f"Failed to fetch CVPR data: {exc}"), 502
+    _watch(year)
+
+    etag = _etag(snapshot.content_hash, year, keyword, sort, page_size, cursor)
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+    try:
+        offset = _decode_cursor(cursor, snapshot) if cursor else 0
+        papers = _search(snapshot, keyword, sort)
+    except ValueError as exc:  # includes SearchQueryError
+        return jsonify(error=str(exc)), 400
+
+    page = papers[offset:offset + page_size]
+    end = offset + len(page)
+    response = jsonify(
+        year=year,
+        query=keyword,
+        sort=sort,
+        total=len(papers),
+        count=len(page),
+        papers=[dataclasses.asdict(paper) for paper in page],
+        next_cursor=_encode_cursor(snapshot, end) if end < len(papers) else None,
+    )
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+
+@app.route("/download.json")
+def download_json():
+    """The results of one search as a JSON file: ``?year=&keyword=&limit=``."""
+    try:
+        year = int(request.args.get("year", "2024"))
+        limit = _int_arg(request.args.get("limit"), None, 1)
+    except ValueError:
+        return jsonify(error="year and limit must be numbers."), 400
+    keyword = request.args.get("keyword", "").strip() or None
+    try:
+        snapshot = get_snapshot_store().get(year)
+    except Exception as exc:  # pylint: disable=broad-except
+        return jsonify(error=f"Failed to fetch CVPR data: {exc}"), 502
+    _watch(year)
+
+    etag = _etag("download", snapshot.content_hash, year, keyword, limit)
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+    try:
+        papers = _search(snapshot, keyword)
+    except SearchQueryError as exc:
+        return jsonify(error=str(exc)), 400
+    buffer = io.StringIO()
+    with JSONExporter(buffer, owns_handle=False) as exporter:
+        exporter.write_all(papers[:limit] if limit is not None else papers)
+    name = f"cvpr_{year}_{'results' if keyword or limit else 'accepted'}.json"
+    response = Response(buffer.getvalue(), mimetype="application/json")
+    response.headers["Content-Disposition"] = f'attachment; filename="{name}"'
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+
+def _similarity_snapshot(year: int):
+    """(snapshot, similarity index) for ``year``, or an error response."""
+    try:
+        snapshot = get_snapshot_store().get(year)
+    except Exception as exc:  # pylint: disable=broad-except
+        return None, (jsonify(error=f"Failed to fetch CVPR data: {exc}"), 502)
+    _watch(year)
+    if not snapshot.papers:
+        return None, (jsonify(error="No papers were parsed from the page."), 404)
+    try:
+        return (snapshot, get_snapshot_store().similarity_for(snapshot)), None
+    except RuntimeError as exc:
+        return None, (jsonify(error=str(exc)), 501)
+
+
+@app.route("/api/similar")
+def api_similar():
+    """Papers like a title or free text: ``?year=&q=&k=``, ranked by TF-IDF cosine similarity."""
+    try:
+        year = int(request.args.get("year", "2024"))
+        k = _int_arg(request.args.get("k"), SIMILAR_K, 1, MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify(error="year and k must be numbers."), 400
+    text = request.args.get("q", "").strip()
+    if not text:
+        return jsonify(error="q is required."), 400
+    loaded, error = _similarity_snapshot(year)
+    if error is not None:
+        return error
+    snapshot, index = loaded
+    etag = _etag("similar", snapshot.content_hash, year, text, k)
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+    hits = index.like(text, k)
+    response = jsonify(
+        year=year,
+        query=text,
+        papers=[{**dataclasses.asdict(snapshot.papers[hit.doc_id]), "score": round(hit.score, 4)} for hit in hits],
+    )
+    response.set_etag(etag)
+    return response
+
+
+@app.route("/api/clusters")
+def api_clusters():
+    """Topic clusters of one year's papers: ``?year=&k=&per=`` (``per`` titles listed per cluster)."""
+    try:
+        year = int(request.args.get("year", "2024"))
+        k = _int_arg(request.args.get("k"), DEFAULT_CLUSTERS, 1, 200)
+        per = _int_arg(request.args.get("per"), 5, 0, MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify(error="year, k and per must be numbers."), 400
+    loaded, error = _similarity_snapshot(year)
+    if error is not None:
+        return error
+    snapshot, index = loaded
+    etag = _etag("clusters", snapshot.content_hash, year, k, per)
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+    clusters = _results.get_or_build(("clusters", snapshot.content_hash, year, k), lambda: index.cluster(k))
+    response = jsonify(
+        year=year,
+        clusters=[
+            {
+                "terms": cluster.terms,
+                "size": len(cluster.doc_ids),
+                "titles": [snapshot.papers[doc_id].title for doc_id in cluster.doc_ids[:per]],
+            }
+            for cluster in clusters
+        ],
+    )
+    response.set_etag(etag)
+    return response
 
 
 @app.route("/", methods=["GET", "POST"])
@@ -40,33 +327,80 @@ def index():
         "papers": [],
         "json_path": None,
     }
-    if request.method == "POST":
-        context["year"] = request.form.get("year", "2024").strip() or "2024"
-        context["keyword"] = request.form.get("keyword", "").strip()
-        context["limit"] = request.form.get("limit", "").strip()
-        try:
-            year_val = int(context["year"])
-        except ValueError:
-            context["error"] = "Year must be a number."
-            return render_template("index.html", **context)
-        keyword_val = context["keyword"] or None
-        limit_val = None
-        if context["limit"]:
-            try:
-                limit_val = max(1, int(context["limit"]))
-            except ValueError:
-                context["error"] = "Limit must be a number."
-                return render_template("index.html", **context)
-        try:
-            papers, json_path = _extract_papers(year_val, keyword_val, limit_val)
-        except Exception as exc:  # pylint: disable=broad-except
-            context["error"] = f"Failed to fetch CVPR data: {exc}"
-            return render_template("index.html", **context)
-        context["papers"] = papers
-        context["json_path"] = json_path
-        context["count"] = len(papers)
-    return render_template("index.html", **context)
+    params = request.form if request.method == "POST" else request.args
+    if request.method == "GET" and "year" not in params:
+        return render_template("index.html", **context)
+    context["year"] = params.get("year", "2024").strip() or "2024"
+    context["keyword"] = params.get("keyword", "").strip()
+    context["limit"] = params.get("limit", "").strip()
+    try:
+        year_val = int(context["year"])
+    except ValueError:
+        context["error"] = "Year must be a number."
+        return render_template("index.html", **context)
+    keyword_val = context["keyword"] or None
+    try:
+        limit_val = _int_arg(context["limit"], None, 1)
+    except ValueError:
+        context["error"] = "Limit must be a number."
+        return render_template("index.html", **context)
+    try:
+        page_val = _int_arg(params.get("page"), 1, 1)
+    except ValueError:
+        page_val = 1
+    try:
+        snapshot = get_snapshot_store().get(year_val)
+    except Exception as exc:  # pylint: disable=broad-except
+        context["error"] = f"Failed to fetch CVPR data: {exc}"
+        return render_template("index.html", **context)
+    # Once the refresher runs, this year is revalidated in the background, never on a request.
+    _watch(year_val)
+
+    key = (snapshot.content_hash, year_val, keyword_val, limit_val, page_val)
+    etag = _etag(*key)
+    if request.method == "GET":
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+
+    try:
+        papers = _search(snapshot, keyword_val)
+    except SearchQueryError as exc:
+        context["error"] = f"Invalid search query: {exc}"
+        return render_template("index.html", **context)
+    if limit_val is not None:
+        papers = papers[:limit_val]
+    # The file holds the whole year and is rewritten only when the page changes;
+    # the results of this query are served by /download.json instead.
+    json_path = _save_json(snapshot)
+
+    def render() -> str:
+        pages = max(1, -(-len(papers) // PAGE_SIZE))
+        page = min(page_val, pages)
+        start = (page - 1) * PAGE_SIZE
+        return render_template(
+            "index.html",
+            **{
+                **context,
+                "papers": papers[start:start + PAGE_SIZE],
+                "json_path": json_path,
+                "count": len(papers),
+                "page": page,
+                "pages": pages,
+                "start": start,
+            },
+        )
+
+    html = _pages.get_or_build(key, render)
+    response = Response(html, mimetype="text/html")
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    start_refresher()
+    try:
+        app.run(debug=True)
+    finally:
+        stop_refresher()
@@ -1,50 +1,22 @@
+import math
 import os
 import shutil
 import tempfile
-import threading
 
 from flask import Flask, after_this_request, jsonify, render_template, request, send_file
-from instaloader import Instaloader, Profile
+from instaloader import Profile
 from instaloader.exceptions import (
-    BadCredentialsException,
     ConnectionException,
     InstaloaderException,
     ProfileNotExistsException,
+    TooManyRequestsException,
 )
 
-
-def _configure_loader() -> Instaloader:
-    """
-    Create a base Instaloader instance with sane defaults.
-    """
-    loader = Instaloader(
-        download_comments=False,
-        save_metadata=False,
-        compress_json=False,
-        download_video_thumbnails=False,
-        download_videos=False,
-        download_geotags=False,
-        post_metadata_txt_pattern="",
-        dirname_pattern="{target}",
-        filename_pattern="{shortcode}",
-    )
-
-    username = os.environ.get("INSTAGRAM_USERNAME")
-    password = os.environ.get("INSTAGRAM_PASSWORD")
-    if username and password:
-        try:
-            loader.login(username, password)
-        except BadCredentialsException as error:
-            raise RuntimeError(
-                "Invalid INSTAGRAM_USERNAME/INSTAGRAM_PASSWORD credentials."
-            ) from error
-
-    return loader
-
+from session_pool import SessionPool, SessionUnavailable
 
 app = Flask(__name__, static_folder="static", template_folder="templates")
-loader = _configure_loader()
-loader_lock = threading.Lock()
+# Sessions log in lazily on first use, so startup does not touch Instagram.
+pool = SessionPool.from_env()
 
 
 def _download_profile_archive(username: str, max_posts: int) -> tuple[str, str]:
@@ -54,19 +26,24 @@ def _download_profile_archive(username: str, max_posts: int) -> tuple[str, str]:
     temp_dir = tempfile.mkdtemp(prefix="insta_")
     download_root = os.path.join(temp_dir, "downloads")
 
-    with loader_lock:
-        loader.dirname_pattern = os.path.join(download_root, "{target}")
-        profile = Profile.from_username(loader.context, username)
-        downloaded = 0
-
-        for post in profile.get_posts():
-            loader.download_post(post, target=profile.username)
-            downloaded += 1
-            if downloaded >= max_posts:
-                break
-
-    if downloaded == 0:
-        raise InstaloaderException("No posts available for this profile.")
+    try:
+        # One profile lookup plus roughly one query per post.
+        with pool.lease(cost=max_posts + 1) as loader:
+            loader.dirname_pattern = os.path.join(download_root, "{target}")
+            profile = Profile.from_username(loader.context, username)
+            downloaded = 0
+
+            for post in profile.get_posts():
+                loader.download_post(post, target=profile.username)
+                downloaded += 1
+                if downloaded >= max_posts:
+                    break
+
+        if downloaded == 0:
+            raise InstaloaderException("No posts available for this profile.")
+    except InstaloaderException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
 
     archive_base = os.path.join(temp_dir, f"{profile.username}_images")
     archive_path = shutil.make_archive(
@@ -83,6 +60,11 @@ def index():
     return render_template("index.html")
 
 
+@app.get("/api/sessions")
+def sessions():
+    return jsonify({"sessions": pool.stats()})
+
+
 @app.post("/api/download")
 def download():
     payload = request.get_json(silent=True) or {}
@@ -102,8 +84,15 @@ def download():
 
     try:
         archive_path, temp_dir = _download_profile_archive(username, max_posts)
+    except SessionUnavailable as error:
+        response = jsonify({"error": str(error)})
+        if error.retry_after:
+            response.headers["Retry-After"] = str(math.ceil(error.retry_after))
+        return response, 503
     except ProfileNotExistsException:
         return jsonify({"error": "This profile does not exist or is private."}), 404
+    except TooManyRequestsException:
+        return jsonify({"error": "Instagram is rate limiting requests. Try again later."}), 429
     except ConnectionException:
         return jsonify({"error": "Instagram request failed. Try again later."}), 502
     except InstaloaderException as error:
@@ -0,0 +1,284 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from instaloader import Instaloader
+from instaloader.exceptions import (
+    BadCredentialsException,
+    InstaloaderException,
+    LoginRequiredException,
+    TooManyRequestsException,
+    TwoFactorAuthRequiredException,
+)
+from instaloader.instaloadercontext import RateController
+
+DEFAULT_SESSION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sessions")
+# Per-session request budget over a sliding window (Instagram throttles around 200 queries/hour).
+DEFAULT_BUDGET = 200
+DEFAULT_WINDOW = 3600.0
+DEFAULT_COOLDOWN = 600.0
+DEFAULT_LEASE_TIMEOUT = 30.0
+
+
+class SessionUnavailable(InstaloaderException):
+    """
+    Raised when no session can serve a request in time.
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _FailFastRateController(RateController):
+    """
+    Raise on HTTP 429 instead of sleeping, so the pool can cool the session
+    down and serve requests from another one.
+    """
+
+    last_wait = 0.0
+
+    def handle_429(self, query_type: str) -> None:
+        self.last_wait = self.query_waittime(query_type, time.monotonic(), True)
+        raise TooManyRequestsException("Instagram responded with 429 Too Many Requests.")
+
+
+def create_loader() -> Instaloader:
+    """
+    Create a base Instaloader instance with sane defaults.
+    """
+    return Instaloader(
+        download_comments=False,
+        save_metadata=False,
+        compress_json=False,
+        download_video_thumbnails=False,
+        download_videos=False,
+        download_geotags=False,
+        post_metadata_txt_pattern="",
+        dirname_pattern="{target}",
+        filename_pattern="{shortcode}",
+        rate_controller=_FailFastRateController,
+    )
+
+
+@dataclass
+class Session:
+    """
+    One loader context, optionally bound to an account, plus its accounting.
+    """
+
+    name: str
+    username: Optional[str] = None
+    password: Optional[str] = None
+    loader: Optional[Instaloader] = None
+    logged_in: bool = False
+    in_use: bool = False
+    cooldown_until: float = 0.0
+    error: Optional[str] = None
+    # (timestamp, cost) of recent leases inside the budget window
+    spent: deque = field(default_factory=deque)
+    leases: int = 0
+
+    def used(self, now: float, window: float) -> int:
+        while self.spent and self.spent[0][0] <= now - window:
+            self.spent.popleft()
+        return sum(cost for _, cost in self.spent)
+
+
+class SessionPool:
+    """
+    Leases Instaloader sessions to requests, one request per session at a time.
+
+    Sessions are created and logged in lazily on first lease; logged-in
+    cookies are saved under session_dir so restarts skip the login
+    round-trip. Each session has a request budget per sliding window, and a
+    session that gets throttled (HTTP 429) cools down while the others keep
+    serving.
+    """
+
+    def __init__(
+        self,
+        accounts: Optional[list[tuple[str, str]]] = None,
+        anonymous: int = 0,
+        session_dir: str = DEFAULT_SESSION_DIR,
+        budget: int = DEFAULT_BUDGET,
+        window: float = DEFAULT_WINDOW,
+        cooldown: float = DEFAULT_COOLDOWN,
+    ):
+        self.sessions = [
+            Session(name=username, username=username, password=password)
+            for username, password in accounts or []
+        ]
+        self.sessions += [Session(name=f"anonymous-{index + 1}") for index in range(anonymous)]
+        if not self.sessions:
+            self.sessions.append(Session(name="anonymous-1"))
+        self.session_dir = session_dir
+        self.budget = budget
+        self.window = window
+        self.cooldown = cooldown
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_env(cls) -> "SessionPool":
+        """
+        Build a pool from INSTAGRAM_ACCOUNTS ("user:pass,user2:pass2"), the
+        legacy INSTAGRAM_USERNAME/INSTAGRAM_PASSWORD pair and
+        INSTAGRAM_ANONYMOUS_SESSIONS.
+        """
+        accounts = []
+        for entry in os.environ.get("INSTAGRAM_ACCOUNTS", "").split(","):
+            username, _, password = entry.strip().partition(":")
+            if username and password:
+                accounts.append((username, password))
+        username = os.environ.get("INSTAGRAM_USERNAME")
+        password = os.environ.get("INSTAGRAM_PASSWORD")
+        if username and password and username not in {name for name, _ in accounts}:
+            accounts.append((username, password))
+        return cls(
+            accounts=accounts,
+            anonymous=int(os.environ.get("INSTAGRAM_ANONYMOUS_SESSIONS", "0" if accounts else "2")),
+            session_dir=os.environ.get("INSTAGRAM_SESSION_DIR", DEFAULT_SESSION_DIR),
+            budget=int(os.environ.get("INSTAGRAM_SESSION_BUDGET", DEFAULT_BUDGET)),
+            window=float(os.environ.get("INSTAGRAM_SESSION_WINDOW", DEFAULT_WINDOW)),
+            cooldown=float(os.environ.get("INSTAGRAM_SESSION_COOLDOWN", DEFAULT_COOLDOWN)),
+        )
+
+    def _session_file(self, session: Session) -> str:
+        return os.path.join(self.session_dir, f"session-{session.username}")
+
+    def _pick(self, now: float, cost: int) -> tuple[Optional[Session], Optional[float]]:
+        """
+        Least-used free session with budget left, else the time until one frees up.
+        """
+        best = None
+        wake_at = None
+        for session in self.sessions:
+            if session.error or session.in_use:
+                continue
+            used = session.used(now, self.window)
+            # A session with an empty window takes any request, even one above the budget.
+            if session.cooldown_until > now or (used and used + cost > self.budget):
+                ready_at = max(session.cooldown_until, session.spent[0][0] + self.window if used else now)
+                wake_at = ready_at if wake_at is None else min(wake_at, ready_at)
+                continue
+            if best is None or used < best[0]:
+                best = (used, session)
+        return (best[1] if best else None), wake_at
+
+    def _ensure_ready(self, session: Session) -> None:
+        """
+        Create the loader and log in (from the saved session when possible).
+        Runs outside the pool lock; the session is exclusively leased.
+        """
+        if session.loader is None:
+            session.loader = create_loader()
+        if session.username is None or session.logged_in:
+            return
+        session_file = self._session_file(session)
+        try:
+            session.loader.load_session_from_file(session.username, session_file)
+        except FileNotFoundError:
+            try:
+                session.loader.login(session.username, session.password)
+            except (BadCredentialsException, TwoFactorAuthRequiredException) as error:
+                session.error = f"Login failed for {session.username}: {error}"
+                raise SessionUnavailable(session.error) from error
+            # Session files hold login cookies; keep them private.
+            os.makedirs(self.session_dir, mode=0o700, exist_ok=True)
+            session.loader.save_session_to_file(session_file)
+        session.logged_in = True
+
+    def _acquire(self, cost: int, deadline: float) -> Session:
+        with self._condition:
+            while True:
+                now = time.time()
+                session, wake_at = self._pick(now, cost)
+                if session is not None:
+                    session.in_use = True
+                    session.leases += 1
+                    session.spent.append((now, cost))
+                    return session
+                if all(candidate.error for candidate in self.sessions):
+                    raise SessionUnavailable("; ".join(candidate.error for candidate in self.sessions))
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    retry_after = max(1.0, wake_at - now) if wake_at else None
+                    raise SessionUnavailable("All Instagram sessions are busy. Try again later.", retry_after)
+                self._condition.wait(min(remaining, wake_at - now) if wake_at else remaining)
+
+    def _release(self, session: Session, refund: bool = False) -> None:
+        with self._condition:
+            if refund and session.spent:
+                # The lease never served a request; take back what _acquire charged.
+                session.spent.pop()
+            session.in_use = False
+            self._condition.notify_all()
+
+    def _cool_down(self, session: Session) -> None:
+        controller = getattr(session.loader.context, "_rate_controller", None) if session.loader else None
+        wait = getattr(controller, "last_wait", 0.0)
+        session.cooldown_until = time.time() + max(self.cooldown, wait)
+
+    @contextmanager
+    def lease(self, cost: int = 1, timeout: float = DEFAULT_LEASE_TIMEOUT) -> Iterator[Instaloader]:
+        """
+        Lease a session's loader for one request costing about `cost` Instagram queries.
+
+        Raises SessionUnavailable (with retry_after) if none frees up within timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            session = self._acquire(cost, deadline)
+            try:
+                self._ensure_ready(session)
+                break
+            except SessionUnavailable:
+                # Bad credentials disable that account; try the next session.
+                self._release(session, refund=True)
+            except BaseException as error:
+                # Transient login failures must not leave the session leased forever.
+                if isinstance(error, TooManyRequestsException):
+                    self._cool_down(session)
+                self._release(session, refund=True)
+                raise
+
+        try:
+            yield session.loader
+        except TooManyRequestsException:
+            self._cool_down(session)
+            raise
+        except LoginRequiredException:
+            # The saved cookies expired; log in again on the next lease.
+            session.logged_in = False
+            if session.username:
+                try:
+                    os.remove(self._session_file(session))
+                except OSError:
+                    pass
+            raise
+        finally:
+            self._release(session)
+
+    def stats(self) -> list[dict]:
+        """
+        Per-session state for monitoring (no credentials).
+        """
+        now = time.time()
+        with self._condition:
+            return [
+                {
+                    "name": session.name,
+                    "logged_in": session.logged_in,
+                    "in_use": session.in_use,
+                    "leases": session.leases,
+                    "budget_used": session.used(now, self.window),
+                    "budget": self.budget,
+                    "cooldown_seconds": max(0, round(session.cooldown_until - now)),
+                    "error": session.error,
+                }
+                for session in self.sessions
+            ]
@@ -0,0 +1,140 @@
+"""
+Unit tests for the Instaloader session pool
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from instaloader.exceptions import ConnectionException, TooManyRequestsException
+
+import session_pool
+from session_pool import SessionPool, SessionUnavailable
+
+
+class FakeContext:
+    def __init__(self):
+        self._rate_controller = None
+
+
+class FakeLoader:
+    """Stands in for Instaloader; records login activity without network access"""
+
+    login_error = None
+    calls = []
+
+    def __init__(self):
+        self.context = FakeContext()
+
+    def load_session_from_file(self, username, filename):
+        self.calls.append(("load", username))
+        if not os.path.exists(filename):
+            raise FileNotFoundError(filename)
+
+    def login(self, username, password):
+        self.calls.append(("login", username))
+        if self.login_error is not None:
+            raise self.login_error
+
+    def save_session_to_file(self, filename):
+        self.calls.append(("save", os.path.basename(filename)))
+        with open(filename, "w") as handle:
+            handle.write("cookies")
+
+
+@pytest.fixture(autouse=True)
+def fake_loader(monkeypatch):
+    """Replace the real loader factory with FakeLoader"""
+    FakeLoader.login_error = None
+    FakeLoader.calls = []
+    monkeypatch.setattr(session_pool, "create_loader", FakeLoader)
+    return FakeLoader
+
+
+def test_lease_and_release(tmp_path):
+    """Test concurrent leases use separate sessions and are released afterwards"""
+    pool = SessionPool(anonymous=2, session_dir=str(tmp_path))
+    with pool.lease() as first, pool.lease() as second:
+        assert first is not second
+        assert all(stats["in_use"] for stats in pool.stats())
+    assert not any(stats["in_use"] for stats in pool.stats())
+    assert [stats["leases"] for stats in pool.stats()] == [1, 1]
+
+
+def test_release_on_login_error(tmp_path):
+    """Test a transient login failure releases the session and refunds its budget"""
+    pool = SessionPool(accounts=[("alice", "pw")], session_dir=str(tmp_path))
+    FakeLoader.login_error = ConnectionException("network down")
+    with pytest.raises(ConnectionException):
+        with pool.lease(cost=5):
+            pass
+    stats = pool.stats()[0]
+    assert not stats["in_use"] and stats["budget_used"] == 0 and stats["error"] is None
+    FakeLoader.login_error = None
+    with pool.lease(timeout=0.1):
+        pass
+    assert pool.stats()[0]["logged_in"]
+
+
+def test_cooldown_after_429(tmp_path):
+    """Test a throttled session sits out while the others keep serving"""
+    pool = SessionPool(anonymous=2, session_dir=str(tmp_path), cooldown=60)
+    with pytest.raises(TooManyRequestsException):
+        with pool.lease():
+            raise TooManyRequestsException("429")
+    cooling = [stats for stats in pool.stats() if stats["cooldown_seconds"] > 0]
+    assert [stats["name"] for stats in cooling] == ["anonymous-1"]
+    for _ in range(3):
+        with pool.lease(timeout=0.1):
+            pass
+    assert [stats["leases"] for stats in pool.stats()] == [1, 3]
+
+
+def test_budget_exhaustion_sets_retry_after(tmp_path):
+    """Test a spent budget makes leases fail with a retry_after hint"""
+    pool = SessionPool(anonymous=1, session_dir=str(tmp_path), budget=10, window=120)
+    with pool.lease(cost=8):
+        pass
+    started = time.monotonic()
+    with pytest.raises(SessionUnavailable) as excinfo:
+        with pool.lease(cost=5, timeout=0.2):
+            pass
+    assert time.monotonic() - started < 2
+    assert 100 < excinfo.value.retry_after <= 120
+
+
+def test_waiting_lease_gets_released_session(tmp_path):
+    """Test a lease blocks until the busy session is released"""
+    pool = SessionPool(anonymous=1, session_dir=str(tmp_path))
+    leased = threading.Event()
+
+    def hold():
+        with pool.lease():
+            leased.set()
+            time.sleep(0.2)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    leased.wait()
+    started = time.monotonic()
+    with pool.lease(timeout=2):
+        assert time.monotonic() - started > 0.1
+    thread.join()
+
+
+def test_saved_session_skips_login(tmp_path):
+    """Test a restart loads the saved session file instead of logging in"""
+    with SessionPool(accounts=[("alice", "pw")], session_dir=str(tmp_path)).lease():
+        pass
+    assert FakeLoader.calls == [("load", "alice"), ("login", "alice"), ("save", "session-alice")]
+    FakeLoader.calls = []
+    restarted = SessionPool(accounts=[("alice", "pw")], session_dir=str(tmp_path))
+    with restarted.lease():
+        pass
+    assert FakeLoader.calls == [("load", "alice")]
+    assert restarted.stats()[0]["logged_in"]